@@ -0,0 +1,90 @@
+"""
+Benchmark building the ArelleProcessor fact index, and querying it for the
+GreenwebCSRDProcessor datapoints, on a large synthetic report.
+
+The report is loaded into Arelle once. We then time indexing every fact in
+the report against indexing only the names we query, and time the queries
+with the per context date cache empty and warm.
+
+Usage:
+    uv run python scripts/benchmark_arelle_fact_index.py --facts 100000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from synthetic_ixbrl import write_synthetic_report
+
+from carbon_txt.processors.csrd_document import (
+    ArelleProcessor,
+    GreenwebCSRDProcessor,
+    _readable_label,
+)
+
+
+def timed(function, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(
+        f"  {label:<34} median {statistics.median(timings) * 1000:9.2f}ms  "
+        f"min {min(timings) * 1000:9.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--facts", type=int, default=100_000)
+    parser.add_argument("--contexts", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    csrd_processor = GreenwebCSRDProcessor()
+    codes = csrd_processor.local_datapoint_codes
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_synthetic_report(
+            f"{directory}/synthetic.xhtml", facts=args.facts, contexts=args.contexts
+        )
+        print(f"Loading a synthetic report with {args.facts:,} facts into Arelle")
+        started = time.perf_counter()
+        processor = ArelleProcessor(str(path), datapoint_codes=codes)
+        print(f"  loaded in {time.perf_counter() - started:.2f}s\n")
+
+    def build_index(local_names):
+        processor._facts_by_local_name = defaultdict(set)
+        processor._indexed_names = set()
+        processor._index_facts(local_names)
+
+    print("Building the fact index")
+    report("every fact in the report", timed(lambda: build_index(None), args.repeat))
+    report("only the queried names", timed(lambda: build_index(codes), args.repeat))
+
+    csrd_processor.setup(processor)
+
+    def query_cold():
+        processor._period_dates = {}
+        _readable_label.cache_clear()
+        csrd_processor.get_esrs_datapoint_values(codes)
+
+    print("\nQuerying the datapoints")
+    report("empty date and label caches", timed(query_cold, args.repeat))
+    report(
+        "warm date and label caches",
+        timed(lambda: csrd_processor.get_esrs_datapoint_values(codes), args.repeat),
+    )
+
+    processor.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark extracting datapoints from CSRD reports with Arelle, against the
+streaming iXBRL fast path.
+
+Each extractor runs in its own fresh process, so we can compare the peak
+memory used by each, as well as how long they take. The Arelle session is
+started before timing begins, so its one-off start up cost isn't counted.
+
+Usage:
+    uv run python scripts/benchmark_csrd_extraction.py tests/fixtures/esrs-e1-efrag-2026-12-31-en.xhtml
+
+    # pad each report out with narrative filler, to see how each
+    # extractor copes with the size of real published reports
+    uv run python scripts/benchmark_csrd_extraction.py --pad-mb 50 --repeat 3 \\
+        tests/fixtures/esrs-e1-efrag-2026-12-31-en.xhtml
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import pathlib
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+FILLER_PARAGRAPH = (
+    "<div class='narrative'><p>Our sustainability statement describes the "
+    "impacts, risks and opportunities we identified in our double materiality "
+    "assessment, and the policies, actions and targets we adopted to manage "
+    "them over the reporting period.</p></div>\n"
+)
+
+
+def pad_report(report: pathlib.Path, pad_mb: int, directory: str) -> pathlib.Path:
+    """
+    Write a copy of the report, with `pad_mb` megabytes of narrative filler
+    added to the end of the body.
+    """
+    content = report.read_text(encoding="utf-8")
+    repeats = pad_mb * 1024 * 1024 // len(FILLER_PARAGRAPH)
+    head, _, tail = content.rpartition("</body>")
+    padded = pathlib.Path(directory) / f"padded-{pad_mb}mb-{report.name}"
+    with open(padded, "w", encoding="utf-8") as file:
+        file.write(head)
+        for _ in range(repeats):
+            file.write(FILLER_PARAGRAPH)
+        file.write("</body>")
+        file.write(tail)
+    return padded
+
+
+def run_extractor(extractor: str, report: str, repeat: int) -> dict:
+    """
+    Runs in a fresh worker process. Extract the datapoints from the report
+    `repeat` times, returning the timings, results and peak memory use.
+    """
+    from carbon_txt.processors.csrd_document import (
+        ArelleProcessor,
+        GreenwebCSRDProcessor,
+        get_shared_session_manager,
+    )
+    from carbon_txt.processors.csrd_ixbrl_stream import StreamingIXBRLProcessor
+
+    codes = GreenwebCSRDProcessor().local_datapoint_codes
+    if extractor == "arelle":
+        get_shared_session_manager().start()
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if extractor == "arelle":
+            processor = ArelleProcessor(report)
+        else:
+            processor = StreamingIXBRLProcessor(report, codes)
+        csrd_processor = GreenwebCSRDProcessor(arelle_processor=processor)
+        results = csrd_processor.get_esrs_datapoint_values(codes)
+        csrd_processor.close()
+        timings.append(time.perf_counter() - started)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "timings": timings,
+        "results": sorted(repr(result) for result in results),
+        # ru_maxrss is in kilobytes on linux
+        "peak_rss_mb": peak_rss / 1024,
+        "extra_rss_mb": (peak_rss - baseline_rss) / 1024,
+    }
+
+
+def benchmark(report: pathlib.Path, repeat: int) -> bool:
+    print(f"\n{report.name} ({report.stat().st_size / 1024 / 1024:.1f} MB)")
+    outcomes = {}
+    for extractor in ("arelle", "streaming"):
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            outcome = executor.submit(
+                run_extractor, extractor, str(report), repeat
+            ).result()
+        outcomes[extractor] = outcome
+        timings = outcome["timings"]
+        print(
+            f"  {extractor:<10} "
+            f"median {statistics.median(timings):7.3f}s  "
+            f"min {min(timings):7.3f}s  "
+            f"peak RSS {outcome['peak_rss_mb']:7.1f} MB "
+            f"(+{outcome['extra_rss_mb']:.1f} MB while extracting)"
+        )
+
+    speedup = statistics.median(outcomes["arelle"]["timings"]) / statistics.median(
+        outcomes["streaming"]["timings"]
+    )
+    matches = outcomes["arelle"]["results"] == outcomes["streaming"]["results"]
+    print(f"  streaming is {speedup:.1f}x faster, results match: {matches}")
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("reports", nargs="+", type=pathlib.Path)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Extract from each report this many times"
+    )
+    parser.add_argument(
+        "--pad-mb",
+        type=int,
+        default=0,
+        help="Pad each report with this many megabytes of narrative filler",
+    )
+    args = parser.parse_args()
+
+    all_match = True
+    with tempfile.TemporaryDirectory() as directory:
+        for report in args.reports:
+            if args.pad_mb:
+                report = pad_report(report, args.pad_mb, directory)
+            all_match = benchmark(report, args.repeat) and all_match
+
+    sys.exit(0 if all_match else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark how loading CSRD reports, and extracting datapoints from them,
+scales as reports grow, using synthetic reports from 1 MB to hundreds of MB.
+
+For each report size, each extractor runs in its own fresh process, so we
+can measure the peak memory it uses, as well as how long it takes to load
+the report and index its facts, and then to extract the datapoints the
+GreenwebCSRDProcessor looks for. The Arelle session is started before
+timing begins, so its one-off start up cost isn't counted.
+
+Usage:
+    uv run python scripts/benchmark_csrd_scaling.py
+
+    # choose the report sizes, and the shape of the synthetic reports
+    uv run python scripts/benchmark_csrd_scaling.py --sizes-mb 1,10,100,500 \\
+        --contexts 50 --units 5 --extractors arelle
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import pathlib
+import resource
+import statistics
+import tempfile
+import time
+
+from synthetic_ixbrl import write_synthetic_report
+
+EXTRACTORS = ("arelle", "streaming")
+
+
+def run_extractor(extractor: str, report: str, repeat: int) -> dict:
+    """
+    Runs in a fresh worker process. Load the report and extract the
+    datapoints from it `repeat` times, returning the timings, the number of
+    datapoints found, and the peak memory use.
+    """
+    from carbon_txt.processors.csrd_document import (
+        ArelleProcessor,
+        DataPoint,
+        GreenwebCSRDProcessor,
+        get_shared_session_manager,
+    )
+    from carbon_txt.processors.csrd_ixbrl_stream import StreamingIXBRLProcessor
+
+    codes = GreenwebCSRDProcessor().local_datapoint_codes
+    if extractor == "arelle":
+        get_shared_session_manager().start()
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    load_timings = []
+    extract_timings = []
+    found = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if extractor == "arelle":
+            processor = ArelleProcessor(report, datapoint_codes=codes)
+        else:
+            processor = StreamingIXBRLProcessor(report, codes)
+        loaded = time.perf_counter()
+        csrd_processor = GreenwebCSRDProcessor(arelle_processor=processor)
+        results = csrd_processor.get_esrs_datapoint_values(codes)
+        extracted = time.perf_counter()
+        csrd_processor.close()
+
+        load_timings.append(loaded - started)
+        extract_timings.append(extracted - loaded)
+        found = sum(isinstance(result, DataPoint) for result in results)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "load_timings": load_timings,
+        "extract_timings": extract_timings,
+        "found": found,
+        # ru_maxrss is in kilobytes on linux
+        "peak_rss_mb": peak_rss / 1024,
+        "extra_rss_mb": (peak_rss - baseline_rss) / 1024,
+    }
+
+
+def benchmark(report: pathlib.Path, extractors: list[str], repeat: int) -> None:
+    size_mb = report.stat().st_size / 1024 / 1024
+    for extractor in extractors:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            outcome = executor.submit(
+                run_extractor, extractor, str(report), repeat
+            ).result()
+        print(
+            f"{size_mb:9.1f}  {extractor:<10} "
+            f"{statistics.median(outcome['load_timings']):9.3f}s "
+            f"{statistics.median(outcome['extract_timings']) * 1000:10.2f}ms "
+            f"{outcome['peak_rss_mb']:10.1f} "
+            f"{outcome['extra_rss_mb']:10.1f} "
+            f"{outcome['found']:7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes-mb",
+        default="1,10,50,100,250",
+        help="Comma separated sizes of the synthetic reports to benchmark",
+    )
+    parser.add_argument(
+        "--extractors",
+        default=",".join(EXTRACTORS),
+        help="Comma separated extractors to benchmark",
+    )
+    parser.add_argument("--contexts", type=int, default=20)
+    parser.add_argument("--distinct-names", type=int, default=2_000)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Load each report this many times"
+    )
+    parser.add_argument(
+        "--directory",
+        type=pathlib.Path,
+        help="Write the synthetic reports here, and keep them, instead of a temporary directory",
+    )
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes_mb.split(",")]
+    extractors = args.extractors.split(",")
+    for extractor in extractors:
+        if extractor not in EXTRACTORS:
+            parser.error(f"Unknown extractor {extractor!r}")
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = args.directory or pathlib.Path(temporary_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        print(
+            f"{'size (MB)':>9}  {'extractor':<10} {'load':>10} {'extract':>12} "
+            f"{'peak RSS':>10} {'+RSS (MB)':>10} {'found':>7}"
+        )
+        for size in sizes:
+            report = directory / f"synthetic-{size:g}mb.xhtml"
+            if not report.exists():
+                write_synthetic_report(
+                    report,
+                    contexts=args.contexts,
+                    distinct_names=args.distinct_names,
+                    units=args.units,
+                    size_mb=size,
+                )
+            benchmark(report, extractors, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
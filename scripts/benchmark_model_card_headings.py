@@ -0,0 +1,103 @@
+"""
+Benchmark finding the model name in AI model cards, by scanning the lines
+of the card for its first top level heading, against parsing the whole card
+with mistletoe, as we did before.
+
+Model cards are often long READMEs, so by default we use a few large real
+world cards from the Hugging Face hub. Pass paths or URLs to use others.
+
+Usage:
+    uv run python scripts/benchmark_model_card_headings.py
+
+    uv run python scripts/benchmark_model_card_headings.py --repeat 20 \\
+        path/to/README.md https://huggingface.co/org/model/raw/main/README.md
+"""
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+
+import frontmatter
+from mistletoe import Document
+from mistletoe.block_token import Heading, SetextHeading
+
+from carbon_txt.http_client import HTTPClient
+from carbon_txt.processors.ai_model_card import (
+    _AMBIGUOUS,
+    GreenwebAIModelCardProcessor,
+    _recursively_get_text,
+    _scan_for_h1,
+)
+
+DEFAULT_CARDS = (
+    "https://huggingface.co/bigscience/bloom/raw/main/README.md",
+    "https://huggingface.co/openai/whisper-large-v3/raw/main/README.md",
+    "https://huggingface.co/google-bert/bert-base-uncased/raw/main/README.md",
+)
+
+
+def read_card(source: str) -> str:
+    if source.startswith(("http://", "https://")):
+        response = HTTPClient().get(source, follow_redirects=True)
+        response.raise_for_status()
+        return response.text
+    return pathlib.Path(source).read_text(encoding="utf-8")
+
+
+def h1_from_full_parse(markdown: str) -> str | None:
+    for element in Document(markdown).children:
+        if isinstance(element, (Heading, SetextHeading)) and element.level == 1:
+            return _recursively_get_text(element)
+    return None
+
+
+def timed(function, markdown: str, repeat: int) -> tuple[list[float], object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(markdown)
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cards", nargs="*", default=list(DEFAULT_CARDS))
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    processor = GreenwebAIModelCardProcessor(card_url="benchmark")
+    all_match = True
+    for source in args.cards:
+        text = read_card(source)
+        body = frontmatter.loads(text).content
+        print(f"\n{source} ({len(text.encode()) / 1024:.1f} KB)")
+
+        parse_timings, parsed = timed(h1_from_full_parse, body, args.repeat)
+        scan_timings, scanned = timed(processor.get_h1_from_markdown, body, args.repeat)
+        ambiguous = _scan_for_h1(body) is _AMBIGUOUS
+
+        for label, timings in (
+            ("full mistletoe parse", parse_timings),
+            ("line scan", scan_timings),
+        ):
+            print(
+                f"  {label:<22} median {statistics.median(timings) * 1000:9.3f}ms  "
+                f"min {min(timings) * 1000:9.3f}ms"
+            )
+        speedup = statistics.median(parse_timings) / statistics.median(scan_timings)
+        matches = parsed == scanned
+        all_match = all_match and matches
+        print(
+            f"  heading {scanned!r}, fell back to mistletoe: {ambiguous}, "
+            f"{speedup:.1f}x faster, results match: {matches}"
+        )
+
+    sys.exit(0 if all_match else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Generate synthetic inline XBRL reports, for benchmarking how we extract
+datapoints from CSRD reports at sizes beyond our test fixtures.
+
+The reports contain the datapoints the GreenwebCSRDProcessor looks for,
+alongside many other facts, spread over a number of contexts, like the
+large sustainability statements companies publish.
+
+Usage:
+    uv run python scripts/synthetic_ixbrl.py --facts 100000 synthetic-report.xhtml
+
+    # or write facts until the report reaches a given size
+    uv run python scripts/synthetic_ixbrl.py --size-mb 100 --units 5 synthetic-report.xhtml
+"""
+
+import argparse
+import pathlib
+
+# the datapoints the GreenwebCSRDProcessor reads, which are included in
+# every synthetic report, so queries for them always find values
+TARGET_DATAPOINTS = (
+    "PercentageOfRenewableSourcesInTotalEnergyConsumption",
+    "PercentageOfEnergyConsumptionFromNuclearSourcesInTotalEnergyConsumption",
+    "EnergyConsumptionRelatedToOwnOperations",
+    "EnergyConsumptionFromFossilSources",
+    "EnergyConsumptionFromNuclearSources",
+    "EnergyConsumptionFromRenewableSources",
+    "ConsumptionOfPurchasedOrAcquiredElectricityHeatSteamAndCoolingFromRenewableSources",
+    "ConsumptionOfSelfgeneratedNonfuelRenewableEnergy",
+)
+
+HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"
+    xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+    xmlns:ixt4="http://www.xbrl.org/inlineXBRL/transformation/2020-02-12"
+    xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:esrs="https://xbrl.efrag.org/taxonomy/esrs/2023-12-22" xml:lang="en">
+<head><title>Synthetic sustainability statement</title></head>
+<body>
+<div style="display:none"><ix:header><ix:resources>
+"""
+
+CONTEXT = """<xbrli:context id="c-{index}"><xbrli:entity>
+<xbrli:identifier scheme="http://standards.iso.org/iso/17442">synthetic</xbrli:identifier>
+</xbrli:entity><xbrli:period>
+<xbrli:startDate>{year}-01-01</xbrli:startDate><xbrli:endDate>{year}-12-31</xbrli:endDate>
+</xbrli:period></xbrli:context>
+"""
+
+UNIT = '<xbrli:unit id="{id}"><xbrli:measure>{measure}</xbrli:measure></xbrli:unit>\n'
+
+END_OF_HEADER = "</ix:resources></ix:header></div>\n"
+
+FACT = (
+    '<p>{label}: <ix:nonFraction name="esrs:{name}" id="f-{index}" '
+    'contextRef="c-{context}" unitRef="{unit}" decimals="2" scale="{scale}" '
+    'format="ixt4:num-dot-decimal">{value}</ix:nonFraction></p>\n'
+)
+
+FOOTER = "</body>\n</html>\n"
+
+
+def _units(units: int) -> list[tuple[str, str]]:
+    """
+    Return the ids and measures of the units facts are reported in. Target
+    datapoints use the first, and the other facts cycle through the rest.
+    """
+    measures = [("u-pure", "xbrli:pure"), ("u-0", "iso4217:EUR")]
+    for index in range(1, units):
+        measures.append((f"u-{index}", f"esrs:SyntheticUnit{index}"))
+    return measures
+
+
+def write_synthetic_report(
+    path: str | pathlib.Path,
+    facts: int = 100_000,
+    contexts: int = 20,
+    distinct_names: int = 2_000,
+    units: int = 1,
+    datapoints: int = len(TARGET_DATAPOINTS),
+    size_mb: float | None = None,
+) -> pathlib.Path:
+    """
+    Write a synthetic iXBRL report with `facts` numeric facts, spread over
+    `distinct_names` concepts, `contexts` reporting periods, and `units`
+    units. The first `datapoints` of the TARGET_DATAPOINTS are reported
+    once per context.
+
+    If `size_mb` is given, facts are written until the report reaches that
+    size instead.
+    """
+    path = pathlib.Path(path)
+    target_datapoints = TARGET_DATAPOINTS[:datapoints]
+    unit_ids = [unit_id for unit_id, _ in _units(units)[1:]]
+    size_limit = None if size_mb is None else int(size_mb * 1024 * 1024)
+    # everything we write is ASCII, so characters and bytes are the same
+    written = 0
+
+    def write(text: str) -> None:
+        nonlocal written
+        report.write(text)
+        written += len(text)
+
+    with open(path, "w", encoding="utf-8") as report:
+        write(HEADER)
+        for index in range(contexts):
+            write(CONTEXT.format(index=index, year=2000 + index))
+        for unit_id, measure in _units(units):
+            write(UNIT.format(id=unit_id, measure=measure))
+        write(END_OF_HEADER)
+
+        index = 0
+        for context in range(contexts):
+            for name in target_datapoints:
+                percentage = name.startswith("Percentage")
+                write(
+                    FACT.format(
+                        label=name,
+                        name=name,
+                        index=index,
+                        context=context,
+                        unit="u-pure",
+                        scale="-2" if percentage else "3",
+                        value=f"{(index % 90) + 5}.25",
+                    )
+                )
+                index += 1
+
+        while (
+            index < facts if size_limit is None else written + len(FOOTER) < size_limit
+        ):
+            name = f"SyntheticDisclosure{index % distinct_names}"
+            write(
+                FACT.format(
+                    label=name,
+                    name=name,
+                    index=index,
+                    context=index % contexts,
+                    unit=unit_ids[index % len(unit_ids)],
+                    scale="6",
+                    value=f"{index % 1000:,}.50",
+                )
+            )
+            index += 1
+
+        write(FOOTER)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", type=pathlib.Path)
+    parser.add_argument("--facts", type=int, default=100_000)
+    parser.add_argument("--contexts", type=int, default=20)
+    parser.add_argument("--distinct-names", type=int, default=2_000)
+    parser.add_argument("--units", type=int, default=1)
+    parser.add_argument(
+        "--datapoints",
+        type=int,
+        default=len(TARGET_DATAPOINTS),
+        help="How many of the datapoints we extract to report in each context",
+    )
+    parser.add_argument(
+        "--size-mb",
+        type=float,
+        help="Write facts until the report is this size, instead of --facts",
+    )
+    args = parser.parse_args()
+
+    path = write_synthetic_report(
+        args.path,
+        facts=args.facts,
+        contexts=args.contexts,
+        distinct_names=args.distinct_names,
+        units=args.units,
+        datapoints=args.datapoints,
+        size_mb=args.size_mb,
+    )
+    print(f"Wrote {path} ({path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
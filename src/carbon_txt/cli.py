@@ -2,6 +2,7 @@ import json
 import os
 import subprocess
 import sys
+from typing import Annotated
 
 import pydantic_core
 import rich
@@ -16,11 +17,23 @@ logger.info("Hello, World from CLI")
 app = typer.Typer(no_args_is_help=True)
 validate_app = typer.Typer()
 web_app = typer.Typer()
+csrd_app = typer.Typer(no_args_is_help=True)
+model_cards_app = typer.Typer(no_args_is_help=True)
 app.add_typer(
     validate_app,
     name="validate",
     help="Validate carbon.txt files, either online, or locally.",
 )
+app.add_typer(
+    csrd_app,
+    name="csrd",
+    help="Work with CSRD reports directly. Requires the 'csrd' extra.",
+)
+app.add_typer(
+    model_cards_app,
+    name="model-cards",
+    help="Work with AI model cards directly. Requires the 'ai_model_cards' extra.",
+)
 
 err_console = rich.console.Console(stderr=True)
 
@@ -155,6 +168,85 @@ def validate_file(
         raise typer.Exit(code=1)
 
 
+def _stream_result_line(
+    record_id, validation_results: validators.ValidationResult
+) -> str:
+    """
+    Serialise the results of validating a single streamed record as one line of JSON.
+    """
+    if carbon_txt_file := validation_results.result:
+        result = {
+            "id": record_id,
+            "success": True,
+            "data": carbon_txt_file,
+            "document_data": validators.sanitize_document_results(
+                validation_results.document_results or {}
+            ),
+            "logs": validation_results.logs,
+        }
+    else:
+        result = {
+            "id": record_id,
+            "success": False,
+            "errors": validation_results.exceptions,
+            "logs": validation_results.logs,
+        }
+    return json.dumps(pydantic_core.to_jsonable_python(result, fallback=str))
+
+
+@validate_app.command("stream")
+def validate_stream(
+    plugins_dir: str = typer.Option(
+        None, "--plugins-dir", help="path to optional plugin directory"
+    ),
+):
+    """
+    Validate newline-delimited JSON records read from STDIN, each in the form
+    {"id": ..., "contents": ...}, writing one line of JSON per record to STDOUT.
+    """
+    # we build the validator once, and reuse it for every record in the stream
+    validator = create_validator(plugins_dir=plugins_dir, active_plugins=None)
+    stdout = typer.get_text_stream("stdout")
+    all_valid = True
+
+    # read the stream a line at a time, so memory use stays constant no
+    # matter how many records are piped in
+    for line in typer.get_text_stream("stdin"):
+        if not line.strip():
+            continue
+
+        record_id = None
+        try:
+            record = json.loads(line)
+            record_id = record.get("id")
+            contents = record["contents"]
+            if not isinstance(contents, str):
+                raise TypeError("'contents' must be a string")
+        except (ValueError, KeyError, TypeError, AttributeError) as ex:
+            all_valid = False
+            error = f"{type(ex).__name__}: {ex}"
+            stdout.write(
+                json.dumps(
+                    {
+                        "id": record_id,
+                        "success": False,
+                        "errors": [error],
+                        "logs": [f"Could not read record from stream: {error}"],
+                    }
+                )
+                + "\n"
+            )
+            stdout.flush()
+            continue
+
+        validation_results = validator.validate_contents(contents)
+        all_valid = all_valid and validation_results.result is not None
+        stdout.write(_stream_result_line(record_id, validation_results) + "\n")
+        stdout.flush()
+
+    raise typer.Exit(code=0 if all_valid else 1)
+
+
 @app.command()
 def schema(version: str = schemas.LATEST_VERSION):
     """
@@ -191,6 +283,393 @@ def _check_web_deps():
     return django, settings, execute_from_command_line, environ
 
 
+def _check_csrd_deps():
+    """Check that the 'csrd' extra dependencies are installed."""
+    from .processors.csrd_document import ARELLE_AVAILABLE
+
+    if not ARELLE_AVAILABLE:
+        rich.print("[bold red]The 'csrd' extra is not installed.[/bold red]")
+        print("Install it with: uv pip install 'carbon-txt[csrd]'")
+        raise typer.Exit(code=1)
+
+
+def _read_report_urls(
+    report_urls: list[str] | None, from_file: str | None
+) -> list[str]:
+    """
+    Combine report paths or URLs given as arguments with any listed,
+    one per line, in `from_file`, or on STDIN if `from_file` is '-'.
+    """
+    urls = list(report_urls or [])
+    if from_file == "-":
+        lines = typer.get_text_stream("stdin").read().splitlines()
+    elif from_file:
+        with open(from_file) as file:
+            lines = file.read().splitlines()
+    else:
+        lines = []
+    urls.extend(line.strip() for line in lines if line.strip())
+    return urls
+
+
+@csrd_app.command("warm-cache")
+def csrd_warm_cache(
+    report_urls: Annotated[
+        list[str] | None,
+        typer.Argument(help="Paths or URLs of CSRD reports to extract datapoints from"),
+    ] = None,
+    from_file: str = typer.Option(
+        None,
+        "--from-file",
+        help="file listing one report path or URL per line, or '-' to read from STDIN",
+    ),
+    cache_path: str = typer.Option(
+        None,
+        "--cache-path",
+        help="path to the datapoint cache database. Defaults to $CARBON_TXT_CSRD_CACHE_PATH",
+    ),
+):
+    """
+    Extract the datapoints from a list of CSRD reports, and store them in the
+    persistent datapoint cache, so later validations can skip Arelle.
+    """
+    _check_csrd_deps()
+
+    from .process_csrd_document import extract_report_datapoints
+    from .processors.csrd_datapoint_cache import (
+        CSRDDatapointCache,
+        _cache_settings_from_env,
+        get_shared_datapoint_cache,
+        report_version,
+    )
+    from .processors.csrd_document import GreenwebCSRDProcessor
+
+    if cache_path:
+        cache = CSRDDatapointCache(cache_path, **_cache_settings_from_env())
+    else:
+        cache = get_shared_datapoint_cache()
+
+    if cache is None:
+        err_console.print(
+            "No datapoint cache configured. Pass --cache-path, or set CARBON_TXT_CSRD_CACHE_PATH."
+        )
+        raise typer.Exit(code=1)
+
+    chosen_datapoints = GreenwebCSRDProcessor().local_datapoint_codes
+    failures = 0
+
+    for report_url in _read_report_urls(report_urls, from_file):
+        version = report_version(report_url)
+        if version is None:
+            err_console.print(
+                f"❌ {report_url}: could not identify the version of this report "
+                "(it is missing, or sent no ETag). Skipping."
+            )
+            failures += 1
+            continue
+
+        if cache.get(report_url, version, chosen_datapoints) is not None:
+            err_console.print(f"✅ {report_url}: already cached")
+            continue
+
+        try:
+            results = extract_report_datapoints(report_url)
+        except Exception as ex:  # noqa
+            err_console.print(f"❌ {report_url}: {ex}")
+            failures += 1
+            continue
+
+        cache.set(report_url, version, chosen_datapoints, results)
+        err_console.print(f"✅ {report_url}: cached {len(results)} results")
+
+    raise typer.Exit(code=1 if failures else 0)
+
+
+# the columns written for each datapoint by `carbon-txt csrd extract`
+EXTRACT_FIELDS = [
+    "report",
+    "short_code",
+    "name",
+    "value",
+    "unit",
+    "start_date",
+    "end_date",
+    "context",
+    "error",
+]
+
+
+def _extract_rows(report_url: str, results: list) -> list[dict]:
+    """
+    Turn the results extracted from a report into one flat row per datapoint,
+    or per datapoint we couldn't find.
+    """
+    from .exceptions import NoMatchingDatapointsError
+
+    rows = []
+    for result in results:
+        if isinstance(result, NoMatchingDatapointsError):
+            rows.append(
+                {
+                    "report": report_url,
+                    "short_code": result.datapoint_short_code,
+                    "name": result.datapoint_readable_label,
+                    "error": result.message,
+                }
+            )
+        else:
+            rows.append(
+                {"report": report_url, **result.model_dump(mode="json"), "error": None}
+            )
+    return [{field: row.get(field) for field in EXTRACT_FIELDS} for row in rows]
+
+
+@csrd_app.command("extract")
+def csrd_extract(
+    report_urls: Annotated[
+        list[str] | None,
+        typer.Argument(help="Paths or URLs of CSRD reports to extract datapoints from"),
+    ] = None,
+    from_file: str = typer.Option(
+        None,
+        "--from-file",
+        help="file listing one report path or URL per line, or '-' to read from STDIN",
+    ),
+    datapoints: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--datapoint",
+            "-d",
+            help="name of an ESRS datapoint to extract, like EnergyConsumptionFromFossilSources. "
+            "Repeat for more than one. Defaults to the energy datapoints the CSRD plugin reads",
+        ),
+    ] = None,
+    output_format: str = typer.Option(
+        "jsonl", "--format", help="write results as 'jsonl' or 'csv'"
+    ),
+    workers: int = typer.Option(
+        2, "--workers", min=1, help="number of worker processes to parse reports in"
+    ),
+):
+    """
+    Extract ESRS datapoints from a list of CSRD reports, without needing a
+    carbon.txt file for each, writing one row per datapoint to STDOUT as each
+    report is finished.
+    """
+    import concurrent.futures
+    import csv
+
+    _check_csrd_deps()
+
+    from .processors.csrd_document import GreenwebCSRDProcessor
+    from .processors.csrd_worker_pool import ArelleWorkerPool, _load_limits_from_env
+
+    if output_format not in ("jsonl", "csv"):
+        err_console.print(f"Unknown format {output_format}. Use 'jsonl' or 'csv'.")
+        raise typer.Exit(code=1)
+
+    codes = [
+        code.removeprefix("esrs:") for code in datapoints or []
+    ] or GreenwebCSRDProcessor().local_datapoint_codes
+    reports = _read_report_urls(report_urls, from_file)
+
+    stdout = typer.get_text_stream("stdout")
+    csv_writer = None
+    if output_format == "csv":
+        csv_writer = csv.DictWriter(stdout, fieldnames=EXTRACT_FIELDS)
+        csv_writer.writeheader()
+
+    def write_rows(rows: list[dict]) -> None:
+        for row in rows:
+            if csv_writer is not None:
+                csv_writer.writerow(row)
+            else:
+                stdout.write(json.dumps(row) + "\n")
+        stdout.flush()
+
+    pool = ArelleWorkerPool(
+        max_workers=workers, max_queue_depth=workers, **_load_limits_from_env()
+    )
+    failures = 0
+
+    def extract(report_url: str) -> list:
+        is_remote = report_url.startswith(("http://", "https://"))
+        if not is_remote and not os.path.isfile(report_url):
+            raise FileNotFoundError(f"No report found at {report_url}")
+        return pool.extract(report_url, codes)
+
+    # a thread per worker process hands reports to the pool, so each report
+    # gets the pool's retries and load limits, and results are written out
+    # in the order reports finish
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as threads:
+            futures = {
+                threads.submit(extract, report_url): report_url
+                for report_url in reports
+            }
+            for future in concurrent.futures.as_completed(futures):
+                report_url = futures[future]
+                try:
+                    write_rows(_extract_rows(report_url, future.result()))
+                except Exception as ex:  # noqa
+                    failures += 1
+                    error = f"{type(ex).__name__}: {ex}"
+                    write_rows(
+                        [
+                            dict.fromkeys(EXTRACT_FIELDS)
+                            | {"report": report_url, "error": error}
+                        ]
+                    )
+    finally:
+        pool.shutdown()
+
+    err_console.print(
+        f"Extracted datapoints from {len(reports) - failures} of {len(reports)} reports"
+    )
+    raise typer.Exit(code=1 if failures else 0)
+
+
+# the columns written for each field by `carbon-txt model-cards extract`
+MODEL_CARD_FIELDS = ["card", "short_code", "name", "value", "unit", "error"]
+
+
+def _model_card_rows(card_url: str, results: list | Exception) -> list[dict]:
+    """
+    Turn the results read from a model card into one flat row per field,
+    or a single row with the error if the card couldn't be read.
+    """
+    from .exceptions import NoMatchingDatapointsError
+
+    if isinstance(results, Exception):
+        error = f"{type(results).__name__}: {results}"
+        return [dict.fromkeys(MODEL_CARD_FIELDS) | {"card": card_url, "error": error}]
+
+    rows = []
+    for result in results:
+        if isinstance(result, NoMatchingDatapointsError):
+            rows.append(
+                {
+                    "card": card_url,
+                    "short_code": result.datapoint_short_code,
+                    "name": result.datapoint_readable_label,
+                    "error": result.message,
+                }
+            )
+        else:
+            rows.append(
+                {"card": card_url, **result.model_dump(mode="json"), "error": None}
+            )
+    return [{field: row.get(field) for field in MODEL_CARD_FIELDS} for row in rows]
+
+
+@model_cards_app.command("extract")
+def model_cards_extract(
+    card_urls: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Paths or URLs of model cards, or directories to search for README.md files",
+        ),
+    ] = None,
+    from_file: str = typer.Option(
+        None,
+        "--from-file",
+        help="file listing one model card path, URL or directory per line, or '-' to read from STDIN",
+    ),
+    output_format: str = typer.Option(
+        "jsonl", "--format", help="write results as 'jsonl' or 'csv'"
+    ),
+    workers: int = typer.Option(
+        4, "--workers", min=1, help="number of model cards to read at once"
+    ),
+):
+    """
+    Extract the co2_eq_emissions data and model name from many AI model
+    cards, like a local mirror of model repositories, writing one row per
+    field to STDOUT as each card is finished.
+    """
+    import csv
+
+    from .processors.ai_model_card import (
+        OPTIONAL_DEPENDENCIES_AVAILABLE,
+        extract_model_cards,
+        find_model_cards,
+    )
+
+    if not OPTIONAL_DEPENDENCIES_AVAILABLE:
+        rich.print("[bold red]The 'ai_model_cards' extra is not installed.[/bold red]")
+        print("Install it with: uv pip install 'carbon-txt[ai_model_cards]'")
+        raise typer.Exit(code=1)
+
+    if output_format not in ("jsonl", "csv"):
+        err_console.print(f"Unknown format {output_format}. Use 'jsonl' or 'csv'.")
+        raise typer.Exit(code=1)
+
+    cards = find_model_cards(_read_report_urls(card_urls, from_file))
+
+    stdout = typer.get_text_stream("stdout")
+    csv_writer = None
+    if output_format == "csv":
+        csv_writer = csv.DictWriter(stdout, fieldnames=MODEL_CARD_FIELDS)
+        csv_writer.writeheader()
+
+    failures = 0
+    for card_url, results in extract_model_cards(cards, max_workers=workers):
+        if isinstance(results, Exception):
+            failures += 1
+        for row in _model_card_rows(card_url, results):
+            if csv_writer is not None:
+                csv_writer.writerow(row)
+            else:
+                stdout.write(json.dumps(row) + "\n")
+        stdout.flush()
+
+    err_console.print(
+        f"Extracted data from {len(cards) - failures} of {len(cards)} model cards"
+    )
+    raise typer.Exit(code=1 if failures else 0)
+
+
+@csrd_app.command("preload-taxonomies")
+def csrd_preload_taxonomies(
+    package_paths: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Taxonomy package zip files, or directories of them. Defaults to $CARBON_TXT_ARELLE_TAXONOMY_PACKAGES",
+        ),
+    ] = None,
+    cache_dir: str = typer.Option(
+        None,
+        "--cache-dir",
+        help="Arelle cache directory to load them into. Defaults to $CARBON_TXT_ARELLE_CACHE_DIR",
+    ),
+):
+    """
+    Copy the files from ESRS and ESEF taxonomy packages into the Arelle cache,
+    so CSRD reports can be parsed without fetching taxonomies over the network.
+    """
+    _check_csrd_deps()
+
+    from .processors.csrd_document import DEFAULT_CACHE_DIR, _session_limits_from_env
+    from .processors.csrd_taxonomy_packages import (
+        find_taxonomy_packages,
+        preload_taxonomy_package,
+    )
+
+    settings = _session_limits_from_env()
+    cache_dir = cache_dir or settings["cache_directory"] or DEFAULT_CACHE_DIR
+    packages = find_taxonomy_packages(package_paths or settings["taxonomy_packages"])
+
+    if not packages:
+        err_console.print(
+            "No taxonomy packages found. Pass their paths, or set CARBON_TXT_ARELLE_TAXONOMY_PACKAGES."
+        )
+        raise typer.Exit(code=1)
+
+    for package in packages:
+        copied = preload_taxonomy_package(package, cache_dir)
+        err_console.print(f"✅ {package}: copied {copied} files into {cache_dir}")
+
+
 def configure_django(
     settings_module: str = "carbon_txt.web.config.settings.development",
     plugins_dir: str | None = None,
@@ -204,6 +683,33 @@ def configure_django(
     return settings
 
 
+def _settings_module(django_settings: str | None, production: bool) -> str:
+    """
+    Choose the Django settings module to run the web commands with.
+    """
+    # override the prod / non prod switch if a custom settings module is provided
+    if django_settings:
+        # because we want to support importing a custtom settings file in the
+        # same directory where we are calling `carbon-txt serve` we add the current
+        # directory to the python path
+        sys.path.insert(0, os.getcwd())
+        rich.print(f"Using custom settings module: {django_settings}")
+        return django_settings
+    if production:
+        rich.print("Running in production mode")
+        return "carbon_txt.web.config.settings.production"
+    return "carbon_txt.web.config.settings.development"
+
+
+# the granian interface, and application, to serve the API with for each
+# `--interface`. Django doesn't support the ASGI lifespan protocol, so we use
+# granian's ASGI interface without it.
+GRANIAN_INTERFACES = {
+    "asgi": ("asginl", "carbon_txt.web.config.asgi:application"),
+    "wsgi": ("wsgi", "carbon_txt.web.config.wsgi:application"),
+}
+
+
 @app.command()
 def serve(
     host: str = typer.Option("127.0.0.1", help="Host to bind to"),
@@ -222,27 +728,23 @@ def serve(
     migrate: bool = typer.Option(
         False, help="Run database migrations before starting server"
     ),
+    interface: str = typer.Option(
+        "asgi",
+        help="Serve the API to granian over 'asgi', so each worker can wait on many "
+        "validations at once, or over 'wsgi', with a thread per request",
+    ),
 ):
     """Run the carbon.txt validator web server"""
 
+    if interface not in GRANIAN_INTERFACES:
+        err_console.print(f"Unknown interface {interface}. Use 'asgi' or 'wsgi'.")
+        raise typer.Exit(code=1)
+
     # Check web deps and get django components
     _django, settings, execute_from_command_line, _ = _check_web_deps()
 
     try:
-        # override the prod / non prod switch if a custom settings module is provided
-        if django_settings:
-            # because we want to support importing a custtom settings file in the
-            # same directory where we are calling `carbon-txt serve` we add the current
-            # directory to the python path
-            sys.path.insert(0, os.getcwd())
-            rich.print(f"Using custom settings module: {django_settings}")
-            settings_module = django_settings
-        else:
-            if production:
-                rich.print("Running in production mode")
-                settings_module = "carbon_txt.web.config.settings.production"
-            else:
-                settings_module = "carbon_txt.web.config.settings.development"
+        settings_module = _settings_module(django_settings, production)
 
         rich.print("\n ----------------\n")
         configure_django(
@@ -267,22 +769,23 @@ def serve(
                 raise
 
         if server == "granian":
-            rich.print("Running with Granian server")
+            rich.print(f"Running with Granian server, over {interface.upper()}")
 
             rich.print("\n ----------------\n")
             # Run Granian instead of Django development server
 
+            granian_interface, application = GRANIAN_INTERFACES[interface]
             cmd_args = [
                 "granian",
                 "--interface",
-                "wsgi",
+                granian_interface,
                 "--host",
                 str(host),
                 "--port",
                 str(port),
                 # without the access log flag we see no requests in the logs
                 "--access-log",
-                "carbon_txt.web.config.wsgi:application",
+                application,
             ]
             subprocess.run(cmd_args, check=False)
         else:
@@ -304,6 +807,50 @@ def serve(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def worker(
+    poll_interval: float = typer.Option(
+        1.0, help="Seconds to wait before checking an empty queue again"
+    ),
+    once: bool = typer.Option(
+        False, "--once", help="Exit once the queue is empty, instead of waiting"
+    ),
+    production: bool = typer.Option(False, help="Run in production mode"),
+    django_settings: str = typer.Option(
+        None, "--django-settings", "-ds", help="path to Django settings module"
+    ),
+    plugins_dir: str = typer.Option(
+        None, "--plugins-dir", help="path to optional plugin directory"
+    ),
+):
+    """
+    Run the queued jobs processing documents linked in carbon.txt files, like
+    CSRD reports, for a web server with ASYNC_DOCUMENT_PROCESSING set.
+    """
+    _check_web_deps()
+    settings = configure_django(
+        settings_module=_settings_module(django_settings, production),
+        plugins_dir=plugins_dir,
+    )
+
+    from .web.document_jobs.jobs import run_worker
+    from .web.prewarm import prewarm
+
+    # there are no readiness checks for a worker, so we warm up before
+    # taking the first job, rather than in the background
+    if settings.PREWARM_ON_BOOT:
+        err_console.print("Prewarming plugins")
+        prewarm()
+
+    err_console.print("Waiting for document processing jobs")
+    try:
+        jobs_run = run_worker(poll_interval=poll_interval, once=once)
+    except KeyboardInterrupt:
+        raise typer.Exit(code=0)
+    err_console.print(f"Ran {jobs_run} document processing jobs")
+    raise typer.Exit(code=0)
+
+
 @app.command()
 def plugins(
     plugins_dir: str = typer.Option(
@@ -54,6 +54,14 @@ class NoMatchingDatapointsError(ValueError):
         self.datapoint_short_code = datapoint_short_code
         self.datapoint_readable_label = datapoint_readable_label
 
+    def __reduce__(self):
+        # our constructor takes keyword arguments, so we need to tell pickle
+        # how to rebuild the exception when it crosses a process boundary
+        return (
+            self.__class__,
+            (self.message, self.datapoint_short_code, self.datapoint_readable_label),
+        )
+
     @property
     def message(self):
         return self.args[0]  # ValueError stores the message in args
@@ -78,3 +86,40 @@ class NoLoadableCSRDFile(ValueError):
     """
     Thrown when a the link CSRD file can't be loaded by Arelle.
     """
+
+
+class ReportLoadLimitExceeded(NoLoadableCSRDFile):
+    """
+    Thrown when loading a CSRD report takes longer, or uses more memory,
+    than we allow. `limit` says which limit was exceeded, either "time"
+    or "memory".
+    """
+
+    def __init__(self, message: str, limit: str):
+        super().__init__(message)
+        self.limit = limit
+
+    def __reduce__(self):
+        # so the exception survives being sent back from a worker process
+        return (self.__class__, (self.args[0], self.limit))
+
+
+class ReportPackageTooLarge(NoLoadableCSRDFile):
+    """
+    Thrown when a zipped report package would decompress to more data
+    than we are configured to accept.
+    """
+
+
+class UnsupportedIXBRLDocument(ValueError):
+    """
+    Thrown when a report uses a feature the StreamingIXBRLProcessor doesn't
+    handle, and should be parsed with the ArelleProcessor instead.
+    """
+
+
+class CSRDWorkerPoolFull(RuntimeError):
+    """
+    Thrown when the pool of worker processes for parsing CSRD reports
+    already has as many reports queued as it is configured to accept.
+    """
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Literal
 from urllib.parse import ParseResult, urlparse
 
+import dns.asyncresolver
 import dns.resolver
 import httpx
 import rich  # noqa
@@ -15,7 +16,7 @@ from structlog import get_logger
 
 from . import parsers_toml
 from .exceptions import UnreachableCarbonTxtFile
-from .http_client import HTTPClient
+from .http_client import AsyncHTTPClient, HTTPClient
 
 logger = get_logger()
 
@@ -51,11 +52,24 @@ class FileFinder:
     a carbon.txt file from.
     """
 
-    def __init__(self, http_client: HTTPClient | None = None):
+    def __init__(
+        self,
+        http_client: HTTPClient | None = None,
+        async_http_client: AsyncHTTPClient | None = None,
+    ):
         if http_client is None:
             http_client = HTTPClient()
         self.http_client = http_client
 
+        # used by the async counterparts of the lookup methods, prefixed with
+        # an "a", like `aresolve_domain`
+        if async_http_client is None:
+            async_http_client = AsyncHTTPClient(
+                http_timeout=http_client.http_timeout,
+                http_user_agent=http_client.http_user_agent,
+            )
+        self.async_http_client = async_http_client
+
     def update_tld_suffix_list(self) -> None:
         """
         Updates the  public suffix list used by tldextract.
@@ -85,19 +99,24 @@ class FileFinder:
         # if there is a valid TXT record on it, return that
         try:
             answers = dns.resolver.resolve(domain, "TXT")
+            return self._location_from_txt_records(answers)
+        except dns.resolver.NoAnswer:
+            logger.info("No result from TXT lookup")
+            return None
+        except dns.resolver.NXDOMAIN as ex:
+            logger.info(f"No result from TXT lookup: {ex.msg}")
+            return None
+        except Exception as ex:
+            logger.exception(f"New exception: {ex}")  # noqa
+            return None
 
-            for answer in answers:
-                txt_record = answer.to_text().strip('"')
-                if txt_record.startswith("carbon-txt-location"):
-                    # pull out our URL to check
-                    _, override_url = txt_record.split("=")
-
-                    if override_url is not None:
-                        logger.info(
-                            f"Found an override_url to use from the DNS lookup: {override_url}"
-                        )
-                        return override_url
-
+    async def _alookup_dns(self, domain: str) -> str | None:
+        """
+        Async version of _lookup_dns.
+        """
+        try:
+            answers = await dns.asyncresolver.resolve(domain, "TXT")
+            return self._location_from_txt_records(answers)
         except dns.resolver.NoAnswer:
             logger.info("No result from TXT lookup")
             return None
@@ -108,6 +127,23 @@ class FileFinder:
             logger.exception(f"New exception: {ex}")  # noqa
             return None
 
+    def _location_from_txt_records(self, answers) -> str | None:
+        """
+        Return the delegated carbon.txt URI from the answers to a DNS TXT
+        record lookup, if there is one
+        """
+        for answer in answers:
+            txt_record = answer.to_text().strip('"')
+            if txt_record.startswith("carbon-txt-location"):
+                # pull out our URL to check
+                _, override_url = txt_record.split("=")
+
+                if override_url is not None:
+                    logger.info(
+                        f"Found an override_url to use from the DNS lookup: {override_url}"
+                    )
+                    return override_url
+
         return None
 
     def _is_tld(self, domain: str) -> bool:
@@ -155,6 +191,23 @@ class FileFinder:
         except UnreachableCarbonTxtFile:
             return None
 
+    async def _acheck_for_hosted_carbon_txt(self, url, logs=None) -> str | None:
+        """
+        Async version of _check_for_hosted_carbon_txt.
+        """
+        message = f"Checking if a carbon.txt file is reachable at {url}"
+        log_safely(message, logs)
+        uri = urlparse(url)
+        try:
+            response = await self.aresolve_uri(uri.geturl(), logs)
+            if response:
+                log_safely(f"New Carbon text file found at: {response.uri}", logs)
+                return response.uri
+            else:
+                return None
+        except UnreachableCarbonTxtFile:
+            return None
+
     def _check_for_dns_delegation(self, domain: str, logs=None) -> str | None:
         """
         Check for a 'carbon-txt-location' DNS TXT record, and return the URL in the record if present
@@ -166,6 +219,17 @@ class FileFinder:
         else:
             return None
 
+    async def _acheck_for_dns_delegation(self, domain: str, logs=None) -> str | None:
+        """
+        Async version of _check_for_dns_delegation.
+        """
+        log_safely(f"Trying a DNS delegated lookup for domain {domain}", logs)
+        if uri_from_domain := await self._alookup_dns(domain):
+            log_safely(f"New lookup found for domain {domain}: {uri_from_domain}", logs)
+            return (await self.aresolve_domain_or_uri(uri_from_domain, logs)).uri
+        else:
+            return None
+
     def _check_for_http_header_delegation(self, domain: str, logs=None) -> str | None:
         """
         Check for a 'CarbonTxt-Location' header in the response, and return the URL in the header if present
@@ -195,6 +259,31 @@ class FileFinder:
         else:
             return None
 
+    async def _acheck_for_http_header_delegation(
+        self, domain: str, logs=None
+    ) -> str | None:
+        """
+        Async version of _check_for_http_header_delegation.
+        """
+        log_safely(
+            f"Checking for a 'CarbonTxt-Location' header in the response: http://{domain}",
+            logs,
+        )
+        response = await self.async_http_client.head(f"https://{domain}")
+        header_url = response.headers.get("carbontxt-location")
+        if header_url is None:
+            return None
+
+        log_safely(
+            f"Found a 'CarbonTxt-Location' header, following to {header_url}", logs
+        )
+        try:
+            parsed_url = str(httpx.URL(header_url))
+            return (await self.aresolve_domain_or_uri(parsed_url, logs)).uri
+        except httpx.InvalidURL:
+            logger.error(f"Invalid URL in 'CarbonTxt-Location' header: {header_url}")
+            return None
+
     def fetch_carbon_txt_file(self, uri: str, logs=None) -> str:
         """
         Accept a URI and either fetch the file over HTTP(S), or read the local file.
@@ -220,6 +309,26 @@ class FileFinder:
 
         raise ValueError(f"Could not fetch file contents at {str}")
 
+    async def afetch_carbon_txt_file(self, uri: str, logs=None) -> str:
+        """
+        Async version of fetch_carbon_txt_file.
+        """
+        if uri.startswith("http"):
+            try:
+                response = await self.async_http_client.get(uri)
+                response.raise_for_status()
+                return response.text
+            except httpx.ConnectError as ex:
+                raise UnreachableCarbonTxtFile(
+                    f"Could not connect to {uri}. Error was: {ex}"
+                )
+            except httpx.HTTPStatusError as exc:
+                raise UnreachableCarbonTxtFile(
+                    f"Requesting {uri} returned an HTTP {exc.response.status_code} response"
+                )
+
+        return self.fetch_carbon_txt_file(uri, logs)
+
     def resolve_domain_or_uri(self, domain_or_uri: str, logs=None) -> FinderResult:
         """
         Accepts EITHER an HTTP or HTTP URI, OR a Fully-qualified domain name.
@@ -234,6 +343,17 @@ class FileFinder:
         else:
             return self.resolve_domain(domain_or_uri, logs)
 
+    async def aresolve_domain_or_uri(
+        self, domain_or_uri: str, logs=None
+    ) -> FinderResult:
+        """
+        Async version of resolve_domain_or_uri.
+        """
+        if domain_or_uri.startswith("http"):
+            return await self.aresolve_uri(domain_or_uri, logs)
+        else:
+            return await self.aresolve_domain(domain_or_uri, logs)
+
     def resolve_domain(
         self, domain: str, logs: list | None = None, checking_alternate: bool = False
     ) -> FinderResult:
@@ -308,6 +428,51 @@ class FileFinder:
             f"Unable to find a valid carbon.txt file at the domain {domain}"
         )
 
+    async def aresolve_domain(
+        self, domain: str, logs: list | None = None, checking_alternate: bool = False
+    ) -> FinderResult:
+        """
+        Async version of resolve_domain, checking the same places in the
+        same order, so one server process can wait on many lookups at once.
+        """
+        try:
+            if candidate := await self._acheck_for_dns_delegation(domain, logs):
+                return FinderResult(candidate, "dns")
+
+            default_paths = ["/carbon.txt", "/.well-known/carbon.txt"]
+
+            for url_path in default_paths:
+                if candidate := await self._acheck_for_hosted_carbon_txt(
+                    f"https://{domain}{url_path}", logs
+                ):
+                    return FinderResult(candidate, None)
+
+            if candidate := await self._acheck_for_http_header_delegation(domain, logs):
+                return FinderResult(candidate, "http")
+        except Exception as e:  # noqa
+            message = traceback.format_exception(e)
+            log_safely(
+                f"Encountered an exception while attempting to resolve requested domain:\n{message}",
+                logs,
+            )
+
+        alternate_domain = self._alternate_domain(domain)
+        if not checking_alternate and alternate_domain:
+            log_safely(
+                f"Requested domain has a permitted alternate: {alternate_domain}. Falling back to check",
+                logs,
+            )
+            try:
+                return await self.aresolve_domain(
+                    alternate_domain, logs, checking_alternate=True
+                )
+            except UnreachableCarbonTxtFile:
+                pass
+
+        raise UnreachableCarbonTxtFile(
+            f"Unable to find a valid carbon.txt file at the domain {domain}"
+        )
+
     def resolve_uri(self, uri: str, logs=None) -> FinderResult:
         """
         Accept a URI pointing to a carbon.txt file, and return the final
@@ -351,3 +516,33 @@ class FileFinder:
             )
 
         return FinderResult(parsed_uri.geturl(), None)
+
+    async def aresolve_uri(self, uri: str, logs=None) -> FinderResult:
+        """
+        Async version of resolve_uri.
+        """
+        parsed_uri = self._parse_uri(uri)
+
+        # local files are checked the same way as in resolve_uri
+        if not parsed_uri:
+            return self.resolve_uri(uri, logs)
+
+        try:
+            response = await self.async_http_client.head(parsed_uri.geturl())
+        except httpx.ConnectError:
+            raise UnreachableCarbonTxtFile(
+                f"Could not connect to {parsed_uri.geturl()}."
+            )
+
+        except Exception as ex:
+            logger.exception(f"Unexpected error fetching {parsed_uri.geturl()}: {ex}")  # noqa
+            raise UnreachableCarbonTxtFile(
+                f"Could not connect to {parsed_uri.geturl()}."
+            )
+
+        if response.status_code > 299:
+            raise UnreachableCarbonTxtFile(
+                f"HTTP error {response.status_code} when connecting to {parsed_uri.geturl()}"
+            )
+
+        return FinderResult(parsed_uri.geturl(), None)
@@ -17,3 +17,8 @@ def register_document_type(schema):
 @hookspec
 def process_document(document, parsed_carbon_txt_file, logs):
     """Processes the supplied supporting evidence document, returning the results of processing it"""
+
+
+@hookspec
+def prewarm(logs):
+    """Called once when a web server or worker process starts, to set up anything slow ahead of the first request"""
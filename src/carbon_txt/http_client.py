@@ -1,12 +1,52 @@
+import asyncio
+import atexit
+import contextlib
 import importlib.metadata
+import weakref
+from collections.abc import Iterator
 
 import httpx
 
+# Pooled clients for AsyncHTTPClient, so requests reuse open connections,
+# rather than making a new connection and TLS handshake each. Async clients
+# can only be used in the event loop they were created in, so there is one
+# per loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
 
-class HTTPClient:
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient()
+    return client
+
+
+async def aclose_async_client() -> None:
     """
-    This class wraps httpx, and ensures that we use the configured timeout and http user User-Agent,
-    everywhere that the validator makes HTTP requests.
+    Close the pooled client for the running event loop, and its connections.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@atexit.register
+def _close_async_clients() -> None:
+    """
+    Close the pooled clients of event loops still open as the process exits.
+    Those of closed loops have nothing left to wait on, so are left to go.
+    """
+    for loop, client in list(_async_clients.items()):
+        if not (loop.is_closed() or loop.is_running()):
+            with contextlib.suppress(Exception):
+                loop.run_until_complete(client.aclose())
+    _async_clients.clear()
+
+
+class BaseHTTPClient:
+    """
+    The timeout and User-Agent shared by the sync and async HTTP clients.
     """
 
     def __init__(self, http_timeout: float = 5.0, http_user_agent: str | None = None):
@@ -20,15 +60,50 @@ class HTTPClient:
                 f"CarbonTxtValidator/{version} (https://carbontxt.org/tools/validator)"
             )
 
+    def all_request_kwargs(self, kwargs):
+        # keep any headers the caller sets, like those for conditional requests
+        headers = (kwargs.get("headers") or {}) | self.http_headers
+        return kwargs | {"timeout": self.http_timeout, "headers": headers}
+
+    @property
+    def http_headers(self) -> dict[str, str]:
+        return {"User-Agent": self.http_user_agent}
+
+
+class HTTPClient(BaseHTTPClient):
+    """
+    This class wraps httpx, and ensures that we use the configured timeout and http user User-Agent,
+    everywhere that the validator makes HTTP requests.
+    """
+
     def get(self, *args, **kwargs) -> httpx.Response:
         return httpx.get(*args, **self.all_request_kwargs(kwargs))
 
     def head(self, *args, **kwargs) -> httpx.Response:
         return httpx.head(*args, **self.all_request_kwargs(kwargs))
 
-    def all_request_kwargs(self, kwargs):
-        return kwargs | {"timeout": self.http_timeout, "headers": self.http_headers}
+    @contextlib.contextmanager
+    def stream(self, method: str, *args, **kwargs) -> Iterator[httpx.Response]:
+        """
+        Make a request without reading the response body up front, so callers
+        can read as much of it as they need, and close the connection early.
+        """
+        with httpx.stream(method, *args, **self.all_request_kwargs(kwargs)) as response:
+            yield response
 
-    @property
-    def http_headers(self) -> dict[str, str]:
-        return {"User-Agent": self.http_user_agent}
+
+class AsyncHTTPClient(BaseHTTPClient):
+    """
+    The async counterpart to HTTPClient, for the async API views. Awaiting a
+    request hands the event loop to other requests while we wait on the
+    network, rather than holding a thread.
+
+    Requests share a pooled httpx.AsyncClient for the running event loop,
+    so each one doesn't open and close its own connection.
+    """
+
+    async def get(self, *args, **kwargs) -> httpx.Response:
+        return await _get_async_client().get(*args, **self.all_request_kwargs(kwargs))
+
+    async def head(self, *args, **kwargs) -> httpx.Response:
+        return await _get_async_client().head(*args, **self.all_request_kwargs(kwargs))
@@ -1,9 +1,19 @@
+import contextlib
+import itertools
 import logging
 import os
+import pathlib
+import sqlite3
+import tempfile
+import time
+import typing
+from collections.abc import Iterable
 from urllib.parse import urlparse
 
+import httpx
 from structlog import get_logger
 
+from .exceptions import ReportLoadLimitExceeded
 from .hookspecs import hookimpl
 from .http_client import HTTPClient
 from .schemas.common import Disclosure
@@ -31,6 +41,16 @@ IXBRL_CONTENT_MARKERS = (
     b"<xbrldi:",
 )
 
+# Zipped ESEF report packages start with the signature of a zip file entry,
+# rather than any iXBRL markers, as their contents are compressed.
+ZIP_SIGNATURE = b"PK\x03\x04"
+
+# A tiny iXBRL report bundled with the package, parsed when the plugin is
+# prewarmed, so the first real report doesn't pay for setting up Arelle
+PREWARM_REPORT_PATH = (
+    pathlib.Path(__file__).parent / "processors" / "data" / "prewarm-report.xhtml"
+)
+
 # How many bytes of the response body to fetch for content sniffing.
 # iXBRL namespaces and root elements appear very early in the document.
 _SNIFF_BYTES = 8192
@@ -82,8 +102,45 @@ def _looks_like_ixbrl_content(text: bytes) -> bool:
     return any(marker in text_lower for marker in IXBRL_CONTENT_MARKERS)
 
 
+def _looks_like_report_package(text: bytes) -> bool:
+    """
+    Check whether the given raw bytes look like the start of a zip file,
+    which could be a zipped ESEF report package.
+    """
+    return text.startswith(ZIP_SIGNATURE)
+
+
+def _looks_like_csrd_report(text: bytes) -> bool:
+    """
+    Check whether the start of a response body looks like an iXBRL report,
+    or a zipped report package.
+    """
+    return _looks_like_ixbrl_content(text) or _looks_like_report_package(text)
+
+
+def _spool(
+    spool_to: typing.BinaryIO, chunks: Iterable[bytes], max_bytes: int | None
+) -> bool:
+    """
+    Write `chunks` to `spool_to`, stopping once they add up to more than
+    `max_bytes`. Returns whether all of them were written.
+    """
+    spooled = 0
+    for chunk in chunks:
+        spooled += len(chunk)
+        if max_bytes is not None and spooled > max_bytes:
+            return False
+        spool_to.write(chunk)
+    spool_to.flush()
+    return True
+
+
 def _quick_validate_remote_csrd_url(
-    url: str, http_client: HTTPClient | None = None, logs: list | None = None
+    url: str,
+    http_client: HTTPClient | None = None,
+    logs: list | None = None,
+    spool_to: typing.BinaryIO | None = None,
+    max_spool_bytes: int | None = None,
 ) -> bool:
     """
     Lightweight HTTP HEAD check before invoking Arelle.
@@ -94,6 +151,12 @@ def _quick_validate_remote_csrd_url(
 
     Only checks remote (http/https) URLs. Local file paths are always
     allowed through.
+
+    If `spool_to` is given, and the URL looks like an iXBRL report, the rest
+    of the report is streamed into it, so Arelle can load it from disk
+    without downloading it again. If the download fails part way through,
+    `spool_to` is left empty. If the report is bigger than `max_spool_bytes`,
+    we stop downloading it, and it fails the check.
     """
     if not url.startswith(("http://", "https://")):
         return True  # local files - let Arelle handle them
@@ -126,37 +189,76 @@ def _quick_validate_remote_csrd_url(
         # of the body and check for XBRL/iXBRL markers to distinguish them.
         # This avoids passing regular HTML pages to Arelle, which can crash or
         # hang when it encounters unexpected content like <img> tags.
-        try:
-            get_response = http_client.get(url, follow_redirects=True)
-            if get_response.status_code >= 400:
+        with http_client.stream("GET", url, follow_redirects=True) as get_response:
+            try:
+                if get_response.status_code >= 400:
+                    log_safely(
+                        f"CSRD pre-check: URL {url} returned HTTP "
+                        f"{get_response.status_code} on content fetch",
+                        logs,
+                        level=logging.WARNING,
+                    )
+                    return False
+                # Only read the first few KB — iXBRL markers appear early, and
+                # closing the stream here means we don't download the whole report
+                chunks = get_response.iter_bytes()
+                body_snippet = b""
+                for chunk in chunks:
+                    body_snippet += chunk
+                    if len(body_snippet) >= _SNIFF_BYTES:
+                        break
+            except Exception as sniff_err:
+                log_safely(
+                    f"CSRD pre-check: could not sniff content at {url}: {sniff_err}",
+                    logs,
+                    level=logging.WARNING,
+                )
+                # If we can't sniff, fall back to letting Arelle try (the old
+                # behaviour) rather than blocking potentially valid reports.
+                return True
+
+            if not _looks_like_csrd_report(body_snippet[:_SNIFF_BYTES]):
                 log_safely(
-                    f"CSRD pre-check: URL {url} returned HTTP "
-                    f"{get_response.status_code} on content fetch",
+                    f"CSRD pre-check: URL {url} was fetched successfully but does "
+                    f"not contain iXBRL/XBRL content. It appears to be a regular "
+                    f"web page. Skipping Arelle processing.",
                     logs,
                     level=logging.WARNING,
                 )
                 return False
-            # Only check the first few KB — iXBRL markers appear early
-            body_snippet = get_response.content[:_SNIFF_BYTES]
-        except Exception as sniff_err:
-            log_safely(
-                f"CSRD pre-check: could not sniff content at {url}: {sniff_err}",
-                logs,
-                level=logging.WARNING,
-            )
-            # If we can't sniff, fall back to letting Arelle try (the old
-            # behaviour) rather than blocking potentially valid reports.
-            return True
 
-        if not _looks_like_ixbrl_content(body_snippet):
-            log_safely(
-                f"CSRD pre-check: URL {url} was fetched successfully but does "
-                f"not contain iXBRL/XBRL content. It appears to be a regular "
-                f"web page. Skipping Arelle processing.",
-                logs,
-                level=logging.WARNING,
-            )
-            return False
+            if spool_to is not None:
+                content_length = get_response.headers.get("content-length", "")
+                too_large = (
+                    max_spool_bytes is not None
+                    and content_length.isdigit()
+                    and int(content_length) > max_spool_bytes
+                )
+                body = itertools.chain([body_snippet], chunks)
+                try:
+                    spooled = not too_large and _spool(spool_to, body, max_spool_bytes)
+                except (OSError, httpx.HTTPError) as spool_err:
+                    log_safely(
+                        f"CSRD pre-check: could not download {url}: {spool_err}",
+                        logs,
+                        level=logging.WARNING,
+                    )
+                    # leave Arelle to fetch the report itself
+                    spool_to.seek(0)
+                    spool_to.truncate()
+                    return True
+
+                if not spooled and max_spool_bytes is not None:
+                    log_safely(
+                        f"CSRD pre-check: URL {url} is larger than the "
+                        f"{max_spool_bytes // (1024 * 1024)}MB limit on reports "
+                        f"we download. Skipping Arelle processing.",
+                        logs,
+                        level=logging.WARNING,
+                    )
+                    spool_to.seek(0)
+                    spool_to.truncate()
+                    return False
 
         return True
     except Exception as e:
@@ -172,12 +274,167 @@ plugin_name = "csrd_greenweb"
 
 # Guarded import - the CSRD processor requires the 'csrd' extra
 try:
-    from .processors.csrd_document import GreenwebCSRDProcessor
+    from .processors.csrd_datapoint_cache import (
+        get_shared_datapoint_cache,
+        report_version,
+    )
+    from .processors.csrd_document import (
+        ARELLE_AVAILABLE,
+        ArelleProcessor,
+        GreenwebCSRDProcessor,
+        get_shared_session_manager,
+    )
+    from .processors.csrd_report_package import max_decompressed_bytes_from_env
+    from .processors.csrd_report_store import (
+        ReportTooLargeForStore,
+        get_shared_report_store,
+    )
+    from .processors.csrd_worker_pool import get_shared_worker_pool
 
     CSRD_PROCESSOR_AVAILABLE = True
 except ImportError:
     CSRD_PROCESSOR_AVAILABLE = False
+    ARELLE_AVAILABLE = False
+    ArelleProcessor = None  # type: ignore
     GreenwebCSRDProcessor = None  # type: ignore
+    get_shared_session_manager = None  # type: ignore
+    get_shared_worker_pool = None  # type: ignore
+    get_shared_report_store = None  # type: ignore
+    ReportTooLargeForStore = None  # type: ignore
+    max_decompressed_bytes_from_env = None  # type: ignore
+    get_shared_datapoint_cache = None  # type: ignore
+    report_version = None  # type: ignore
+
+
+def extract_report_datapoints(
+    report_url: str,
+    report_path: str | None = None,
+    datapoint_codes: list[str] | None = None,
+    version: str | None = None,
+) -> list:
+    """
+    Parse the report at `report_url` with Arelle, and return the values
+    for the datapoints the GreenwebCSRDProcessor looks for, or for
+    `datapoint_codes` if given.
+
+    If the report has already been downloaded, pass the path to the local copy
+    as `report_path`, and Arelle will load that instead of fetching it again.
+    If you know which version of the report it is, pass that as `version`.
+    """
+    chosen_datapoints = datapoint_codes or GreenwebCSRDProcessor().local_datapoint_codes
+
+    # If a pool of worker processes is configured, parse the report
+    # there, so we don't block this process while Arelle runs
+    if (worker_pool := get_shared_worker_pool()) is not None:
+        return worker_pool.extract(
+            report_url, chosen_datapoints, report_path=report_path, version=version
+        )
+
+    processor = GreenwebCSRDProcessor(
+        report_url=report_url,
+        report_path=report_path,
+        datapoint_codes=chosen_datapoints,
+        version=version,
+    )
+
+    try:
+        return processor.get_esrs_datapoint_values(chosen_datapoints)
+    finally:
+        # release the parsed report, so long running processes
+        # don't hold every report they have seen in memory
+        processor.close()
+
+
+@hookimpl
+def prewarm(logs: list | None):
+    """
+    Start the shared Arelle session, and parse the bundled prewarm report
+    with it, and with the streaming fast path, so the first CSRD report
+    linked in a carbon.txt file doesn't pay for setting them up.
+
+    If a worker pool is configured, reports are never parsed in this
+    process, so only the pool is warmed up, rather than holding an Arelle
+    session here that is never used.
+    """
+    if not (CSRD_PROCESSOR_AVAILABLE and ARELLE_AVAILABLE):
+        log_safely(
+            f"{plugin_name}: the 'csrd' extra is not installed. Nothing to prewarm.",
+            logs=logs,
+        )
+        return
+
+    started = time.perf_counter()
+    report_path = str(PREWARM_REPORT_PATH)
+
+    if get_shared_worker_pool() is None:
+        chosen_datapoints = GreenwebCSRDProcessor().local_datapoint_codes
+        get_shared_session_manager().start()
+        processor = GreenwebCSRDProcessor(
+            arelle_processor=ArelleProcessor(
+                report_path, datapoint_codes=chosen_datapoints
+            )
+        )
+        try:
+            processor.get_esrs_datapoint_values(chosen_datapoints)
+        finally:
+            processor.close()
+
+    # this takes the fast path if it is enabled, or runs in a worker
+    # process if a pool is configured
+    extract_report_datapoints(report_path)
+
+    log_safely(
+        f"{plugin_name}: Prewarmed CSRD report processing in "
+        f"{time.perf_counter() - started:.2f}s",
+        logs=logs,
+    )
+
+
+def _extract_document_datapoints(
+    document: Disclosure,
+    report_path: str | None,
+    cache,
+    version: str | None,
+    logs: list | None,
+) -> dict:
+    """
+    Extract the datapoints from the report linked in `document`, reading it
+    from `report_path` if we have a local copy, and cache the results if we
+    know which version of the report we have.
+    """
+    try:
+        results = extract_report_datapoints(
+            document.url, report_path=report_path, version=version
+        )
+
+        if cache is not None and version is not None:
+            chosen_datapoints = GreenwebCSRDProcessor().local_datapoint_codes
+            try:
+                cache.set(document.url, version, chosen_datapoints, results)
+            except (sqlite3.Error, OSError) as ex:
+                log_safely(
+                    f"{plugin_name}: Could not cache datapoints for {document.url}: {ex}",
+                    logs=logs,
+                    level=logging.WARNING,
+                )
+
+        return {
+            "plugin_name": plugin_name,
+            "document_results": results,
+            "logs": logs,
+        }
+    except ReportLoadLimitExceeded as e:
+        log_safely(
+            f"{plugin_name}: Gave up loading report at {document.url}, as it exceeded the {e.limit} limit: {e}",
+            logs=logs,
+            level=logging.WARNING,
+        )
+    except Exception as e:  # noqa
+        log_safely(
+            f"Error occurred when loading report at {document.url}: {e}",
+            logs=logs,
+        )
+    return {"logs": logs}
 
 
 @hookimpl
@@ -219,31 +476,95 @@ def process_document(
             )
             return {"logs": logs}
 
-        # Lightweight HTTP pre-validation for remote URLs - avoids ~2s Arelle
-        # startup cost for unreachable/wrong URLs
-        if not _quick_validate_remote_csrd_url(document.url, http_client, logs):
+        # If we have a persistent cache of extracted datapoints, and have seen
+        # this exact version of the report before, we can skip Arelle entirely.
+        # The cache is only there to save time, so if it can't be opened or
+        # read, we extract the datapoints as if it wasn't there.
+        cache = None
+        version = None
+        try:
+            cache = get_shared_datapoint_cache()
+            if cache is not None:
+                chosen_datapoints = GreenwebCSRDProcessor().local_datapoint_codes
+                version = report_version(document.url, http_client)
+                if version is not None:
+                    cached = cache.get(document.url, version, chosen_datapoints)
+                    if cached is not None:
+                        log_safely(
+                            f"{plugin_name}: Using cached datapoints for {document.url}",
+                            logs=logs,
+                        )
+                        return {
+                            "plugin_name": plugin_name,
+                            "document_results": cached,
+                            "logs": logs,
+                        }
+        except (sqlite3.Error, OSError) as ex:
             log_safely(
-                f"CSRD pre-check: URL {document.url} failed pre-validation. "
-                f"Skipping Arelle processing.",
+                f"{plugin_name}: Could not read cached datapoints for {document.url}: {ex}",
                 logs=logs,
+                level=logging.WARNING,
             )
-            return {"logs": logs}
-
-        try:
-            processor = GreenwebCSRDProcessor(report_url=document.url)
 
-            chosen_datapoints = processor.local_datapoint_codes
+        # With a report store configured, remote reports are kept on disk
+        # between validations, and only downloaded again if they change.
+        # The store sniffs new downloads, like the pre-check below. Reports
+        # too big to keep, or evicted before we can check them out, are
+        # downloaded to a temporary file instead.
+        store = get_shared_report_store()
+        if store is not None and document.url.startswith(("http://", "https://")):
+            with contextlib.ExitStack() as checkout:
+                try:
+                    entry = store.fetch(
+                        document.url, http_client, accept=_looks_like_csrd_report
+                    )
+                    if entry is None:
+                        log_safely(
+                            f"CSRD pre-check: URL {document.url} failed pre-validation. "
+                            f"Skipping Arelle processing.",
+                            logs=logs,
+                        )
+                        return {"logs": logs}
+                    report_path = checkout.enter_context(store.checkout(entry))
+                except (ReportTooLargeForStore, OSError) as ex:
+                    log_safely(
+                        f"{plugin_name}: Could not use the report store for "
+                        f"{document.url}, downloading it instead: {ex}",
+                        logs=logs,
+                        level=logging.WARNING,
+                    )
+                else:
+                    return _extract_document_datapoints(
+                        document, report_path, cache, version, logs
+                    )
 
-            results = processor.get_esrs_datapoint_values(chosen_datapoints)
+        # Lightweight HTTP pre-validation for remote URLs - avoids ~2s Arelle
+        # startup cost for unreachable/wrong URLs. Reports that pass are
+        # spooled to a temporary file as they are checked, so they only
+        # cross the network once. Reports are held to the same size limit
+        # as the reports we decompress from packages, so a huge or endless
+        # download can't fill the disk.
+        suffix = os.path.splitext(urlparse(document.url).path)[1]
+        with tempfile.NamedTemporaryFile(
+            prefix="carbon-txt-csrd-", suffix=suffix
+        ) as spool:
+            if not _quick_validate_remote_csrd_url(
+                document.url,
+                http_client,
+                logs,
+                spool_to=spool,
+                max_spool_bytes=max_decompressed_bytes_from_env(),
+            ):
+                log_safely(
+                    f"CSRD pre-check: URL {document.url} failed pre-validation. "
+                    f"Skipping Arelle processing.",
+                    logs=logs,
+                )
+                return {"logs": logs}
 
-            return {
-                "plugin_name": plugin_name,
-                "document_results": results,
-                "logs": logs,
-            }
-        except Exception as e:  # noqa
-            log_safely(
-                f"Error occurred when loading report at {document.url}: {e}", logs=logs
+            report_path = spool.name if spool.tell() > 0 else None
+            return _extract_document_datapoints(
+                document, report_path, cache, version, logs
             )
 
     else:
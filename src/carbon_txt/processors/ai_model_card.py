@@ -1,6 +1,12 @@
+import concurrent.futures
+import io
 import logging
-from collections.abc import Callable
+import mimetypes
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
 from typing import ClassVar, TypeAlias
+from urllib.parse import urlsplit
 
 from pydantic import BaseModel
 from structlog import get_logger
@@ -14,16 +20,303 @@ logger = get_logger()
 try:  # Guarded imports for the "ai_model_cards" optional dependency group
     import frontmatter
     from mistletoe import Document
-    from mistletoe.block_token import Heading
+    from mistletoe.block_token import Heading, Paragraph, SetextHeading
+    from mistletoe.span_token import tokenize_inner
 
     OPTIONAL_DEPENDENCIES_AVAILABLE = True
 except ImportError:
     Document = None
     Heading = None
+    Paragraph = None
+    SetextHeading = None
+    tokenize_inner = None
     frontmatter = None
     OPTIONAL_DEPENDENCIES_AVAILABLE = False
 
 
+# Hosts serving the Hugging Face hub
+HUGGING_FACE_HOSTS = {"huggingface.co", "www.huggingface.co", "hf.co"}
+
+# The first part of the paths of hub pages that aren't model repositories
+_HUGGING_FACE_RESERVED_PATHS = {
+    "api",
+    "blog",
+    "chat",
+    "collections",
+    "datasets",
+    "docs",
+    "join",
+    "learn",
+    "login",
+    "models",
+    "organizations",
+    "papers",
+    "pricing",
+    "settings",
+    "spaces",
+    "tasks",
+}
+
+
+def hugging_face_card_source_url(url: str) -> str | None:
+    """
+    If `url` is the page for a model on the Hugging Face hub, or its README
+    as rendered on the hub, return the URL of the raw README.md for the
+    model. Otherwise return None.
+
+    For example https://huggingface.co/org/model and
+    https://huggingface.co/org/model/blob/main/README.md are both served
+    raw from https://huggingface.co/org/model/raw/main/README.md
+    """
+    parts = urlsplit(url)
+    if parts.hostname not in HUGGING_FACE_HOSTS:
+        return None
+
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if len(segments) < 2 or segments[0] in _HUGGING_FACE_RESERVED_PATHS:
+        return None
+    repository, rest = "/".join(segments[:2]), segments[2:]
+
+    if not rest:
+        revision = "main"
+    elif rest[0] == "tree" and len(rest) >= 2:
+        revision = "/".join(rest[1:])
+    elif rest[0] == "blob" and len(rest) >= 3 and rest[-1] == "README.md":
+        revision = "/".join(rest[1:-1])
+    else:
+        # raw files, or pages we don't know the README for
+        return None
+
+    return f"https://huggingface.co/{repository}/raw/{revision}/README.md"
+
+
+# Lines that open a code fence
+_CODE_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})(.*)")
+
+# Lines that are a thematic break, or a setext level 2 heading underline,
+# either of which end a paragraph
+_THEMATIC_BREAK = re.compile(
+    r" {0,3}(?:(?:-[ \t]*){3,}|(?:_[ \t]*){3,}|(?:\*[ \t]*){3,})$"
+)
+
+# Lines that open a block quote, a list item, or a table, as do any lines
+# with a "|" in them. Headings near these could belong to them, rather than
+# being top level headings.
+_CONTAINER_START = re.compile(r" {0,3}(?:>|[-+*](?:[ \t]|$)|\d{1,9}[.)](?:[ \t]|$)|\|)")
+
+# Heading text with a reference style link, that can only be resolved
+# with the link definitions found by parsing the whole document
+_REFERENCE_LINK = re.compile(r"\](?!\()")
+
+# Returned by _scan_for_h1 when it can't tell if a heading is a top level one
+_AMBIGUOUS = object()
+
+
+def _recursively_get_text(element) -> str:
+    # Mistletoe doesn't give us a method to get all the text of a heading,
+    # so this helper will do it for us by traversing its children and returning
+    # the text of all the leaf nodes.
+    if element.children is None or len(element.children) == 0:
+        return element.content
+    else:
+        return "".join([_recursively_get_text(child) for child in element.children])
+
+
+def _inline_text(content: str) -> str:
+    return "".join(_recursively_get_text(token) for token in tokenize_inner(content))
+
+
+class _HeadingScanner:
+    """
+    Scans a markdown document a line at a time for its first top level
+    heading, either an ATX heading ("# Title") or a setext one ("Title"
+    underlined with "==="), without parsing the rest of the document.
+
+    Only code blocks and paragraphs are followed. If a heading turns up
+    where a full parse might read it differently, like straight after a
+    list or block quote, or it uses reference links, the result is
+    _AMBIGUOUS.
+    """
+
+    def __init__(self) -> None:
+        self.paragraph: list[str] = []
+        self.fence: str | None = None
+        self.in_container = False
+        self.after_blank_line = True
+
+    def feed(self, line: str):
+        """
+        Scan the next line of the document, returning the text of the first
+        top level heading, or _AMBIGUOUS, once it is found, or None until
+        then.
+        """
+        if self.fence is not None:
+            # close the fence the same way mistletoe does
+            closing = line.lstrip(" ")
+            if (
+                closing.startswith(self.fence)
+                and len(closing.split(maxsplit=1)) == 1
+                and len(line) - len(closing) < 4
+            ):
+                self.fence = None
+            return None
+
+        if not line.strip():
+            self.paragraph = []
+            self.after_blank_line = True
+            return None
+
+        unindented = line.lstrip(" ")
+        if len(line) - len(unindented) >= 4 or unindented.startswith("\t"):
+            # indented code, or the continuation of a paragraph
+            if self.paragraph:
+                self.paragraph.append(line)
+            self.after_blank_line = False
+            return None
+
+        if self.in_container and self.after_blank_line and line == unindented:
+            # an unindented line after a blank line closes any list or quote
+            self.in_container = False
+        self.after_blank_line = False
+
+        if fence_match := _CODE_FENCE.match(line):
+            marker, info = fence_match.groups()
+            if not (marker.startswith("`") and "`" in info):
+                self.fence = marker
+                self.paragraph = []
+                return None
+
+        if heading_match := Heading.pattern.match(line):
+            if len(heading_match.group(1)) != 1:
+                self.paragraph = []
+                return None
+            # read the heading text the same way mistletoe does
+            content = (heading_match.group(2) or "").strip()
+            if set(content) == {"#"}:
+                content = ""
+            # mistletoe doesn't always read empty headings as empty
+            if not content or self.in_container or _REFERENCE_LINK.search(content):
+                return _AMBIGUOUS
+            return _inline_text(content)
+
+        if Paragraph.setext_pattern.match(line):
+            if "=" in line and (self.in_container or self.paragraph):
+                if self.in_container or self.paragraph[0].lstrip().startswith("["):
+                    return _AMBIGUOUS
+                content = "\n".join(line.strip() for line in self.paragraph)
+                if _REFERENCE_LINK.search(content):
+                    return _AMBIGUOUS
+                return _inline_text(content)
+            if "-" in line and self.paragraph:
+                if self.paragraph[0].lstrip().startswith("["):
+                    # the paragraph may be a link definition instead
+                    return _AMBIGUOUS
+                # a level 2 setext heading
+                self.paragraph = []
+                return None
+
+        if _THEMATIC_BREAK.match(line.rstrip("\r\n")):
+            self.paragraph = []
+            return None
+
+        if _CONTAINER_START.match(line) or "|" in line:
+            self.in_container = True
+            self.paragraph = []
+            return None
+
+        self.paragraph.append(line)
+        return None
+
+
+def _scan_for_h1(markdown: str):
+    """
+    Scan a markdown document line by line for its first top level heading,
+    returning its text, _AMBIGUOUS if a full parse might read it
+    differently, or None if there isn't one. See _HeadingScanner.
+    """
+    scanner = _HeadingScanner()
+    # read the lines lazily, as the heading is usually near the top
+    for line in io.StringIO(markdown):
+        if (heading := scanner.feed(line)) is not None:
+            return heading
+    return None
+
+
+class _CardReadProgress:
+    """
+    Follows a model card as it is read, a chunk at a time, to tell when we
+    have everything we need from it: all of its frontmatter, and the first
+    top level heading, or `max_bytes` of the card, whichever comes first.
+
+    Each complete line is only looked at once, so reading a card in many
+    small chunks costs no more than reading it in one.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._chunks: list[str] = []
+        # the end of the last chunk, after its last complete line
+        self._partial_line = ""
+        # "start" until the first line with any text, then "frontmatter"
+        # until its closing boundary if there is frontmatter, then "body"
+        self._section = "start"
+        self._handler = None
+        self._scanner: _HeadingScanner | None = _HeadingScanner()
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def read_enough(self, chunk: str, bytes_read: int) -> bool:
+        """
+        Add the next chunk of the card, with how many bytes of it have been
+        read so far, and check if we have read enough of it.
+        """
+        self._chunks.append(chunk)
+        if self._done or bytes_read >= self.max_bytes:
+            return True
+
+        # only scan complete lines, as the last one may be cut off
+        pending = self._partial_line + chunk
+        end = pending.rfind("\n") + 1
+        self._partial_line = pending[end:]
+        for line in io.StringIO(pending[:end]):
+            if self._read_line(line):
+                self._done = True
+                return True
+        return False
+
+    def _read_line(self, line: str) -> bool:
+        if self._section == "start":
+            if not line.strip():
+                return False
+            self._handler = frontmatter.detect_format(
+                line.lstrip(), frontmatter.handlers
+            )
+            if self._handler is not None:
+                self._section = "frontmatter"
+                return False
+            self._section = "body"
+        elif self._section == "frontmatter":
+            if self._handler.FM_BOUNDARY.match(line):  # type: ignore
+                self._section = "body"
+            return False
+
+        if self._scanner is None:
+            return False
+        heading = self._scanner.feed(line)
+        if heading is _AMBIGUOUS:
+            # only a full parse can tell, so read up to the byte budget
+            self._scanner = None
+            return False
+        return heading is not None
+
+
+def _is_remote(card_url: str) -> bool:
+    return card_url.startswith(("http://", "https://"))
+
+
 class OptionalDependenciesNotInstalledError(ImportError):
     """Raised when the ai_model_cards optional dependencies are not installed"""
 
@@ -118,21 +411,41 @@ class GreenwebAIModelCardProcessor:
         ),
     ]
 
+    # Stop reading a model card after this many bytes, even if we haven't
+    # found the end of its frontmatter, or a heading for the model name
+    MAX_CARD_BYTES: ClassVar[int] = 512 * 1024
+
+    # How many characters of a local model card to read at a time
+    READ_CHUNK_SIZE: ClassVar[int] = 64 * 1024
+
     def __init__(
         self,
         card_url: str,
         logs: list[str] | None = None,
         http_client: HTTPClient | None = None,
+        max_bytes: int | None = None,
     ):
         _require_optional_dependencies()
 
-        if http_client is None:
+        # model cards read from local files, like a mirror of model
+        # repositories, don't need an HTTP client
+        if http_client is None and _is_remote(card_url):
             http_client = HTTPClient()
 
         self.http_client = http_client
         self.card_url = card_url
         self.logs = logs
 
+        # the model pages on the hub are rendered HTML, so read the
+        # markdown source of the model card instead
+        if (source_url := hugging_face_card_source_url(card_url)) is not None:
+            log_safely(
+                f"Reading the model card for the Hugging Face model page {card_url} from {source_url}",
+                self.logs,
+            )
+            self.card_url = source_url
+        self.max_bytes = self.MAX_CARD_BYTES if max_bytes is None else max_bytes
+
     def _error_on_all_fields(self, message: str) -> list[NoMatchingDatapointsError]:
         """
         Private helper method to mark all expected fields with the same error message.
@@ -148,16 +461,58 @@ class GreenwebAIModelCardProcessor:
             )
         return errors
 
+    def _fetch_card(self) -> tuple[str, str]:
+        """
+        Stream the model card, and return as much of its text as we need,
+        along with its content type. Model cards can be very long READMEs,
+        but everything we read from them is near the top, so we close the
+        connection once we have read enough.
+        """
+        if not _is_remote(self.card_url):
+            return self._read_card_file()
+
+        with self.http_client.stream(
+            "GET", self.card_url, follow_redirects=True
+        ) as response:
+            response.raise_for_status()
+            progress = _CardReadProgress(self.max_bytes)
+            for chunk in response.iter_text():
+                if progress.read_enough(chunk, response.num_bytes_downloaded):
+                    break
+            return progress.text, response.headers.get("content-type", "")
+
+    def _read_card_file(self) -> tuple[str, str]:
+        """
+        Read as much of a model card saved locally as we need, in the same
+        way as _fetch_card, guessing its content type from its file name.
+        Files without an extension, like README, are read as plain text.
+        """
+        with open(self.card_url, encoding="utf-8") as card_file:
+            progress = _CardReadProgress(self.max_bytes)
+            bytes_read = 0
+            while chunk := card_file.read(self.READ_CHUNK_SIZE):
+                bytes_read += len(chunk.encode("utf-8"))
+                if progress.read_enough(chunk, bytes_read):
+                    break
+        content_type, _ = mimetypes.guess_type(self.card_url)
+        return progress.text, content_type or "text/plain"
+
     def get_co2_eq_emissions(self) -> list[AIModelCardResponse]:
         """
         Fetch and parse the co2 equivalent emissions data from the AI Model card.
         """
-        response = self.http_client.get(self.card_url, follow_redirects=True)
+        text, content_type = self._fetch_card()
+        return self.parse_card(text, content_type)
+
+    def parse_card(self, text: str, content_type: str) -> list[AIModelCardResponse]:
+        """
+        Parse the co2 equivalent emissions data, and the model name, from the
+        text of a model card we have already read. The content type is only
+        used to explain why a card without frontmatter has no emissions data.
+        """
         datapoints: list[AIModelCardResponse] = []
-        response.raise_for_status()
-        text = response.text
         data = frontmatter.loads(text)
-        name = self.get_h1_from_markdown(text)
+        name = self.get_h1_from_markdown(data.content)
         if name:
             datapoints.append(
                 DataPoint(
@@ -224,7 +579,6 @@ class GreenwebAIModelCardProcessor:
                 )
         else:
             # No co2_eq_emissions section was found. This can be for a couple of reasons:
-            content_type = response.headers.get("content-type", "")
             if content_type.startswith(("text/markdown", "text/plain")):
                 # The file can be assumed to be a markdown model card, but has no co2_eq_emissions section
                 log_safely(
@@ -255,23 +609,74 @@ class GreenwebAIModelCardProcessor:
         """
         Get the first top level heading from the document.
         Returns None if parsing fails.
-        """
 
-        def _recursively_get_text(element):
-            # Mistletoe doesn't give us a method to get all the text of a heading,
-            # so this helper will do it for us by traversing its children and returning
-            # the text of all the leaf nodes.
-            if element.children is None or len(element.children) == 0:
-                return element.content
-            else:
-                return "".join(
-                    [_recursively_get_text(child) for child in element.children]
-                )
+        Model cards can be very long, so we scan the lines of the document
+        for the heading, and only parse the whole document with mistletoe
+        if the scan can't tell which heading is the first top level one.
+        """
+        heading = _scan_for_h1(markdown)
+        if heading is not _AMBIGUOUS:
+            return heading
 
         doc = Document(markdown)
         if doc and doc.children:
             for element in doc.children:
-                if isinstance(element, Heading) and element.level == 1:
+                if isinstance(element, (Heading, SetextHeading)) and element.level == 1:
                     return _recursively_get_text(element)
 
         return None  # If no header is found
+
+
+def find_model_cards(paths: Iterable[str]) -> list[str]:
+    """
+    Expand any directories in `paths`, like a local mirror of model
+    repositories, into the README.md files anywhere below them. File paths
+    and URLs are returned as they are.
+    """
+    card_urls = []
+    for path in paths:
+        if not _is_remote(path) and os.path.isdir(path):
+            for root, directories, files in os.walk(path):
+                # skip the .git directories of cloned repositories
+                directories[:] = sorted(d for d in directories if not d.startswith("."))
+                if "README.md" in files:
+                    card_urls.append(os.path.join(root, "README.md"))
+        else:
+            card_urls.append(path)
+    return card_urls
+
+
+def extract_model_cards(
+    card_urls: Iterable[str],
+    max_workers: int = 4,
+    http_client: HTTPClient | None = None,
+) -> Iterator[tuple[str, list[AIModelCardResponse] | Exception]]:
+    """
+    Read the co2 equivalent emissions data from many model cards, given as
+    paths or URLs, across a pool of worker threads.
+
+    Yields a tuple of each card and its results as each card is finished,
+    or the exception raised if the card couldn't be read. Reading a card is
+    mostly waiting on the network or disk, and we only parse the start of
+    it, so threads are enough to keep the pool busy.
+    """
+    _require_optional_dependencies()
+    card_urls = list(card_urls)
+    if http_client is None and any(_is_remote(url) for url in card_urls):
+        # share one client across the pool
+        http_client = HTTPClient()
+
+    def extract(card_url: str) -> list[AIModelCardResponse]:
+        processor = GreenwebAIModelCardProcessor(
+            card_url=card_url, http_client=http_client
+        )
+        return processor.get_co2_eq_emissions()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as threads:
+        futures = {threads.submit(extract, url): url for url in card_urls}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as ex:  # noqa
+                results = ex
+            yield futures[future], results
@@ -0,0 +1,298 @@
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import time
+from collections.abc import Iterator
+
+import structlog
+
+from ..exceptions import NoMatchingDatapointsError
+from ..http_client import HTTPClient
+from .csrd_document import DataPoint
+
+logger = structlog.getLogger(__name__)
+
+# Environment variables used to configure the shared datapoint cache. The
+# cache is only used when a path to the database has been set.
+CACHE_PATH_ENV_VAR = "CARBON_TXT_CSRD_CACHE_PATH"
+CACHE_TTL_ENV_VAR = "CARBON_TXT_CSRD_CACHE_TTL"
+CACHE_MAX_MB_ENV_VAR = "CARBON_TXT_CSRD_CACHE_MAX_MB"
+
+DEFAULT_TTL_SECONDS = 60 * 60 * 24 * 30
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS csrd_datapoints (
+    report_url TEXT NOT NULL,
+    report_version TEXT NOT NULL,
+    datapoint_codes TEXT NOT NULL,
+    results TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (report_url, report_version, datapoint_codes)
+)
+"""
+
+CachedResults = list[DataPoint | NoMatchingDatapointsError]
+
+
+def _hash_file(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def report_version(
+    report_url: str, http_client: HTTPClient | None = None
+) -> str | None:
+    """
+    Return a string identifying the exact version of the report at `report_url`,
+    or None if we can't tell which version it is.
+
+    Local files are identified by the sha256 of their contents, and remote
+    reports by the ETag the server sends back for them.
+    """
+    if not report_url.startswith(("http://", "https://")):
+        path = pathlib.Path(report_url)
+        if not path.is_file():
+            return None
+        return f"sha256:{_hash_file(path)}"
+
+    if http_client is None:
+        http_client = HTTPClient()
+
+    try:
+        response = http_client.head(report_url, follow_redirects=True)
+    except Exception as ex:  # noqa
+        logger.warning(f"Could not check the version of {report_url}: {ex}")
+        return None
+
+    if response.status_code >= 400:
+        return None
+    if etag := response.headers.get("etag"):
+        return f"etag:{etag}"
+    return None
+
+
+def _dump_results(results: CachedResults) -> str:
+    items = []
+    for result in results:
+        if isinstance(result, NoMatchingDatapointsError):
+            items.append({"type": "no_matching_datapoints", **result.__dict__()})
+        else:
+            items.append({"type": "datapoint", **result.model_dump(mode="json")})
+    return json.dumps(items)
+
+
+def _load_results(serialised: str) -> CachedResults:
+    results: CachedResults = []
+    for item in json.loads(serialised):
+        item_type = item.pop("type")
+        if item_type == "no_matching_datapoints":
+            results.append(
+                NoMatchingDatapointsError(
+                    item["message"],
+                    datapoint_short_code=item["datapoint_short_code"],
+                    datapoint_readable_label=item["datapoint_readable_label"],
+                )
+            )
+        else:
+            results.append(DataPoint(**item))
+    return results
+
+
+class CSRDDatapointCache:
+    """
+    A persistent, SQLite-backed store of the datapoints extracted from CSRD reports.
+
+    Extracting datapoints with Arelle is the most expensive thing we do, and
+    published reports don't change, so results are keyed by the report URL
+    plus the version of the report (its ETag, or the sha256 of its contents),
+    and the datapoint codes that were asked for.
+
+    Entries expire after `ttl_seconds`, and once the stored results pass
+    `max_bytes`, the least recently used entries are evicted. The database can
+    be shared by several processes.
+    """
+
+    path: pathlib.Path
+    ttl_seconds: float | None
+    max_bytes: int | None
+
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        ttl_seconds: float | None = DEFAULT_TTL_SECONDS,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # we open a connection per operation, so the cache is safe to use
+        # from the threads of a web server, as well as from several processes
+        connection = sqlite3.connect(self.path, timeout=10.0)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _codes_key(datapoint_codes: list[str]) -> str:
+        return ",".join(sorted(datapoint_codes))
+
+    def get(
+        self, report_url: str, version: str, datapoint_codes: list[str]
+    ) -> CachedResults | None:
+        """
+        Return the cached results for the given version of a report, or
+        None if there are none, or they have expired.
+        """
+        key = (report_url, version, self._codes_key(datapoint_codes))
+        now = time.time()
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT results, created_at FROM csrd_datapoints "
+                "WHERE report_url = ? AND report_version = ? AND datapoint_codes = ?",
+                key,
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            results, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                connection.execute(
+                    "DELETE FROM csrd_datapoints "
+                    "WHERE report_url = ? AND report_version = ? AND datapoint_codes = ?",
+                    key,
+                )
+                return None
+
+            connection.execute(
+                "UPDATE csrd_datapoints SET accessed_at = ? "
+                "WHERE report_url = ? AND report_version = ? AND datapoint_codes = ?",
+                (now, *key),
+            )
+
+        return _load_results(results)
+
+    def set(
+        self,
+        report_url: str,
+        version: str,
+        datapoint_codes: list[str],
+        results: CachedResults,
+    ) -> None:
+        """
+        Store the results extracted from the given version of a report.
+        """
+        serialised = _dump_results(results)
+        now = time.time()
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO csrd_datapoints "
+                "(report_url, report_version, datapoint_codes, results, size, "
+                "created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    report_url,
+                    version,
+                    self._codes_key(datapoint_codes),
+                    serialised,
+                    len(serialised.encode("utf-8")),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        if self.ttl_seconds is not None:
+            connection.execute(
+                "DELETE FROM csrd_datapoints WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+
+        if self.max_bytes is None:
+            return
+
+        (total,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM csrd_datapoints"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        # walk through the entries from least to most recently used,
+        # deleting until we are back under the limit
+        rows = connection.execute(
+            "SELECT rowid, size FROM csrd_datapoints ORDER BY accessed_at ASC"
+        ).fetchall()
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM csrd_datapoints WHERE rowid = ?", (rowid,))
+            total -= size
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the results held in the cache."""
+        with self._connect() as connection:
+            (total,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM csrd_datapoints"
+            ).fetchone()
+        return total
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM csrd_datapoints"
+            ).fetchone()
+        return count
+
+
+def _cache_settings_from_env() -> dict:
+    """
+    Read the settings for the shared datapoint cache from environment variables.
+    """
+    ttl = os.environ.get(CACHE_TTL_ENV_VAR, "").strip()
+    max_mb = os.environ.get(CACHE_MAX_MB_ENV_VAR, "").strip()
+    return {
+        "ttl_seconds": float(ttl) if ttl else DEFAULT_TTL_SECONDS,
+        "max_bytes": int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES,
+    }
+
+
+# Module-level shared cache, configured from the environment.
+_shared_datapoint_cache: "CSRDDatapointCache | None" = None
+
+
+def get_shared_datapoint_cache() -> "CSRDDatapointCache | None":
+    """
+    Get or create the shared CSRDDatapointCache singleton, or return None
+    if no path for the cache has been configured.
+    """
+    global _shared_datapoint_cache
+    if _shared_datapoint_cache is None:
+        cache_path = os.environ.get(CACHE_PATH_ENV_VAR, "").strip()
+        if not cache_path:
+            return None
+        _shared_datapoint_cache = CSRDDatapointCache(
+            cache_path, **_cache_settings_from_env()
+        )
+    return _shared_datapoint_cache
@@ -1,11 +1,28 @@
 import datetime
+import functools
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 import typing
 from collections import defaultdict
 
 import structlog
 from pydantic import BaseModel
 
-from ..exceptions import NoLoadableCSRDFile, NoMatchingDatapointsError
+from ..exceptions import (
+    NoLoadableCSRDFile,
+    NoMatchingDatapointsError,
+    ReportLoadLimitExceeded,
+    UnsupportedIXBRLDocument,
+)
+from .csrd_taxonomy_packages import find_taxonomy_packages, preload_taxonomy_package
+
+if typing.TYPE_CHECKING:
+    from .csrd_fact_index import FactIndex
+    from .csrd_ixbrl_stream import StreamingIXBRLProcessor
 
 logger = structlog.getLogger(__name__)
 
@@ -26,8 +43,6 @@ except ImportError:
     RuntimeOptions = None  # type: ignore
 
 
-
-
 class ArelleSessionManager:
     """
     Manages a reusable Arelle Session to avoid the overhead of creating
@@ -38,11 +53,116 @@ class ArelleSessionManager:
     time by ~85%. Since we only need to read fact values by local name,
     we build our own index from the parsed facts instead of relying on
     Arelle's factsByLocalName (which requires full DTS).
+
+    Loaded models stay in memory until they are closed with close_model().
+    To stop a long-lived process growing without limit, the session is
+    also recycled after `max_reports_per_session` reports, or once the
+    resident memory of the process passes `max_rss_bytes`. Closing the
+    session would pull the models out from under anyone still reading
+    them, so recycling waits until every model loaded with it is closed.
+
+    Arelle's persistent per-user config is not used. Files it fetches are
+    cached in `cache_directory`, and any `taxonomy_packages` are copied into
+    that cache when the session starts, so taxonomy references resolve to
+    local files. With `offline` set, Arelle makes no network requests at all.
     """
 
-    def __init__(self) -> None:
+    max_reports_per_session: int | None
+    max_rss_bytes: int | None
+    cache_directory: str
+    offline: bool
+    taxonomy_packages: list[str]
+
+    def __init__(
+        self,
+        max_reports_per_session: int | None = None,
+        max_rss_bytes: int | None = None,
+        cache_directory: str | None = None,
+        offline: bool = False,
+        taxonomy_packages: list[str] | None = None,
+    ) -> None:
         _require_arelle()
         self._session: "Session | None" = None
+        self._session_started_at: float | None = None
+        self._reports_loaded = 0
+        self._recycle_pending = False
+        # held while the session is used or replaced, as it can be shared
+        # between threads
+        self._lock = threading.RLock()
+        self.max_reports_per_session = max_reports_per_session
+        self.max_rss_bytes = max_rss_bytes
+        self.cache_directory = cache_directory or DEFAULT_CACHE_DIR
+        self.offline = offline
+        self.taxonomy_packages = find_taxonomy_packages(taxonomy_packages or [])
+        self._taxonomy_packages_preloaded = False
+
+    def start(self) -> None:
+        """
+        Create the underlying Arelle Session ahead of the first report load,
+        if it has not been created already.
+        """
+        _require_arelle()
+
+        with self._lock:
+            if not self._taxonomy_packages_preloaded:
+                for package in self.taxonomy_packages:
+                    preload_taxonomy_package(package, self.cache_directory)
+                self._taxonomy_packages_preloaded = True
+
+            if self._session is None:
+                self._session = Session()
+                self._session_started_at = time.monotonic()
+                self._reports_loaded = 0
+
+    @property
+    def live_models(self) -> int:
+        """The number of loaded models the session is holding in memory."""
+        if self._session is None:
+            return 0
+        return len(self._session.get_models())
+
+    @property
+    def reports_loaded(self) -> int:
+        """The number of reports loaded since the session was started."""
+        return self._reports_loaded
+
+    @property
+    def session_age(self) -> float | None:
+        """Seconds since the current session was started, or None if not started."""
+        if self._session_started_at is None:
+            return None
+        return time.monotonic() - self._session_started_at
+
+    def _should_recycle(self) -> bool:
+        if self._session is None:
+            return False
+        if (
+            self.max_reports_per_session is not None
+            and self._reports_loaded >= self.max_reports_per_session
+        ):
+            return True
+        return (
+            self.max_rss_bytes is not None and _current_rss_bytes() > self.max_rss_bytes
+        )
+
+    def recycle(self) -> None:
+        """
+        Close the current session, releasing every model loaded with it.
+        A fresh session is started on the next report load.
+
+        If models loaded with the session are still open, the session is
+        closed once the last of them is closed with close_model() instead.
+        """
+        with self._lock:
+            if self.live_models > 0:
+                self._recycle_pending = True
+                return
+            logger.info(
+                "Recycling Arelle session",
+                reports_loaded=self._reports_loaded,
+                session_age=self.session_age,
+            )
+            self.close()
 
     def load_report(self, report_url: str) -> "ModelXbrl.ModelXbrl":
         """
@@ -59,11 +179,16 @@ class ArelleSessionManager:
 
         Raises:
             NoLoadableCSRDFile: If Arelle cannot load the file.
+            ReportLoadLimitExceeded: If Arelle runs out of memory loading the file.
         """
-        _require_arelle()
+        with self._lock:
+            return self._load_report(report_url)
 
-        if self._session is None:
-            self._session = Session()
+    def _load_report(self, report_url: str) -> "ModelXbrl.ModelXbrl":
+        if self._should_recycle():
+            self.recycle()
+
+        self.start()
 
         options = RuntimeOptions(
             entrypointFile=str(report_url),
@@ -75,9 +200,15 @@ class ArelleSessionManager:
             # schema/linkbase traversal is unnecessary. This reduces
             # load time from ~2s to ~0.3s per report.
             skipDTS=True,
+            # Don't read or write Arelle's per-user config, so every
+            # process behaves the same whoever it runs as
+            disablePersistentConfig=True,
+            cacheDirectory=self.cache_directory,
+            internetConnectivity="offline" if self.offline else "online",
         )
 
         self._session.run(options)
+        self._reports_loaded += 1
         models = self._session.get_models()
 
         # get_models() returns all models loaded across runs with keepOpen=True,
@@ -85,30 +216,112 @@ class ArelleSessionManager:
         model = models[-1]
 
         if "FileNotLoadable" in model.errors:
+            self.close_model(model)
             raise NoLoadableCSRDFile(
                 f"Could not load the file at {report_url} as a CSRD report"
             )
 
+        # Arelle catches running out of memory part way through a load, and
+        # returns an empty model, which would look like a report without
+        # any of the datapoints we need
+        if "MemoryError" in model.errors:
+            self.close_model(model)
+            raise ReportLoadLimitExceeded(
+                f"Ran out of memory loading the file at {report_url}", limit="memory"
+            )
+
         return model
 
+    def close_model(self, model: "ModelXbrl.ModelXbrl") -> None:
+        """
+        Close a model loaded by this session, so the memory it uses can be
+        released. The model can't be queried after it has been closed.
+        """
+        with self._lock:
+            if self._session is not None and model in self._session.get_models():
+                model.modelManager.close(model)
+            if self._recycle_pending and self.live_models == 0:
+                self.recycle()
+
     def close(self) -> None:
         """Close the Arelle session and release resources."""
-        if self._session is not None:
-            self._session.close()
-            self._session = None
+        with self._lock:
+            self._recycle_pending = False
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._session_started_at = None
+                self._reports_loaded = 0
+
+
+def _current_rss_bytes() -> int:
+    """
+    Return the resident memory of this process in bytes. Where we can't read
+    the current value (i.e. outside Linux), fall back to the peak value.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS, and kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Environment variables used to configure the limits of the shared session
+MAX_REPORTS_PER_SESSION_ENV_VAR = "CARBON_TXT_ARELLE_MAX_REPORTS_PER_SESSION"
+MAX_RSS_MB_ENV_VAR = "CARBON_TXT_ARELLE_MAX_RSS_MB"
+
+DEFAULT_MAX_REPORTS_PER_SESSION = 50
+
+
+# Environment variables used to configure where Arelle looks for taxonomies
+CACHE_DIR_ENV_VAR = "CARBON_TXT_ARELLE_CACHE_DIR"
+OFFLINE_ENV_VAR = "CARBON_TXT_ARELLE_OFFLINE"
+TAXONOMY_PACKAGES_ENV_VAR = "CARBON_TXT_ARELLE_TAXONOMY_PACKAGES"
+
+# Used instead of Arelle's default cache, which lives in the config
+# directory of whichever user is running the process
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "carbon-txt", "arelle-cache")
+
+
+def _session_limits_from_env() -> dict[str, typing.Any]:
+    """
+    Read the limits for recycling the shared Arelle session, and where it
+    looks for taxonomies, from environment variables.
+    """
+    max_reports = os.environ.get(MAX_REPORTS_PER_SESSION_ENV_VAR, "").strip()
+    max_rss_mb = os.environ.get(MAX_RSS_MB_ENV_VAR, "").strip()
+    packages = os.environ.get(TAXONOMY_PACKAGES_ENV_VAR, "").strip()
+    return {
+        "max_reports_per_session": (
+            int(max_reports) if max_reports else DEFAULT_MAX_REPORTS_PER_SESSION
+        ),
+        "max_rss_bytes": int(max_rss_mb) * 1024 * 1024 if max_rss_mb else None,
+        "cache_directory": os.environ.get(CACHE_DIR_ENV_VAR, "").strip() or None,
+        "offline": os.environ.get(OFFLINE_ENV_VAR, "").strip().lower() in ("1", "true"),
+        "taxonomy_packages": [
+            path for path in packages.split(os.pathsep) if path.strip()
+        ],
+    }
 
 
 # Module-level shared session manager. Reused across ArelleProcessor
 # instances to avoid repeated Arelle controller startup.
 _shared_session_manager: "ArelleSessionManager | None" = None
+_shared_session_manager_lock = threading.Lock()
 
 
 def get_shared_session_manager() -> "ArelleSessionManager":
     """Get or create the shared ArelleSessionManager singleton."""
     global _shared_session_manager
-    if _shared_session_manager is None:
-        _shared_session_manager = ArelleSessionManager()
-    return _shared_session_manager
+    with _shared_session_manager_lock:
+        if _shared_session_manager is None:
+            _shared_session_manager = ArelleSessionManager(**_session_limits_from_env())
+        return _shared_session_manager
 
 
 class ArelleNotInstalledError(ImportError):
@@ -142,6 +355,45 @@ class DataPoint(BaseModel):
     end_date: datetime.date
 
 
+class IndexedFact(typing.NamedTuple):
+    """
+    A fact as kept in a FactIndex, with everything needed to turn it back
+    into a DataPoint, apart from the report it came from.
+    """
+
+    local_name: str
+    value: str
+    unit: str
+    sourceline: int
+    start_date: datetime.date
+    end_date: datetime.date
+
+
+@functools.cache
+def _readable_label(readable_label: str) -> str:
+    """
+    Strip the ESRS reference code prefix (e.g. "E1-5 37 c - ") from one of
+    our datapoint labels, to get just the descriptive label, matching the
+    taxonomy label format.
+    """
+    parts = readable_label.split(" ", 1)
+    if len(parts) > 1:
+        # Find where the descriptive text starts (after code like "E1-5 AR 34")
+        # by looking for the first letter after the numeric/code part
+        for i, ch in enumerate(readable_label):
+            if ch.isalpha() and i > 0 and readable_label[i - 1] == " ":
+                # Check if this looks like part of a code (e.g., "AR", "a", "b", "c")
+                remaining = readable_label[i:]
+                if (
+                    remaining[0].isupper()
+                    and len(remaining) > 2
+                    and remaining[1].islower()
+                ):
+                    # This looks like the start of a descriptive phrase
+                    return remaining
+    return readable_label
+
+
 class ArelleProcessor:
     """
     A processor for reading and parsing CSRD report documents.
@@ -158,11 +410,15 @@ class ArelleProcessor:
     report_url: str
     _model: "ModelXbrl.ModelXbrl"
     _facts_by_local_name: dict[str, set]
+    _indexed_names: set[str] | None
+    _period_dates: dict[str, tuple[datetime.date, datetime.date]]
 
     def __init__(
         self,
         report_url: str,
         session_manager: "ArelleSessionManager | None" = None,
+        report_path: str | None = None,
+        datapoint_codes: list[str] | None = None,
     ) -> None:
         """
         Initialize the Arelle Processor loading the report from the given URL.
@@ -175,6 +431,12 @@ class ArelleProcessor:
             report_url: The URL or path of the report to process.
             session_manager: Optional ArelleSessionManager to use. If None,
                 uses the shared module-level singleton.
+            report_path: Optional path to a local copy of the report. If given,
+                the report is loaded from here, but datapoints still refer
+                to `report_url`.
+            datapoint_codes: Optional list of the datapoint codes we expect to
+                be asked for. If given, only facts with these local names are
+                indexed up front, and any others are indexed when first queried.
         """
         _require_arelle()
 
@@ -183,15 +445,83 @@ class ArelleProcessor:
         if session_manager is None:
             session_manager = get_shared_session_manager()
 
-        self._model = session_manager.load_report(report_url)
+        self._session_manager = session_manager
+        self._model = session_manager.load_report(report_path or report_url)
 
-        # Build our own local name index from the parsed facts.
-        # With skipDTS=True, Arelle's built-in factsByLocalName is not
-        # populated, so we construct an equivalent index here.
         self._facts_by_local_name = defaultdict(set)
+        self._indexed_names = set()
+        self._period_dates = {}
+        self._index_facts(datapoint_codes)
+
+    def _index_facts(self, local_names: list[str] | None = None) -> None:
+        """
+        Build our own local name index from the parsed facts.
+        With skipDTS=True, Arelle's built-in factsByLocalName is not
+        populated, so we construct an equivalent index here.
+
+        Reports can hold tens of thousands of facts, and we only ever query
+        a handful of names, so if `local_names` is given, we only index those.
+        """
+        wanted = None if local_names is None else set(local_names)
         for fact in self._model.facts:
-            if hasattr(fact, "qname") and fact.qname is not None:
-                self._facts_by_local_name[fact.qname.localName].add(fact)
+            qname = getattr(fact, "qname", None)
+            if qname is None:
+                continue
+            local_name = qname.localName
+            if wanted is None or local_name in wanted:
+                self._facts_by_local_name[local_name].add(fact)
+
+        if wanted is None:
+            # every name is indexed now
+            self._indexed_names = None
+        elif self._indexed_names is not None:
+            self._indexed_names |= wanted
+
+    def _facts_for(self, local_name: str) -> set:
+        if self._indexed_names is not None and local_name not in self._indexed_names:
+            self._index_facts([local_name])
+        return self._facts_by_local_name.get(local_name, set())
+
+    def _period_dates_for(self, context) -> tuple[datetime.date, datetime.date]:
+        """
+        Return the start and end dates of a context's period, reading them
+        once per context, as many facts share the same few contexts.
+        """
+        try:
+            return self._period_dates[context.id]
+        except KeyError:
+            pass
+
+        # we convert endDatetime and startDatetime to date
+        # even though there is a shorter endDate property. this is
+        # because endDate is handled differently to both datetimes.
+        # Instant periods have no start, so start and end on the same day
+        end_date = context.endDatetime.date()
+        start_datetime = context.startDatetime
+        start_date = start_datetime.date() if start_datetime else end_date
+        dates = (start_date, end_date)
+        self._period_dates[context.id] = dates
+        return dates
+
+    def iter_facts(self) -> typing.Iterator["IndexedFact"]:
+        """
+        Yield every fact in the report with a dated period, in document
+        order, to write to a FactIndex.
+        """
+        for fact in self._model.facts:
+            qname = getattr(fact, "qname", None)
+            context = getattr(fact, "context", None)
+            if qname is None or context is None or context.endDatetime is None:
+                continue
+            start_date, end_date = self._period_dates_for(context)
+            yield IndexedFact(
+                local_name=qname.localName,
+                value=fact.value,
+                unit="percentage" if "Percentage" in str(qname) else "",
+                sourceline=fact.sourceline or 0,
+                start_date=start_date,
+                end_date=end_date,
+            )
 
     @property
     def xbrls(self) -> list["ModelXbrl.ModelXbrl"]:
@@ -207,6 +537,15 @@ class ArelleProcessor:
         """
         return [self._model]
 
+    def close(self) -> None:
+        """
+        Close the parsed report, releasing the memory it holds in the Arelle
+        session. The processor can't service any more queries after this.
+        """
+        self._facts_by_local_name = defaultdict(set)
+        self._period_dates = {}
+        self._session_manager.close_model(self._model)
+
     def _get_datapoints_for_datapoint_code(
         self, datapoint_code: str, esrs_datapoints: dict[str, str]
     ) -> list[DataPoint]:
@@ -225,7 +564,7 @@ class ArelleProcessor:
             f"esrs:{datapoint_code}", "No label found"
         )
 
-        res = self._facts_by_local_name.get(datapoint_code)
+        res = self._facts_for(datapoint_code)
 
         if not res:
             raise NoMatchingDatapointsError(
@@ -234,36 +573,14 @@ class ArelleProcessor:
                 datapoint_readable_label=datapoint_readable_label,
             )
 
+        # With skipDTS=True, propertyView[2][1] returns the namespace
+        # rather than a human-readable label. We use the label from
+        # our own esrs_datapoints dict instead.
+        readable_label = _readable_label(datapoint_readable_label)
+
         datapoints = []
         for item in res:
-            # With skipDTS=True, propertyView[2][1] returns the namespace
-            # rather than a human-readable label. We use the label from
-            # our own esrs_datapoints dict instead, stripping the ESRS code prefix.
-            readable_label = datapoint_readable_label
-            # Strip the ESRS reference code prefix (e.g. "E1-5 37 c - ") to get
-            # just the descriptive label, matching the taxonomy label format
-            parts = readable_label.split(" ", 1)
-            if len(parts) > 1:
-                # Find where the descriptive text starts (after code like "E1-5 AR 34")
-                # by looking for the first letter after the numeric/code part
-                for i, ch in enumerate(readable_label):
-                    if ch.isalpha() and i > 0 and readable_label[i - 1] == " ":
-                        # Check if this looks like part of a code (e.g., "AR", "a", "b", "c")
-                        remaining = readable_label[i:]
-                        if (
-                            remaining[0].isupper()
-                            and len(remaining) > 2
-                            and remaining[1].islower()
-                        ):
-                            # This looks like the start of a descriptive phrase
-                            readable_label = remaining
-                            break
-
-            # we convert endDatetime and startDatetime to date
-            # even though there is a shorter endDate property. this is
-            # because endDate is handled differently to both datetimes
-            start_date = item.context.startDatetime.date()
-            end_date = item.context.endDatetime.date()
+            start_date, end_date = self._period_dates_for(item.context)
             document_line_reference = (
                 f"item.modelDocument.basename - {item.sourceline}"
             )
@@ -317,7 +634,11 @@ class GreenwebCSRDProcessor:
     """
 
     report_url: str | None = None
-    arelle_processor: ArelleProcessor | None = None
+    report_path: str | None = None
+    datapoint_codes: list[str] | None = None
+    arelle_processor: "ArelleProcessor | StreamingIXBRLProcessor | FactIndex | None" = (
+        None
+    )
     esrs_datapoints: typing.ClassVar[dict[str, str]] = {
         "esrs:PercentageOfRenewableSourcesInTotalEnergyConsumption": "E1-5 AR 34 Percentage of renewable sources in total energy consumption",
         "esrs:PercentageOfEnergyConsumptionFromNuclearSourcesInTotalEnergyConsumption": "E1-5 AR 34 Percentage of nuclear in total energy consumption",
@@ -334,22 +655,108 @@ class GreenwebCSRDProcessor:
         self,
         report_url: str | None = None,
         arelle_processor: ArelleProcessor | None = None,
+        report_path: str | None = None,
+        datapoint_codes: list[str] | None = None,
+        version: str | None = None,
     ) -> None:
         """
         Instantiate the GreenwebCSRDProcessor.
         Accepts either
 
-        1. a report url, in which case it instantiates an ArelleProcessor instance to process the report at the given url,
+        1. a report url, in which case it instantiates a processor for the report at the given url. This is a
+           StreamingIXBRLProcessor where the report can be streamed, and an ArelleProcessor otherwise,
         2. or an ArelleProcessor instance, which has already consumed and parsed a reportm and is ready to service queries.
 
+        If a local copy of the report at `report_url` has already been downloaded,
+        pass its path as `report_path` to load it from there instead.
+
+        Reports are indexed for the energy datapoints in `esrs_datapoints`.
+        To only index the datapoints you will ask for, pass them as
+        `datapoint_codes`.
+
+        If you already know which version of the report you have, from
+        `report_version`, pass it as `version`, so it isn't checked again.
         """
+        self.datapoint_codes = datapoint_codes
+
         if arelle_processor is not None:
             self.arelle_processor = arelle_processor
             return
 
         if not arelle_processor and report_url:
-            processor = ArelleProcessor(report_url)
-            self.arelle_processor = processor
+            self.report_url = report_url
+            self.report_path = report_path
+            self.arelle_processor = self._load_report(
+                report_url, report_path, version=version
+            )
+
+    def _load_report(
+        self,
+        report_url: str,
+        report_path: str | None = None,
+        fast_path: bool = True,
+        version: str | None = None,
+    ) -> "ArelleProcessor | StreamingIXBRLProcessor | FactIndex":
+        """
+        Most reports are a single iXBRL file, that we can read far more
+        cheaply by streaming through it for just the facts we need, than
+        by loading a full Arelle model. We only use Arelle for the rest.
+
+        ESEF filings are often zipped report packages. For these, we only
+        decompress the report inside the package, and read that.
+
+        If a fact index store is configured, the first parse of each version
+        of a report loads it with Arelle, and writes every fact to an index,
+        that answers any later queries for the report instead. If the index
+        can't be written, the report is read from the Arelle model as usual.
+        """
+        from .csrd_datapoint_cache import report_version
+        from .csrd_fact_index import get_shared_fact_index_store
+        from .csrd_ixbrl_stream import StreamingIXBRLProcessor, fast_path_enabled
+        from .csrd_report_package import report_package_entry
+
+        datapoint_codes = self.datapoint_codes or self.local_datapoint_codes
+
+        fact_index_store = get_shared_fact_index_store()
+        if fact_index_store is None:
+            version = None
+        else:
+            if version is None:
+                version = report_version(report_path or report_url)
+            if version is not None:
+                fact_index = fact_index_store.open(report_url, version)
+                if fact_index is not None:
+                    return fact_index
+
+        with report_package_entry(report_path or report_url) as entry_path:
+            if entry_path is not None:
+                report_path = entry_path
+
+            if fact_index_store is not None and version is not None:
+                # the streaming fast path only reads the facts we ask for,
+                # so index the report from a full Arelle model
+                processor = ArelleProcessor(report_url, report_path=report_path)
+                try:
+                    fact_index_store.write(report_url, version, processor.iter_facts())
+                except (sqlite3.Error, OSError) as ex:
+                    logger.warning(
+                        f"Could not write the fact index for {report_url}: {ex}"
+                    )
+                return processor
+
+            if fast_path and fast_path_enabled():
+                try:
+                    return StreamingIXBRLProcessor(
+                        report_url, datapoint_codes, report_path=report_path
+                    )
+                except UnsupportedIXBRLDocument as ex:
+                    logger.info(f"Parsing {report_url} with Arelle: {ex}")
+
+            return ArelleProcessor(
+                report_url,
+                report_path=report_path,
+                datapoint_codes=datapoint_codes,
+            )
 
     def setup(self, arelle_processor: ArelleProcessor) -> None:
         """
@@ -383,6 +790,30 @@ class GreenwebCSRDProcessor:
                 "The ArelleProcessor has not been set up. Please call setup() first."
             )
 
+        try:
+            return self._get_datapoint_values(datapoint_codes)
+        except UnsupportedIXBRLDocument as ex:
+            # the streamed report had something we can't read without
+            # Arelle, so parse the whole report with Arelle instead
+            streamed = self.arelle_processor
+            if isinstance(streamed, ArelleProcessor):
+                raise
+            logger.info(f"Parsing {streamed.report_url} with Arelle: {ex}")
+            streamed.close()
+            # reload from the report we were given, as the streamed copy
+            # may have been a temporary file, unpacked from a report package
+            if self.report_url is not None:
+                report_url, report_path = self.report_url, self.report_path
+            else:
+                report_url, report_path = streamed.report_url, streamed.report_path
+            self.arelle_processor = self._load_report(
+                report_url, report_path, fast_path=False
+            )
+            return self._get_datapoint_values(datapoint_codes)
+
+    def _get_datapoint_values(
+        self, datapoint_codes: list[str]
+    ) -> list[DataPoint | NoMatchingDatapointsError]:
         document_results: list[DataPoint | NoMatchingDatapointsError] = []
         for datapoint_code in datapoint_codes:
             try:
@@ -395,6 +826,14 @@ class GreenwebCSRDProcessor:
 
         return document_results
 
+    def close(self) -> None:
+        """
+        Close the report parsed by the underlying ArelleProcessor, once
+        we have the datapoints we need from it.
+        """
+        if self.arelle_processor is not None:
+            self.arelle_processor.close()
+
 
 # Protocol assertion only runs when arelle is available
 if ARELLE_AVAILABLE:
@@ -0,0 +1,281 @@
+import contextlib
+import datetime
+import hashlib
+import os
+import pathlib
+import sqlite3
+import tempfile
+from collections.abc import Iterable
+
+import structlog
+
+from ..exceptions import NoMatchingDatapointsError
+from .csrd_document import DataPoint, IndexedFact, _readable_label
+
+logger = structlog.getLogger(__name__)
+
+# Environment variables used to configure the shared fact index store. Reports
+# are only indexed when a directory for the indexes has been set.
+FACT_INDEX_PATH_ENV_VAR = "CARBON_TXT_CSRD_FACT_INDEX_PATH"
+FACT_INDEX_MAX_MB_ENV_VAR = "CARBON_TXT_CSRD_FACT_INDEX_MAX_MB"
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# bumped whenever the layout of an index changes, so older indexes are rebuilt
+FORMAT_VERSION = 1
+
+# how much of each index SQLite may read through a memory map, rather than
+# copying pages into its own cache
+MMAP_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE facts (
+    local_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    sourceline INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL
+)
+"""
+
+# created once the facts are in, as that is quicker than updating it per fact
+_INDEX_SCHEMA = "CREATE INDEX facts_by_local_name ON facts (local_name)"
+
+
+class FactIndex:
+    """
+    Every fact in one version of a CSRD report, read from an index written
+    the first time the report was parsed.
+
+    It offers the same query API as the ArelleProcessor, so it can be passed
+    to a GreenwebCSRDProcessor in its place, and answers queries for any
+    datapoint code without parsing the report again.
+    """
+
+    report_url: str
+    path: pathlib.Path
+
+    def __init__(self, report_url: str, path: str | pathlib.Path) -> None:
+        self.report_url = report_url
+        self.path = pathlib.Path(path)
+        # indexes are never changed once written, so there is nothing to lock
+        self._connection = sqlite3.connect(
+            f"{self.path.as_uri()}?mode=ro&immutable=1",
+            uri=True,
+            check_same_thread=False,
+        )
+        self._connection.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+
+    def close(self) -> None:
+        """Close the index. Kept for parity with the ArelleProcessor."""
+        self._connection.close()
+
+    def _get_datapoints_for_datapoint_code(
+        self, datapoint_code: str, esrs_datapoints: dict[str, str]
+    ) -> list[DataPoint]:
+        """
+        Get the values for a specific datapoint code from the index, in the
+        same form as ArelleProcessor._get_datapoints_for_datapoint_code.
+        """
+        datapoint_readable_label = esrs_datapoints.get(
+            f"esrs:{datapoint_code}", "No label found"
+        )
+
+        rows = self._connection.execute(
+            "SELECT value, unit, sourceline, start_date, end_date FROM facts "
+            "WHERE local_name = ? ORDER BY rowid",
+            (datapoint_code,),
+        ).fetchall()
+
+        if not rows:
+            raise NoMatchingDatapointsError(
+                f"Could not find datapoint with code {datapoint_code}, for report {self.report_url}",
+                datapoint_short_code=datapoint_code,
+                datapoint_readable_label=datapoint_readable_label,
+            )
+
+        datapoints = []
+        for value, unit, sourceline, start_date, end_date in rows:
+            if unit == "percentage":
+                value = float(value)
+            datapoints.append(
+                DataPoint(
+                    name=_readable_label(datapoint_readable_label),
+                    short_code=datapoint_code,
+                    value=value,
+                    unit=unit,
+                    context=f"item.modelDocument.basename - {sourceline}",
+                    file=self.report_url,
+                    start_date=datetime.date.fromisoformat(start_date),
+                    end_date=datetime.date.fromisoformat(end_date),
+                )
+            )
+
+        return datapoints
+
+
+class CSRDFactIndexStore:
+    """
+    A directory of fact indexes, one for each version of each CSRD report
+    we have parsed.
+
+    We only ever ask a report for a handful of datapoints, but the set we
+    want grows over time. Rather than parse every report with Arelle again
+    whenever we add a datapoint, the first parse of a report writes all of
+    its facts to a small SQLite file, that later queries for any datapoint
+    code read through a memory map in milliseconds.
+
+    Indexes are keyed by the report URL and its version (its ETag, or the
+    sha256 of its contents). Writing a new version of a report removes the
+    index for the old one, and once the indexes pass `max_bytes`, the least
+    recently used are evicted.
+    """
+
+    path: pathlib.Path
+    max_bytes: int | None
+
+    def __init__(
+        self, path: str | pathlib.Path, max_bytes: int | None = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.max_bytes = max_bytes
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _url_key(report_url: str) -> str:
+        return hashlib.sha256(report_url.encode("utf-8")).hexdigest()
+
+    def index_path(self, report_url: str, version: str) -> pathlib.Path:
+        """Return where the index for a version of a report is kept."""
+        version_key = hashlib.sha256(version.encode("utf-8")).hexdigest()
+        return self.path / f"{self._url_key(report_url)}-{version_key[:16]}.sqlite3"
+
+    def open(self, report_url: str, version: str) -> FactIndex | None:
+        """
+        Return the index for the given version of a report, or None if it
+        hasn't been indexed yet.
+        """
+        path = self.index_path(report_url, version)
+        index = None
+        try:
+            index = FactIndex(report_url, path)
+            (format_version,) = index._connection.execute(
+                "PRAGMA user_version"
+            ).fetchone()
+        except sqlite3.Error:
+            # the file doesn't exist, or isn't an index we can read
+            if index is not None:
+                index.close()
+            return None
+        if format_version != FORMAT_VERSION:
+            index.close()
+            return None
+
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return index
+
+    def write(
+        self, report_url: str, version: str, facts: Iterable[IndexedFact]
+    ) -> pathlib.Path:
+        """
+        Write the index for the given version of a report, replacing the
+        index for any other version of it.
+        """
+        path = self.index_path(report_url, version)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        os.close(fd)
+        try:
+            connection = sqlite3.connect(tmp_name)
+            try:
+                with connection:
+                    connection.execute(_SCHEMA)
+                    connection.executemany(
+                        "INSERT INTO facts VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            (
+                                fact.local_name,
+                                fact.value,
+                                fact.unit,
+                                fact.sourceline,
+                                fact.start_date.isoformat(),
+                                fact.end_date.isoformat(),
+                            )
+                            for fact in facts
+                        ),
+                    )
+                    connection.execute(_INDEX_SCHEMA)
+                    connection.execute(f"PRAGMA user_version={FORMAT_VERSION}")
+            finally:
+                connection.close()
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+        for previous in self.path.glob(f"{self._url_key(report_url)}-*.sqlite3"):
+            if previous != path:
+                with contextlib.suppress(OSError):
+                    previous.unlink()
+
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+
+        indexes = []
+        for path in self.path.glob("*.sqlite3"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                indexes.append((stat.st_mtime, path, stat.st_size))
+
+        total = sum(size for _, _, size in indexes)
+        # walk through the indexes from least to most recently used,
+        # deleting until we are back under the limit. Open indexes stay
+        # readable until they are closed.
+        for _, path, size in sorted(indexes, key=lambda i: i[0]):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+            total -= size
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the indexes held in the store."""
+        return sum(path.stat().st_size for path in self.path.glob("*.sqlite3"))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.path.glob("*.sqlite3"))
+
+
+def _fact_index_settings_from_env() -> dict:
+    """
+    Read the settings for the shared fact index store from environment variables.
+    """
+    max_mb = os.environ.get(FACT_INDEX_MAX_MB_ENV_VAR, "").strip()
+    return {"max_bytes": int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES}
+
+
+# Module-level shared store, configured from the environment.
+_shared_fact_index_store: "CSRDFactIndexStore | None" = None
+
+
+def get_shared_fact_index_store() -> "CSRDFactIndexStore | None":
+    """
+    Get or create the shared CSRDFactIndexStore singleton, or return None
+    if no directory for the indexes has been configured.
+    """
+    global _shared_fact_index_store
+    if _shared_fact_index_store is None:
+        index_path = os.environ.get(FACT_INDEX_PATH_ENV_VAR, "").strip()
+        if not index_path:
+            return None
+        _shared_fact_index_store = CSRDFactIndexStore(
+            index_path, **_fact_index_settings_from_env()
+        )
+    return _shared_fact_index_store
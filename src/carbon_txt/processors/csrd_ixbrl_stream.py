@@ -0,0 +1,313 @@
+import datetime
+import os
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from math import isinf, isnan
+from typing import NamedTuple
+
+from ..exceptions import NoMatchingDatapointsError, UnsupportedIXBRLDocument
+from .csrd_document import DataPoint, _readable_label, _require_arelle
+
+# Guarded imports - we reuse Arelle's own transformation registry and date
+# parsing, so the values we read match the ones Arelle would give us
+try:
+    from arelle.FunctionIxt import ixtNamespaceFunctions  # type: ignore
+    from arelle.XmlUtil import collapseWhitespace, datetimeValue  # type: ignore
+    from lxml import etree  # type: ignore
+except ImportError:
+    ixtNamespaceFunctions = None  # type: ignore
+    collapseWhitespace = None  # type: ignore
+    datetimeValue = None  # type: ignore
+    etree = None  # type: ignore
+
+# Set this environment variable to "0" to always parse reports with Arelle
+FAST_PATH_ENV_VAR = "CARBON_TXT_CSRD_FAST_PATH"
+
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+XBRLI_NS = "http://www.xbrl.org/2003/instance"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+# inline XBRL 1.1, and the 1.0 namespace still seen in older reports
+IX_NAMESPACES = (
+    "http://www.xbrl.org/2013/inlineXBRL",
+    "http://www.xbrl.org/2008/inlineXBRL",
+)
+
+_NUMERIC_FACT = "nonFraction"
+_TEXT_FACT = "nonNumeric"
+
+
+def fast_path_enabled() -> bool:
+    """Whether reports should be streamed with StreamingIXBRLProcessor first."""
+    return os.environ.get(FAST_PATH_ENV_VAR, "1").strip() not in ("0", "false")
+
+
+class _StreamedFact(NamedTuple):
+    name: str
+    value: str
+    context_ref: str
+    sourceline: int
+
+
+class _StreamedPeriod(NamedTuple):
+    start_date: str | None
+    end_date: str | None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _namespace(tag: str) -> str:
+    return tag[1:].partition("}")[0] if tag.startswith("{") else ""
+
+
+def _transform(element, raw_value: str) -> str:
+    """
+    Apply the ixt transformation named in the `format` attribute of a fact.
+    """
+    fmt = element.get("format")
+    if fmt is None:
+        return raw_value
+
+    prefix, _, name = fmt.strip().rpartition(":")
+    namespace = element.nsmap.get(prefix or None)
+    functions = ixtNamespaceFunctions.get(namespace)
+    if functions is None or name not in functions:
+        raise UnsupportedIXBRLDocument(f"Unsupported transformation {fmt}")
+
+    try:
+        return functions[name](collapseWhitespace(raw_value))
+    except Exception as ex:
+        raise UnsupportedIXBRLDocument(f"Could not apply {fmt}: {ex}") from ex
+
+
+def _numeric_value(element, value: str) -> str:
+    """
+    Apply the scale and sign of an ix:nonFraction to its transformed value,
+    formatting the result the same way Arelle does.
+    """
+    try:
+        num = Decimal(value)
+        scale = element.get("scale")
+        if scale is not None:
+            num *= 10 ** Decimal(scale.strip())
+        if element.get("sign"):
+            num *= -1
+    except (ValueError, InvalidOperation):
+        raise UnsupportedIXBRLDocument(
+            f"Could not read {value!r} as a number"
+        ) from None
+
+    if isinf(num):
+        return "-INF" if num < 0 else "INF"
+    if isnan(num):
+        return "NaN"
+    if num == num.to_integral() and ".0" not in value:
+        num = num.quantize(Decimal(1))
+    return f"{num:f}"
+
+
+def _period_date(text: str | None, add_one_day: bool = False) -> datetime.date:
+    """
+    Read a date from a context period. Like Arelle, end dates without a time
+    are treated as running to the end of the day, so move on a day.
+    """
+    value = datetimeValue(text.strip(), addOneDay=add_one_day) if text else None
+    if value is None:
+        raise UnsupportedIXBRLDocument(f"Unsupported period date {text!r}")
+    return value.date()
+
+
+class StreamingIXBRLProcessor:
+    """
+    A lightweight alternative to the ArelleProcessor, for the common case of an
+    inline XBRL report in a single XHTML file.
+
+    Rather than building a full Arelle model of the report, we stream through
+    the document once, keeping only the facts for the datapoint codes we were
+    asked for, and the periods of the contexts they refer to.
+
+    Anything we don't handle, like nested facts, continuations, or inline
+    targets, raises UnsupportedIXBRLDocument, so the caller can fall back to
+    the ArelleProcessor. It offers the same query API as the ArelleProcessor,
+    so it can be passed to a GreenwebCSRDProcessor in its place.
+    """
+
+    report_url: str
+    report_path: str | None
+    datapoint_codes: frozenset[str]
+    _facts_by_local_name: dict[str, list[_StreamedFact]]
+    _periods: dict[str, _StreamedPeriod]
+
+    def __init__(
+        self,
+        report_url: str,
+        datapoint_codes: list[str],
+        report_path: str | None = None,
+    ) -> None:
+        """
+        Stream the report, collecting the facts for the given datapoint codes.
+
+        Args:
+            report_url: The URL or path of the report to process.
+            datapoint_codes: The local names of the facts to collect.
+            report_path: Optional path to a local copy of the report. Remote
+                reports can only be streamed from a local copy.
+
+        Raises:
+            UnsupportedIXBRLDocument: If the report should be parsed by Arelle instead.
+        """
+        _require_arelle()
+
+        self.report_url = report_url
+        self.report_path = report_path
+        self.datapoint_codes = frozenset(datapoint_codes)
+        self._facts_by_local_name = defaultdict(list)
+        self._periods = {}
+
+        path = str(report_path or report_url)
+        if path.startswith(("http://", "https://")) or not os.path.isfile(path):
+            raise UnsupportedIXBRLDocument(f"No local copy of {report_url} to stream")
+
+        try:
+            self._stream(path)
+        except etree.XMLSyntaxError as ex:
+            raise UnsupportedIXBRLDocument(
+                f"Could not parse {report_url}: {ex}"
+            ) from ex
+
+    def _stream(self, path: str) -> None:
+        events = etree.iterparse(
+            path, events=("start", "end"), huge_tree=True, remove_comments=True
+        )
+        # how many facts or contexts we are inside, as we can't throw
+        # their children away until we have read them
+        open_items = 0
+
+        for event, element in events:
+            namespace = _namespace(element.tag)
+            local_name = _local_name(element.tag)
+            is_fact = namespace in IX_NAMESPACES and local_name in (
+                _NUMERIC_FACT,
+                _TEXT_FACT,
+            )
+            is_context = namespace == XBRLI_NS and local_name == "context"
+
+            if event == "start":
+                # bail out early on anything that isn't an XHTML document,
+                # like a plain XBRL instance
+                if element.getparent() is None and element.tag != f"{{{XHTML_NS}}}html":
+                    raise UnsupportedIXBRLDocument("Not an inline XBRL document")
+                if namespace in IX_NAMESPACES and local_name in (
+                    "relationship",
+                    "tuple",
+                ):
+                    raise UnsupportedIXBRLDocument(
+                        f"Unsupported ix:{local_name} element"
+                    )
+                if is_fact or is_context:
+                    open_items += 1
+                continue
+
+            if is_fact:
+                open_items -= 1
+                self._read_fact(element, local_name)
+            elif is_context:
+                open_items -= 1
+                self._read_context(element)
+
+            if open_items:
+                continue
+
+            # throw away everything we've read, so memory use stays flat
+            # however large the report is
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def _read_fact(self, element, fact_type: str) -> None:
+        name = element.get("name", "")
+        local_name = name.rpartition(":")[2]
+        if local_name not in self.datapoint_codes:
+            return
+
+        if len(element) or element.get("continuedAt") or element.get("target"):
+            raise UnsupportedIXBRLDocument(f"Unsupported markup for fact {name}")
+        if element.get(f"{{{XSI_NS}}}nil") in ("true", "1"):
+            raise UnsupportedIXBRLDocument(f"Unsupported nil value for fact {name}")
+
+        value = _transform(element, element.text or "")
+        if fact_type == _NUMERIC_FACT:
+            value = _numeric_value(element, value)
+
+        self._facts_by_local_name[local_name].append(
+            _StreamedFact(
+                name=name,
+                value=value,
+                context_ref=element.get("contextRef", ""),
+                sourceline=element.sourceline,
+            )
+        )
+
+    def _read_context(self, element) -> None:
+        period = element.find(f"{{{XBRLI_NS}}}period")
+        if period is None:
+            return
+        start_date = period.findtext(f"{{{XBRLI_NS}}}startDate")
+        end_date = period.findtext(f"{{{XBRLI_NS}}}endDate")
+        self._periods[element.get("id")] = _StreamedPeriod(start_date, end_date)
+
+    def close(self) -> None:
+        """Release the collected facts. Kept for parity with the ArelleProcessor."""
+        self._facts_by_local_name = defaultdict(list)
+        self._periods = {}
+
+    def _get_datapoints_for_datapoint_code(
+        self, datapoint_code: str, esrs_datapoints: dict[str, str]
+    ) -> list[DataPoint]:
+        """
+        Get the values for a specific datapoint code from the report, in the
+        same form as ArelleProcessor._get_datapoints_for_datapoint_code.
+        """
+        if datapoint_code not in self.datapoint_codes:
+            raise UnsupportedIXBRLDocument(f"Facts for {datapoint_code} not collected")
+
+        datapoint_readable_label = esrs_datapoints.get(
+            f"esrs:{datapoint_code}", "No label found"
+        )
+
+        facts = self._facts_by_local_name.get(datapoint_code)
+
+        if not facts:
+            raise NoMatchingDatapointsError(
+                f"Could not find datapoint with code {datapoint_code}, for report {self.report_url}",
+                datapoint_short_code=datapoint_code,
+                datapoint_readable_label=datapoint_readable_label,
+            )
+
+        datapoints = []
+        for fact in facts:
+            period = self._periods.get(fact.context_ref)
+            if period is None:
+                raise UnsupportedIXBRLDocument(f"No context {fact.context_ref} found")
+
+            value: str | float = fact.value
+            unit = ""
+            if "Percentage" in fact.name:
+                unit = "percentage"
+                value = float(fact.value)
+
+            datapoints.append(
+                DataPoint(
+                    name=_readable_label(datapoint_readable_label),
+                    short_code=datapoint_code,
+                    value=value,
+                    unit=unit,
+                    context=f"item.modelDocument.basename - {fact.sourceline}",
+                    file=self.report_url,
+                    start_date=_period_date(period.start_date),
+                    end_date=_period_date(period.end_date, add_one_day=True),
+                )
+            )
+
+        return datapoints
@@ -0,0 +1,170 @@
+import contextlib
+import json
+import os
+import pathlib
+import posixpath
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Iterator
+
+import structlog
+
+from ..exceptions import ReportPackageTooLarge
+
+logger = structlog.getLogger(__name__)
+
+# Environment variable used to configure how much data we are willing to
+# decompress from a report package
+MAX_DECOMPRESSED_MB_ENV_VAR = "CARBON_TXT_CSRD_MAX_DECOMPRESSED_MB"
+
+DEFAULT_MAX_DECOMPRESSED_BYTES = 500 * 1024 * 1024
+
+# The manifests that mark a zip file as a report package. Packages following
+# the Report Package 1.0 spec have a reportPackage.json, and older ESEF
+# filings are taxonomy packages with a taxonomyPackage.xml
+REPORT_PACKAGE_MANIFEST = "META-INF/reportPackage.json"
+TAXONOMY_PACKAGE_MANIFEST = "META-INF/taxonomyPackage.xml"
+
+INLINE_REPORT_EXTENSIONS = (".xhtml", ".html", ".htm")
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def max_decompressed_bytes_from_env() -> int:
+    """
+    Read the limit on decompressed data from a report package from the
+    environment, falling back to the default.
+    """
+    max_mb = os.environ.get(MAX_DECOMPRESSED_MB_ENV_VAR, "").strip()
+    return int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_DECOMPRESSED_BYTES
+
+
+def _top_level_directory(package: zipfile.ZipFile) -> str | None:
+    """
+    Report packages hold everything in a single top level directory.
+    Return its name, or None if the archive isn't laid out that way.
+    """
+    tops = {name.split("/", 1)[0] for name in package.namelist()}
+    if len(tops) != 1:
+        return None
+    return tops.pop()
+
+
+def find_report_entry(package: zipfile.ZipFile) -> zipfile.ZipInfo | None:
+    """
+    Find the inline XBRL report in a report package, using its manifest to
+    confirm it is a package, and the `reports` directory it must hold the
+    report in.
+
+    Returns None if the archive isn't a report package, or if it holds
+    something other than a single inline report, like a document set.
+    """
+    top = _top_level_directory(package)
+    if top is None:
+        return None
+
+    names = set(package.namelist())
+    report_manifest = f"{top}/{REPORT_PACKAGE_MANIFEST}"
+    if report_manifest in names:
+        try:
+            manifest = json.loads(package.read(report_manifest))
+            document_type = manifest["documentInfo"]["documentType"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Could not read the report package manifest in {top}")
+            return None
+        # inline report packages have a document type ending in /xbri
+        if not document_type.endswith("/xbri"):
+            return None
+    elif f"{top}/{TAXONOMY_PACKAGE_MANIFEST}" not in names:
+        return None
+
+    # the report is either directly in reports/, or in a single
+    # directory inside it
+    reports_dir = f"{top}/reports/"
+    candidates = [
+        info
+        for info in package.infolist()
+        if info.filename.startswith(reports_dir)
+        and not info.is_dir()
+        and info.filename.lower().endswith(INLINE_REPORT_EXTENSIONS)
+    ]
+    direct = [c for c in candidates if "/" not in c.filename[len(reports_dir) :]]
+    reports = direct or candidates
+
+    if len(reports) != 1:
+        return None
+    return reports[0]
+
+
+def _copy_entry(
+    package: zipfile.ZipFile,
+    entry: zipfile.ZipInfo,
+    destination: pathlib.Path,
+    max_bytes: int,
+) -> None:
+    """
+    Decompress a single entry from the package to `destination`, a chunk at
+    a time, stopping if it decompresses to more than `max_bytes`.
+    """
+    copied = 0
+    with package.open(entry) as source, open(destination, "wb") as target:
+        while chunk := source.read(_COPY_CHUNK_BYTES):
+            copied += len(chunk)
+            # the sizes in the zip headers can't be trusted, so we
+            # check how much we have actually decompressed as we go
+            if copied > max_bytes:
+                raise ReportPackageTooLarge(
+                    f"{entry.filename} decompresses to more than {max_bytes} bytes"
+                )
+            target.write(chunk)
+
+
+@contextlib.contextmanager
+def report_package_entry(
+    report_path: str, max_bytes: int | None = None
+) -> Iterator[str | None]:
+    """
+    If `report_path` is a zipped report package, decompress just the report
+    inside it to a temporary file, yielding its path, and clean it up
+    afterwards. Otherwise yield None, and leave the file as it is.
+
+    Zip files that aren't report packages we can read the report from are
+    left for Arelle to open, as long as they decompress to less than
+    `max_bytes` in total.
+
+    Raises:
+        ReportPackageTooLarge: If the package holds more than `max_bytes`
+            of decompressed data.
+    """
+    if max_bytes is None:
+        max_bytes = max_decompressed_bytes_from_env()
+
+    path = str(report_path)
+    if path.startswith(("http://", "https://")) or not zipfile.is_zipfile(path):
+        yield None
+        return
+
+    with zipfile.ZipFile(path) as package:
+        entry = find_report_entry(package)
+        if entry is None:
+            total = sum(info.file_size for info in package.infolist())
+            if total > max_bytes:
+                raise ReportPackageTooLarge(
+                    f"{path} decompresses to more than {max_bytes} bytes"
+                )
+            yield None
+            return
+
+        if entry.file_size > max_bytes:
+            raise ReportPackageTooLarge(
+                f"{entry.filename} decompresses to more than {max_bytes} bytes"
+            )
+
+        directory = tempfile.mkdtemp(prefix="carbon-txt-csrd-package-")
+        try:
+            destination = pathlib.Path(directory) / posixpath.basename(entry.filename)
+            _copy_entry(package, entry, destination, max_bytes)
+            yield str(destination)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
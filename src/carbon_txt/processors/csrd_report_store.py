@@ -0,0 +1,347 @@
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from urllib.parse import urlparse
+
+import structlog
+
+from ..http_client import HTTPClient
+
+logger = structlog.getLogger(__name__)
+
+# Environment variables used to configure the shared report store. The store
+# is only used when a directory for it has been set.
+REPORT_STORE_PATH_ENV_VAR = "CARBON_TXT_CSRD_REPORT_STORE_PATH"
+REPORT_STORE_MAX_MB_ENV_VAR = "CARBON_TXT_CSRD_REPORT_STORE_MAX_MB"
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+# bodies not referenced by any entry are left this long before they are
+# cleared up, in case another process is about to write the entry for them
+ORPHAN_GRACE_SECONDS = 60
+
+_SNIFF_BYTES = 8192
+_CHUNK_BYTES = 1024 * 1024
+
+
+class ReportTooLargeForStore(Exception):
+    """
+    Raised when a report is bigger than the whole store, so it can't be
+    kept, and has to be downloaded some other way.
+    """
+
+
+class CSRDReportStore:
+    """
+    A size-bounded, on-disk store of the CSRD reports we have downloaded.
+
+    Published reports are large and rarely change, and the same reports are
+    linked from carbon.txt files again and again. So we keep a copy of each
+    report, along with the ETag and Last-Modified validators the server sent
+    for it, and revalidate it with a conditional GET, only downloading the
+    report again if it has changed.
+
+    Once the stored reports pass `max_bytes`, the least recently used are
+    evicted. Every file is written under a temporary name, then renamed into
+    place, so several processes can share one directory.
+    """
+
+    path: pathlib.Path
+    max_bytes: int | None
+
+    def __init__(
+        self, path: str | pathlib.Path, max_bytes: int | None = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.max_bytes = max_bytes
+        (self.path / "checkouts").mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(report_url: str) -> str:
+        return hashlib.sha256(report_url.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> pathlib.Path:
+        return self.path / f"{key}.json"
+
+    def _read_entry(self, key: str) -> dict | None:
+        try:
+            entry = json.loads(self._entry_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        if not (self.path / entry.get("body", "")).is_file():
+            return None
+        return entry
+
+    def _write_atomically(self, path: pathlib.Path, write: Callable) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                write(file)
+            os.replace(tmp_name, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
+
+    def get(self, report_url: str) -> dict | None:
+        """
+        Return the stored entry for a report, with its validators, and the
+        name of the file holding its body, or None if it isn't stored.
+        """
+        return self._read_entry(self._key(report_url))
+
+    def put(
+        self,
+        report_url: str,
+        chunks: Iterator[bytes],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> dict:
+        """
+        Store a report body, read from `chunks`, along with the validators
+        the server sent for it. Raises ReportTooLargeForStore, storing
+        nothing, if the body is bigger than `max_bytes`.
+        """
+        key = self._key(report_url)
+        previous = self._read_entry(key)
+
+        suffix = os.path.splitext(urlparse(report_url).path)[1]
+        validator = hashlib.sha256(f"{etag}|{last_modified}".encode()).hexdigest()
+        body_name = f"{key}-{validator[:16]}{suffix}"
+        size = 0
+
+        def write_body(file):
+            nonlocal size
+            for chunk in chunks:
+                size += len(chunk)
+                if self.max_bytes is not None and size > self.max_bytes:
+                    raise ReportTooLargeForStore(
+                        f"{report_url} is larger than the {self.max_bytes} "
+                        f"byte report store"
+                    )
+                file.write(chunk)
+
+        self._write_atomically(self.path / body_name, write_body)
+
+        entry = {
+            "url": report_url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body_name,
+            "size": size,
+            "stored_at": time.time(),
+        }
+        self._write_atomically(
+            self._entry_path(key), lambda file: file.write(json.dumps(entry).encode())
+        )
+
+        if previous is not None and previous["body"] != body_name:
+            with contextlib.suppress(OSError):
+                (self.path / previous["body"]).unlink()
+
+        # the caller is about to check the new report out, so it stays put
+        self._evict(keep=body_name)
+        return entry
+
+    def touch(self, entry: dict) -> None:
+        """Mark a stored report as just used, so it is evicted last."""
+        with contextlib.suppress(OSError):
+            os.utime(self.path / entry["body"])
+
+    @contextlib.contextmanager
+    def checkout(self, entry: dict) -> Iterator[str]:
+        """
+        Yield the path to a stored report body that stays readable until the
+        block exits, even if the report is evicted by another process.
+        """
+        suffix = os.path.splitext(entry["body"])[1]
+        fd, link_name = tempfile.mkstemp(dir=self.path / "checkouts", suffix=suffix)
+        os.close(fd)
+        os.unlink(link_name)
+        try:
+            try:
+                os.link(self.path / entry["body"], link_name)
+            except FileNotFoundError:
+                # evicted since the entry was read
+                raise
+            except OSError:
+                # some filesystems don't support hard links
+                shutil.copyfile(self.path / entry["body"], link_name)
+            yield link_name
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(link_name)
+
+    def fetch(
+        self,
+        report_url: str,
+        http_client: HTTPClient | None = None,
+        accept: Callable[[bytes], bool] | None = None,
+    ) -> dict | None:
+        """
+        Return the stored entry for a remote report, downloading it if we
+        don't have it, or if the server says it has changed.
+
+        A report we already hold is revalidated with a conditional GET. If
+        the server can't be reached, the copy we hold is used.
+
+        If `accept` is given, it is passed the first few KB of a newly
+        downloaded body, and the body is only stored if it returns True.
+        Returns None if the report can't be fetched, or isn't accepted, and
+        raises ReportTooLargeForStore if it is too big to keep.
+        """
+        if http_client is None:
+            http_client = HTTPClient()
+
+        entry = self.get(report_url)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with http_client.stream(
+                "GET", report_url, headers=headers, follow_redirects=True
+            ) as response:
+                if response.status_code == 304 and entry is not None:
+                    self.touch(entry)
+                    return entry
+                if response.status_code >= 400:
+                    logger.warning(
+                        f"Fetching {report_url} for the report store returned "
+                        f"HTTP {response.status_code}"
+                    )
+                    return None
+
+                content_length = response.headers.get("content-length", "")
+                if (
+                    self.max_bytes is not None
+                    and content_length.isdigit()
+                    and int(content_length) > self.max_bytes
+                ):
+                    raise ReportTooLargeForStore(
+                        f"{report_url} is {content_length} bytes, larger than "
+                        f"the {self.max_bytes} byte report store"
+                    )
+
+                chunks = response.iter_bytes(_CHUNK_BYTES)
+                snippet = b""
+                for chunk in chunks:
+                    snippet += chunk
+                    if len(snippet) >= _SNIFF_BYTES:
+                        break
+                if accept is not None and not accept(snippet[:_SNIFF_BYTES]):
+                    return None
+
+                def body() -> Iterator[bytes]:
+                    yield snippet
+                    yield from chunks
+
+                return self.put(
+                    report_url,
+                    body(),
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                )
+        except ReportTooLargeForStore:
+            raise
+        except Exception as ex:  # noqa
+            if entry is not None:
+                logger.warning(
+                    f"Could not revalidate {report_url}, using the stored copy: {ex}"
+                )
+                self.touch(entry)
+                return entry
+            logger.warning(f"Could not fetch {report_url} for the report store: {ex}")
+            return None
+
+    def _evict(self, keep: str | None = None) -> None:
+        entries = []
+        referenced = set()
+        for entry_path in self.path.glob("*.json"):
+            entry = self._read_entry(entry_path.stem)
+            if entry is None:
+                continue
+            body = self.path / entry["body"]
+            try:
+                accessed_at = body.stat().st_mtime
+            except OSError:
+                continue
+            referenced.add(entry["body"])
+            entries.append((accessed_at, entry_path, body, entry["size"]))
+
+        now = time.time()
+        for path in self.path.iterdir():
+            if path.is_dir() or path.suffix == ".json" or path.name in referenced:
+                continue
+            with contextlib.suppress(OSError):
+                if now - path.stat().st_mtime > ORPHAN_GRACE_SECONDS:
+                    path.unlink()
+
+        if self.max_bytes is None:
+            return
+
+        total = sum(size for _, _, _, size in entries)
+        # walk through the reports from least to most recently used,
+        # deleting until we are back under the limit
+        for _, entry_path, body, size in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if body.name == keep:
+                continue
+            with contextlib.suppress(OSError):
+                entry_path.unlink()
+                body.unlink()
+            total -= size
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the reports held in the store."""
+        total = 0
+        for entry_path in self.path.glob("*.json"):
+            if (entry := self._read_entry(entry_path.stem)) is not None:
+                total += entry["size"]
+        return total
+
+    def __len__(self) -> int:
+        return sum(
+            1
+            for entry_path in self.path.glob("*.json")
+            if self._read_entry(entry_path.stem) is not None
+        )
+
+
+def _report_store_settings_from_env() -> dict:
+    """
+    Read the settings for the shared report store from environment variables.
+    """
+    max_mb = os.environ.get(REPORT_STORE_MAX_MB_ENV_VAR, "").strip()
+    return {"max_bytes": int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES}
+
+
+# Module-level shared store, configured from the environment.
+_shared_report_store: "CSRDReportStore | None" = None
+
+
+def get_shared_report_store() -> "CSRDReportStore | None":
+    """
+    Get or create the shared CSRDReportStore singleton, or return None
+    if no directory for the store has been configured.
+    """
+    global _shared_report_store
+    if _shared_report_store is None:
+        store_path = os.environ.get(REPORT_STORE_PATH_ENV_VAR, "").strip()
+        if not store_path:
+            return None
+        _shared_report_store = CSRDReportStore(
+            store_path, **_report_store_settings_from_env()
+        )
+    return _shared_report_store
@@ -0,0 +1,117 @@
+import glob
+import os
+import pathlib
+import posixpath
+import re
+import shutil
+import zipfile
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+
+import structlog
+
+logger = structlog.getLogger(__name__)
+
+CATALOG_NAMESPACE = "urn:oasis:names:tc:entity:xmlns:xml:catalog"
+
+# Characters Arelle's web cache escapes in file names on Linux and macOS
+_ENCODED_FILENAME_CHARS = re.compile(r"[:^]")
+
+
+def find_taxonomy_packages(paths: list[str]) -> list[str]:
+    """
+    Expand a list of taxonomy package files and directories of them into a
+    list of package files, logging any paths we can't find.
+    """
+    packages = []
+    for path in paths:
+        if os.path.isdir(path):
+            packages.extend(sorted(glob.glob(os.path.join(path, "*.zip"))))
+        elif os.path.isfile(path):
+            packages.append(path)
+        else:
+            logger.warning(f"Could not find the taxonomy package at {path}")
+    return packages
+
+
+def _encode_for_filename(part: str) -> str:
+    return _ENCODED_FILENAME_CHARS.sub(lambda m: f"^{ord(m.group(0)):03}", part)
+
+
+def cache_path_for_url(cache_directory: str, url: str) -> pathlib.Path:
+    """
+    Return where Arelle's web cache keeps its copy of the file at `url`,
+    following the layout of `WebCache.urlToCacheFilepath`.
+    """
+    parts = urlsplit(url)
+    host, _, port = parts.netloc.partition(":")
+    path = pathlib.Path(cache_directory, parts.scheme, _encode_for_filename(host))
+    if port:
+        path = path / f"^port{port}"
+    for segment in parts.path.split("/")[1:]:
+        path = path / _encode_for_filename(segment)
+    return path
+
+
+def _catalog_rewrites(package: zipfile.ZipFile) -> list[tuple[str, str]]:
+    """
+    Read the URL rewrites from the catalog of a taxonomy package, as pairs of
+    the URL prefix, and the directory in the package it maps to.
+    """
+    catalogs = [
+        name for name in package.namelist() if name.endswith("META-INF/catalog.xml")
+    ]
+    rewrites = []
+    for catalog_name in catalogs:
+        try:
+            catalog = ElementTree.fromstring(package.read(catalog_name))
+        except ElementTree.ParseError:
+            logger.warning(
+                f"Could not read the taxonomy package catalog {catalog_name}"
+            )
+            continue
+        meta_inf = posixpath.dirname(catalog_name)
+        for rewrite in catalog.iter(f"{{{CATALOG_NAMESPACE}}}rewriteURI"):
+            uri_start = rewrite.get("uriStartString")
+            prefix = rewrite.get("rewritePrefix")
+            if not uri_start or not prefix:
+                continue
+            directory = posixpath.normpath(posixpath.join(meta_inf, prefix))
+            rewrites.append((uri_start, directory.rstrip("/") + "/"))
+    return rewrites
+
+
+def preload_taxonomy_package(package_path: str, cache_directory: str) -> int:
+    """
+    Copy the files in a taxonomy package into Arelle's web cache, at the
+    locations of the URLs its catalog maps them to, so Arelle can resolve
+    those URLs without going online.
+
+    Files already in the cache with the same size are left alone. Returns
+    the number of files copied.
+    """
+    copied = 0
+    with zipfile.ZipFile(package_path) as package:
+        rewrites = _catalog_rewrites(package)
+        if not rewrites:
+            logger.warning(f"No URL rewrites found in taxonomy package {package_path}")
+        for entry in package.infolist():
+            if entry.is_dir():
+                continue
+            for uri_start, directory in rewrites:
+                if not entry.filename.startswith(directory):
+                    continue
+                relative = entry.filename[len(directory) :]
+                # don't let a crafted entry name write outside the cache
+                if ".." in relative.split("/"):
+                    break
+                target = cache_path_for_url(cache_directory, uri_start + relative)
+                if target.exists() and target.stat().st_size == entry.file_size:
+                    break
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with package.open(entry) as source, open(target, "wb") as dest:
+                    shutil.copyfileobj(source, dest)
+                copied += 1
+                break
+    logger.info(f"Preloaded {copied} files from taxonomy package {package_path}")
+    return copied
@@ -0,0 +1,473 @@
+import concurrent.futures
+import contextlib
+import functools
+import itertools
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import weakref
+from concurrent.futures.process import BrokenProcessPool
+
+import structlog
+
+from ..exceptions import (
+    CSRDWorkerPoolFull,
+    NoMatchingDatapointsError,
+    ReportLoadLimitExceeded,
+)
+from .csrd_document import (
+    DataPoint,
+    GreenwebCSRDProcessor,
+    _require_arelle,
+    get_shared_session_manager,
+)
+
+logger = structlog.getLogger(__name__)
+
+# Environment variables used to configure the shared worker pool. A pool size
+# of 0 (the default) means reports are parsed in the calling process instead.
+POOL_SIZE_ENV_VAR = "CARBON_TXT_CSRD_WORKERS"
+QUEUE_DEPTH_ENV_VAR = "CARBON_TXT_CSRD_QUEUE_DEPTH"
+
+# Environment variables used to limit each report load. Setting either of
+# these without a pool size starts a single worker process, as a load can
+# only be stopped safely when it runs outside the calling process.
+LOAD_TIMEOUT_ENV_VAR = "CARBON_TXT_CSRD_LOAD_TIMEOUT"
+LOAD_MAX_MB_ENV_VAR = "CARBON_TXT_CSRD_LOAD_MAX_MB"
+
+DEFAULT_QUEUE_DEPTH = 8
+
+# how often to check if a queued report has been picked up by a worker,
+# so its deadline only starts once it is being loaded
+_RUNNING_POLL_SECONDS = 0.05
+
+# the address space limit set for this worker process, if any
+_worker_max_memory_bytes: int | None = None
+
+# where this worker process says when it starts loading each report, if the
+# pool has a load timeout
+_worker_load_starts: "multiprocessing.Queue | None" = None
+
+
+def _initialise_worker(
+    max_memory_bytes: int | None = None,
+    load_starts: "multiprocessing.Queue | None" = None,
+) -> None:
+    """
+    Runs once in each new worker process, so the Arelle imports and session
+    set up are paid for when the pool starts, not by the first report.
+
+    If `max_memory_bytes` is set, the address space of the worker is capped
+    at that size, so a report needing more fails with a MemoryError in the
+    worker, rather than exhausting the memory of the host.
+
+    If `load_starts` is given, the worker puts its process ID, and the time,
+    on it as it starts loading each report, so the pool can time the load.
+    """
+    global _worker_max_memory_bytes, _worker_load_starts
+    if load_starts is not None:
+        # don't hold up the worker exiting until the pool has read them all
+        load_starts.cancel_join_thread()
+        _worker_load_starts = load_starts
+
+    get_shared_session_manager().start()
+
+    # import the modules GreenwebCSRDProcessor uses to load reports now,
+    # as loading their extensions may not fit once the address space is capped
+    from . import (  # noqa: F401
+        csrd_datapoint_cache,
+        csrd_fact_index,
+        csrd_ixbrl_stream,
+        csrd_report_package,
+    )
+
+    if max_memory_bytes is not None:
+        import resource
+
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            max_memory_bytes = min(max_memory_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, hard))
+        _worker_max_memory_bytes = max_memory_bytes
+
+
+def _extract_datapoints(
+    report_url: str,
+    datapoint_codes: list[str],
+    report_path: str | None = None,
+    version: str | None = None,
+    load_id: int | None = None,
+) -> list[DataPoint | NoMatchingDatapointsError]:
+    """
+    Runs in a worker process. Parse the report with the worker's own Arelle
+    session, and return the values for the given datapoint codes.
+
+    If the pool is timing the load, it passes a `load_id`, and we say when
+    we started on the report under that ID.
+    """
+    if _worker_load_starts is not None and load_id is not None:
+        _worker_load_starts.put((load_id, os.getpid(), time.time()))
+
+    try:
+        processor = GreenwebCSRDProcessor(
+            report_url=report_url,
+            report_path=report_path,
+            datapoint_codes=datapoint_codes,
+            version=version,
+        )
+        try:
+            return processor.get_esrs_datapoint_values(datapoint_codes)
+        finally:
+            processor.close()
+    except (MemoryError, ReportLoadLimitExceeded):
+        # start from a fresh session, in case running out of memory left
+        # the current one in a bad state
+        get_shared_session_manager().recycle()
+        limit = ""
+        if _worker_max_memory_bytes is not None:
+            limit = f", over the limit of {_worker_max_memory_bytes // (1024 * 1024)}MB"
+        raise ReportLoadLimitExceeded(
+            f"Ran out of memory loading {report_url}{limit}", limit="memory"
+        ) from None
+
+
+class ArelleWorkerPool:
+    """
+    A pool of worker processes for extracting datapoints from CSRD reports.
+
+    Arelle sessions are not safe to share between threads, and parsing a
+    report can take seconds, so each worker process owns its own Arelle
+    session, and reports are parsed there instead of blocking the caller.
+    Results come back over IPC as lists of DataPoints and NoMatchingDatapointsErrors.
+
+    If a worker process dies while parsing a report, the pool is rebuilt, and
+    the report is tried once more before giving up.
+
+    Each report load can be limited to `load_timeout` seconds, and each worker
+    to `max_memory_bytes` of address space. A report that exceeds either limit
+    fails with ReportLoadLimitExceeded. Each worker says when it starts
+    loading a report, and the timeout runs from then, so time spent waiting
+    for a free worker doesn't count. A worker that runs out of time can't be
+    interrupted, so it is killed, and as a process pool can't lose one
+    worker without failing the reports on the others, the pool is rebuilt.
+    Any other reports it was loading are retried, without using up their
+    retry for a crash.
+    """
+
+    max_workers: int
+    max_queue_depth: int
+    load_timeout: float | None
+    max_memory_bytes: int | None
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        load_timeout: float | None = None,
+        max_memory_bytes: int | None = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: The number of worker processes to run.
+            max_queue_depth: How many reports may wait for a free worker before
+                new submissions are refused with CSRDWorkerPoolFull.
+            load_timeout: How many seconds a worker may spend on one report.
+            max_memory_bytes: The most address space each worker may use.
+        """
+        _require_arelle()
+
+        if max_workers < 1:
+            raise ValueError("An ArelleWorkerPool needs at least one worker")
+
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.load_timeout = load_timeout
+        self.max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        # executors we stopped ourselves, because a report ran out of time
+        self._stopped_executors: weakref.WeakSet[
+            concurrent.futures.ProcessPoolExecutor
+        ] = weakref.WeakSet()
+        # the queue each executor's workers say when they start a load on
+        self._load_starts: weakref.WeakKeyDictionary[
+            concurrent.futures.ProcessPoolExecutor, multiprocessing.Queue
+        ] = weakref.WeakKeyDictionary()
+        self._load_ids = itertools.count()
+        # the loads being timed, and the worker process ID and start time
+        # of those that have started
+        self._timed_loads: set[int] = set()
+        self._started_loads: dict[int, tuple[int, float]] = {}
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # we spawn fresh processes rather than forking, so workers don't
+                # inherit the threads and open connections of a web server process
+                context = multiprocessing.get_context("spawn")
+                load_starts = context.Queue() if self.load_timeout is not None else None
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=functools.partial(
+                        _initialise_worker, self.max_memory_bytes, load_starts
+                    ),
+                )
+                if load_starts is not None:
+                    self._load_starts[self._executor] = load_starts
+            return self._executor
+
+    def _replace_broken_executor(
+        self, broken: concurrent.futures.ProcessPoolExecutor
+    ) -> None:
+        with self._lock:
+            # another caller may have replaced the executor already
+            if self._executor is broken:
+                logger.warning("A CSRD worker process died. Restarting the pool.")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _stop_stuck_executor(
+        self, stuck: concurrent.futures.ProcessPoolExecutor, load_id: int
+    ) -> None:
+        with self._lock:
+            if self._executor is stuck:
+                self._executor = None
+            self._stopped_executors.add(stuck)
+            pid, _started_at = self._started_loads[load_id]
+        logger.warning("A CSRD worker process ran out of time. Restarting the pool.")
+        # there is no public way to stop a call that is already running, so
+        # we kill the worker loading the report. The pool then stops the
+        # other workers itself, and waiting for the shutdown means every
+        # future they held has failed, and released its slot, by the time
+        # we return
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGKILL)
+        stuck.shutdown(wait=True, cancel_futures=True)
+
+    def _load_started(
+        self, executor: concurrent.futures.ProcessPoolExecutor, load_id: int
+    ) -> tuple[int, float] | None:
+        """
+        Return the process ID of the worker loading a report, and when it
+        started, or None if no worker has started loading it yet.
+        """
+        load_starts = self._load_starts.get(executor)
+        with self._lock:
+            # the queue is shared by every load on the executor, so keep
+            # what we read for the others being timed
+            while load_starts is not None:
+                try:
+                    started_id, pid, started_at = load_starts.get_nowait()
+                except queue.Empty:
+                    break
+                if started_id in self._timed_loads:
+                    self._started_loads[started_id] = (pid, started_at)
+            return self._started_loads.get(load_id)
+
+    def _wait_for_result(
+        self,
+        executor: concurrent.futures.ProcessPoolExecutor,
+        future: concurrent.futures.Future,
+        load_id: int,
+        report_url: str,
+    ) -> list[DataPoint | NoMatchingDatapointsError]:
+        """
+        Wait for a submitted report, allowing it `load_timeout` seconds from
+        when a worker starts loading it.
+        """
+        if self.load_timeout is None:
+            return future.result()
+
+        # time spent waiting for a free worker doesn't count towards the
+        # deadline. A future counts as running as soon as it is queued for
+        # the workers, so we wait for the worker to say it has started
+        while (started := self._load_started(executor, load_id)) is None:
+            if future.done():
+                return future.result()
+            time.sleep(_RUNNING_POLL_SECONDS)
+
+        _pid, started_at = started
+        remaining = self.load_timeout - (time.time() - started_at)
+        try:
+            return future.result(timeout=max(remaining, 0))
+        except concurrent.futures.TimeoutError:
+            raise ReportLoadLimitExceeded(
+                f"Stopped loading {report_url} after {self.load_timeout:g} seconds",
+                limit="time",
+            ) from None
+
+    def _release_slot(self, _future: concurrent.futures.Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        """The number of reports currently queued or being parsed."""
+        return self._in_flight
+
+    def submit(
+        self,
+        report_url: str,
+        datapoint_codes: list[str],
+        report_path: str | None = None,
+        version: str | None = None,
+    ) -> concurrent.futures.Future:
+        """
+        Queue a report for parsing, returning a Future for its datapoints.
+
+        If the report has already been downloaded, pass the path to the local
+        copy as `report_path`, so the worker loads it from disk, and if you
+        know which version of it you have, pass that as `version`.
+
+        Raises:
+            CSRDWorkerPoolFull: If the pool already has its maximum number of
+                reports queued.
+        """
+        return self._submit(
+            self._get_executor(), report_url, datapoint_codes, report_path, version
+        )
+
+    def _submit(
+        self,
+        executor: concurrent.futures.ProcessPoolExecutor,
+        report_url: str,
+        datapoint_codes: list[str],
+        report_path: str | None = None,
+        version: str | None = None,
+        load_id: int | None = None,
+    ) -> concurrent.futures.Future:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue_depth:
+                raise CSRDWorkerPoolFull(
+                    f"Too many CSRD reports queued for processing. "
+                    f"Could not accept {report_url}"
+                )
+            self._in_flight += 1
+
+        try:
+            future = executor.submit(
+                _extract_datapoints,
+                report_url,
+                datapoint_codes,
+                report_path,
+                version,
+                load_id,
+            )
+        except Exception:
+            self._release_slot()
+            raise
+
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def extract(
+        self,
+        report_url: str,
+        datapoint_codes: list[str],
+        report_path: str | None = None,
+        version: str | None = None,
+    ) -> list[DataPoint | NoMatchingDatapointsError]:
+        """
+        Parse the report at `report_url` in a worker process, blocking until
+        the values for the given datapoint codes are available.
+
+        Raises:
+            ReportLoadLimitExceeded: If loading the report takes longer than
+                `load_timeout`, or more memory than `max_memory_bytes`.
+        """
+        crashes = 0
+        while True:
+            executor = self._get_executor()
+            load_id = next(self._load_ids)
+            with self._lock:
+                self._timed_loads.add(load_id)
+            try:
+                future = self._submit(
+                    executor,
+                    report_url,
+                    datapoint_codes,
+                    report_path,
+                    version,
+                    load_id=load_id,
+                )
+                return self._wait_for_result(executor, future, load_id, report_url)
+            except (BrokenProcessPool, concurrent.futures.CancelledError) as ex:
+                if executor in self._stopped_executors:
+                    # another report ran out of time, and our worker was
+                    # stopped along with its own, so try again on a new one
+                    continue
+                if isinstance(ex, concurrent.futures.CancelledError):
+                    raise
+                self._replace_broken_executor(executor)
+                crashes += 1
+                if crashes == 2:
+                    raise
+            except ReportLoadLimitExceeded as ex:
+                if ex.limit == "time":
+                    self._stop_stuck_executor(executor, load_id)
+                raise
+            finally:
+                with self._lock:
+                    self._timed_loads.discard(load_id)
+                    self._started_loads.pop(load_id, None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes. The pool restarts on its next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Module-level shared pool, configured from the environment.
+_shared_worker_pool: "ArelleWorkerPool | None" = None
+_shared_worker_pool_lock = threading.Lock()
+
+
+def _pool_settings_from_env() -> tuple[int, int]:
+    """
+    Read the pool size and queue depth from environment variables.
+    """
+    pool_size = int(os.environ.get(POOL_SIZE_ENV_VAR, "0") or 0)
+    queue_depth = int(
+        os.environ.get(QUEUE_DEPTH_ENV_VAR, str(DEFAULT_QUEUE_DEPTH))
+        or DEFAULT_QUEUE_DEPTH
+    )
+    return pool_size, queue_depth
+
+
+def _load_limits_from_env() -> dict[str, float | int | None]:
+    """
+    Read the limits on each report load from environment variables.
+    """
+    timeout = os.environ.get(LOAD_TIMEOUT_ENV_VAR, "").strip()
+    max_mb = os.environ.get(LOAD_MAX_MB_ENV_VAR, "").strip()
+    return {
+        "load_timeout": float(timeout) if timeout else None,
+        "max_memory_bytes": int(max_mb) * 1024 * 1024 if max_mb else None,
+    }
+
+
+def get_shared_worker_pool() -> "ArelleWorkerPool | None":
+    """
+    Get or create the shared ArelleWorkerPool singleton, or return None if
+    no worker processes or load limits have been configured.
+    """
+    global _shared_worker_pool
+    with _shared_worker_pool_lock:
+        if _shared_worker_pool is None:
+            pool_size, queue_depth = _pool_settings_from_env()
+            limits = _load_limits_from_env()
+            if pool_size < 1 and any(limit is not None for limit in limits.values()):
+                pool_size = 1
+            if pool_size < 1:
+                return None
+            _shared_worker_pool = ArelleWorkerPool(
+                max_workers=pool_size, max_queue_depth=queue_depth, **limits
+            )
+        return _shared_worker_pool
@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 import logging
 import pathlib
@@ -40,6 +41,34 @@ def log_exception_safely(
     errors.append(dumpable_error)
 
 
+def sanitize_document_results(document_results: dict[str, list]) -> dict[str, list]:
+    """
+    Sanitize document results by converting NoMatchingDatapointsError
+    exceptions to dictionaries, otherwise return each result as is.
+
+    Args:
+        document_results (dict): The original document results.
+
+    Returns:
+        dict: The sanitized document results.
+    """
+    sanitized_results: dict[str, list] = {}
+    for plugin_name, original_output in document_results.items():
+        sanitized_output = []
+        for item in original_output:
+            # we have to turn this into a dict, otherwise it won't serialise
+            # to JSON cleanly
+            if isinstance(item, exceptions.NoMatchingDatapointsError):
+                sanitized_item = item.__dict__()
+                sanitized_item["error"] = "NoMatchingDatapointsError"
+                sanitized_output.append(sanitized_item)
+            else:
+                sanitized_output.append(item)
+
+        sanitized_results[plugin_name] = sanitized_output
+    return sanitized_results
+
+
 class CarbonTxtValidator:
     """
     The core class repsonsible for exposing essentially the same functionality to
@@ -51,6 +80,7 @@ class CarbonTxtValidator:
     event_log: list
     active_plugins: list
     plugins_dir: str | None
+    process_documents: bool
 
     def __init__(
         self,
@@ -58,14 +88,20 @@ class CarbonTxtValidator:
         active_plugins: list[str] | None = None,
         http_timeout: float = 5.0,
         http_user_agent: str | None = None,
+        process_documents: bool = True,
     ):
         """
         Initialise the validator, registering any required plugins in the
         provided plugin directory `plugins_dir`, and activating any plugins
+
+        Pass `process_documents=False` to only check the syntax of carbon.txt
+        files, leaving the documents they link to for `process_linked_documents`
+        to handle later.
         """
 
         self.event_log = []
         self.active_plugins = []
+        self.process_documents = process_documents
 
         logger.debug(
             f"plugins_dir: {plugins_dir}",
@@ -110,6 +146,22 @@ class CarbonTxtValidator:
 
     def _append_document_processing(
         self, validation_results: schemas.CarbonTxtFile
+    ) -> dict[str, list] | dict:
+        if not self.process_documents:
+            return {}
+        return self._process_documents(validation_results)
+
+    async def _aappend_document_processing(
+        self, validation_results: schemas.CarbonTxtFile
+    ) -> dict[str, list] | dict:
+        if not self.process_documents:
+            return {}
+        # plugins are synchronous, and may download and parse large documents,
+        # so run them in a thread to keep the event loop free
+        return await asyncio.to_thread(self._process_documents, validation_results)
+
+    def _process_documents(
+        self, validation_results: schemas.CarbonTxtFile
     ) -> dict[str, list] | dict:
         supporting_documents = validation_results.org.disclosures
         document_processing_results: dict[str, list] = {}
@@ -151,6 +203,30 @@ class CarbonTxtValidator:
 
         return document_processing_results
 
+    def process_linked_documents(
+        self, carbon_txt_file: schemas.CarbonTxtFile
+    ) -> ValidationResult:
+        """
+        Run the document processing plugins over the documents linked in an
+        already validated carbon.txt file, returning their results.
+        """
+        self.event_log = []  # Reset event log for each run
+        errors: list[Exception | pydantic_core.ErrorDetails | dict] = []
+
+        try:
+            document_processing_results = self._process_documents(carbon_txt_file)
+        except Exception as ex:  # noqa
+            message = f"An unexpected error occurred processing documents: {ex}"
+            log_exception_safely(ex, message, errors, self.event_log)
+            document_processing_results = {}
+
+        return ValidationResult(
+            result=carbon_txt_file,
+            logs=self.event_log,
+            exceptions=errors,
+            document_results=document_processing_results,
+        )
+
     def list_plugins(self) -> list:
         """
         Return a list of all registered plugins
@@ -184,21 +260,81 @@ class CarbonTxtValidator:
                 exceptions=errors,
                 document_results=document_processing_results or {},
             )
-        except pydantic.ValidationError as ex:
-            message = f"Validation error: {ex}"
+        except Exception as ex:  # noqa
+            return self._failed_validation(ex, errors)
+
+    async def avalidate_contents(self, contents: str) -> ValidationResult:
+        """
+        Async version of validate_contents.
+        """
+        self.event_log = []  # Reset event log for each validation
+        errors: list[Exception | pydantic_core.ErrorDetails | dict] = []
+
+        try:
+            message = f"Attempting to validate contents of {contents[:40]}"
             self.event_log.append(message)
-            errors.extend(ex.errors())
-            validation_results = None
+            parsed_result = parser.parse_toml(contents, logs=self.event_log)
+            validation_results = parser.validate_as_carbon_txt(
+                parsed_result, logs=self.event_log
+            )
+            document_processing_results = await self._aappend_document_processing(
+                validation_results
+            )
+
             return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+                result=validation_results,
+                logs=self.event_log,
+                exceptions=errors,
+                document_results=document_processing_results or {},
             )
         except Exception as ex:  # noqa
+            return self._failed_validation(ex, errors)
+
+    def _failed_validation(self, ex: Exception, errors: list) -> ValidationResult:
+        """
+        Log the error that stopped a carbon.txt file from being validated,
+        and return a result without a carbon.txt file.
+        """
+        # we have a valid TOML file, but it's not a valid carbon.txt file
+        if isinstance(ex, pydantic.ValidationError):
+            message = f"Validation error: {ex}"
+            self.event_log.append(message)
+            errors.extend(ex.errors())
+        else:
             message = f"An unexpected error occurred: {ex}"
             log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
-            )
+        return ValidationResult(result=None, logs=self.event_log, exceptions=errors)
+
+    def _failed_url_validation(
+        self, url: str, ex: Exception, errors: list
+    ) -> ValidationResult:
+        """
+        Log the error that stopped the carbon.txt file at `url` from being
+        validated, and return a result without a carbon.txt file.
+        """
+        # the file path is local, but we can't access it
+        if isinstance(ex, FileNotFoundError):
+            full_file_path = pathlib.Path(url).absolute()
+            message = f"No valid carbon.txt file found at {full_file_path}. \n"
+
+        # the file path is remote, and we can't access it
+        elif isinstance(ex, exceptions.UnreachableCarbonTxtFile):
+            message = f"Could not fetch the carbon.txt file at {url}. Error was: {ex}"
+
+        # the file path is reachable, and but it's not valid TOML. We re-raise the exception
+        # with the URL listed in the error message, so it's clear to what URL the error refers to
+        elif isinstance(ex, exceptions.NotParseableTOML):
+            message = f"A file was found at {url}: but it wasn't parseable TOML. Error was: {ex}"
+
+        # the file path is reachable, but the server returned a 404
+        elif isinstance(ex, httpx.HTTPStatusError):
+            message = f"An error occurred while fetching the carbon.txt file at {url}."
+
+        else:
+            return self._failed_validation(ex, errors)
+
+        log_exception_safely(ex, message, errors, self.event_log)
+        return ValidationResult(result=None, logs=self.event_log, exceptions=errors)
 
     def validate_url(self, url: str) -> ValidationResult:
         """
@@ -234,61 +370,42 @@ class CarbonTxtValidator:
                 url=url,
             )
 
-        # the file path is local, but we can't access it
-        except FileNotFoundError as ex:
-            full_file_path = pathlib.Path(url).absolute()
-            message = f"No valid carbon.txt file found at {full_file_path}. \n"
-            log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
-            )
+        except Exception as ex:  # noqa
+            return self._failed_url_validation(url, ex, errors)
 
-        # we have a valid TOML file, but it's not a valid carbon.txt file
-        except pydantic.ValidationError as ex:
-            message = f"Validation error: {ex}"
+    async def avalidate_url(self, url: str) -> ValidationResult:
+        """
+        Async version of validate_url.
+        """
+        self.event_log = []  # Reset event log for each validation
+        errors: list[Exception | pydantic_core.ErrorDetails | dict] = []
+
+        try:
+            message = f"Attempting to validate url: {url}"
             self.event_log.append(message)
-            errors.extend(ex.errors())
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+            result = await self.file_finder.aresolve_uri(url, logs=self.event_log)
+            fetched_file_contents = await self.file_finder.afetch_carbon_txt_file(
+                result.uri, logs=self.event_log
             )
-
-        # the file path is remote, and we can't access it
-        except exceptions.UnreachableCarbonTxtFile as ex:
-            message = f"Could not fetch the carbon.txt file at {url}. Error was: {ex}"
-            log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+            parsed_result = parser.parse_toml(
+                fetched_file_contents, logs=self.event_log
             )
-
-        # the file path is reachable, and but it's not valid TOML. We re-raise the exception
-        # with the URL listed in the error message, so it's clear to what URL the error refers to
-        except exceptions.NotParseableTOML as ex:
-            message = f"A file was found at {url}: but it wasn't parseable TOML. Error was: {ex}"
-            log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+            validation_results = parser.validate_as_carbon_txt(
+                parsed_result, logs=self.event_log
             )
-
-        # the file path is reachable, but the server returned a 404
-        except httpx.HTTPStatusError as ex:
-            message = f"An error occurred while fetching the carbon.txt file at {url}."
-            log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
-            return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+            document_processing_results = await self._aappend_document_processing(
+                validation_results
             )
 
-        except Exception as ex:  # noqa
-            message = f"An unexpected error occurred: {ex}"
-            log_exception_safely(ex, message, errors, self.event_log)
-            validation_results = None
             return ValidationResult(
-                result=validation_results, logs=self.event_log, exceptions=errors
+                result=validation_results,
+                logs=self.event_log,
+                exceptions=errors,
+                document_results=document_processing_results or {},
+                url=url,
             )
+        except Exception as ex:  # noqa
+            return self._failed_url_validation(url, ex, errors)
 
     def validate_domain(self, domain: str) -> ValidationResult:
         """
@@ -333,3 +450,43 @@ class CarbonTxtValidator:
             return ValidationResult(
                 result=validation_results, logs=self.event_log, exceptions=errors
             )
+
+    async def avalidate_domain(self, domain: str) -> ValidationResult:
+        """
+        Async version of validate_domain.
+        """
+        self.event_log = []  # Reset event log for each validation
+        errors: list[Exception | pydantic_core.ErrorDetails | dict] = []
+
+        try:
+            message = f"Attempting to resolve domain: {domain}"
+            self.event_log.append(message)
+            finder_result = await self.file_finder.aresolve_domain(
+                domain, logs=self.event_log
+            )
+            fetched_file_contents = await self.file_finder.afetch_carbon_txt_file(
+                finder_result.uri, logs=self.event_log
+            )
+            parsed_toml = parser.parse_toml(fetched_file_contents, logs=self.event_log)
+            validation_results = parser.validate_as_carbon_txt(
+                parsed_toml, logs=self.event_log
+            )
+
+            logger.info("Validation results: %s", validation_results)
+
+            document_processing_results = await self._aappend_document_processing(
+                validation_results
+            )
+
+            return ValidationResult(
+                result=validation_results,
+                logs=self.event_log,
+                exceptions=errors,
+                document_results=document_processing_results or {},
+                delegation_method=finder_result.delegation_method,
+                url=finder_result.uri,
+            )
+        except Exception as ex:  # noqa
+            message = f"An unexpected error occurred: {ex}"
+            log_exception_safely(ex, message, errors, self.event_log)
+            return ValidationResult(result=None, logs=self.event_log, exceptions=errors)
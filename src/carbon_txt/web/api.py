@@ -1,13 +1,38 @@
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator
+from urllib.parse import urlparse
+
 import pydantic
 import pydantic_extra_types.domain as pydantic_domain
 import structlog
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from ninja import NinjaAPI, Schema
-
-from .. import exceptions, finders, schemas, validators
-from .api_key_auth import APIKeyHeaderAuth
-from .throttling import AuthRateThrottleWithInternalOverride
+from ninja.responses import NinjaJSONEncoder
+
+from .. import finders, schemas, validators
+from ..validators import sanitize_document_results
+from .api_key_auth import (
+    APIKeyHeaderAuth,
+    AsyncAPIKeyHeaderAuth,
+    AsyncRequiredAPIKeyHeaderAuth,
+)
+from .document_jobs.jobs import enqueue_document_processing, needs_document_processing
+from .document_jobs.models import DocumentProcessingJob
+from .prewarm import get_prewarm_status
+from .response_cache import (
+    acache_response,
+    aget_cached_response,
+    aowns_domain,
+    apurge,
+    normalise_domain,
+)
+from .throttling import AuthRateThrottleWithInternalOverride, PurgeRateThrottle
+from .validation_logging.middleware import record_validation
 
 file_finder = finders.FileFinder()
 
@@ -17,6 +42,14 @@ file_finder.update_tld_suffix_list()
 
 logger = structlog.get_logger()
 
+# Shared by the API and the batch endpoint, which checks each item in a batch
+# against the same rate limit as a single request
+throttle = AuthRateThrottleWithInternalOverride(
+    f"{settings.THROTTLE_REQUESTS_PER_SECOND}/s"
+)
+
+purge_throttle = PurgeRateThrottle(f"{settings.CACHE_PURGE_REQUESTS_PER_MINUTE}/m")
+
 # Initialize the NinjaAPI with OpenAPI documentation details
 ninja_api = NinjaAPI(
     openapi_extra={
@@ -25,16 +58,17 @@ ninja_api = NinjaAPI(
         }
     },
     auth=[APIKeyHeaderAuth()],
-    throttle=[
-        AuthRateThrottleWithInternalOverride(
-            f"{settings.THROTTLE_REQUESTS_PER_SECOND}/s"
-        )
-    ],
+    throttle=[throttle],
     title="Carbon.txt Validator API",
     description="This is the API for validating carbon.txt files. ",
 )
 
 
+# The validate views are async, so checking API keys for them shouldn't
+# hold a thread either
+async_auth = [AsyncAPIKeyHeaderAuth()]
+
+
 class CarbonTextSubmission(Schema):
     """
     Schema for the submission of carbon.txt file contents.
@@ -63,39 +97,93 @@ class CarbonTextDomainSubmission(Schema):
     domain: pydantic_domain.DomainStr
 
 
-def sanitize_document_results(document_results: dict[str, list]) -> dict[str, list]:
+class CarbonTextBatchSubmission(Schema):
+    """
+    Schema for the submission of a batch of domains and URLs to validate.
+    Each item is either a fully qualified domain, or a URL pointing to a
+    carbon.txt file.
     """
-    Sanitize document results by converting NoMatchingDatapointsError
-    exceptions to dictionaries, otherwise return each result as is.
 
-    Args:
-        document_results (dict): The original document results.
+    items: list[str] = pydantic.Field(min_length=1)
 
-    Returns:
-        dict: The sanitized document results.
+
+class CachePurgeSubmission(Schema):
     """
-    sanitized_results: dict[str, list] = {}
-    for plugin_name, original_output in document_results.items():
-        sanitized_output = []
-        for item in original_output:
-            # we have to turn this into a dict, otherwise it won't serialise
-            # to JSON cleanly
-            if isinstance(item, exceptions.NoMatchingDatapointsError):
-                sanitized_item = item.__dict__()
-                sanitized_item["error"] = "NoMatchingDatapointsError"
-                sanitized_output.append(sanitized_item)
-            else:
-                sanitized_output.append(item)
+    Schema for purging the cached validations of a domain, a URL, or both.
+    """
+
+    domain: pydantic_domain.DomainStr | None = None
+    url: pydantic.HttpUrl | None = None
 
-        sanitized_results[plugin_name] = sanitized_output
-    return sanitized_results
+
+_url_adapter = pydantic.TypeAdapter(pydantic.HttpUrl)
+_domain_adapter = pydantic.TypeAdapter(pydantic_domain.DomainStr)
+
+
+def _create_validator() -> validators.CarbonTxtValidator:
+    """
+    Return a validator using the plugins configured in the settings. If linked
+    documents are processed asynchronously, it only checks the syntax.
+    """
+    return validators.CarbonTxtValidator(
+        plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
+        active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
+        process_documents=not settings.ASYNC_DOCUMENT_PROCESSING,
+    )
+
+
+def _validation_log_fields(
+    validation_results: validators.ValidationResult,
+    url: str | None = None,
+    domain: str | None = None,
+) -> dict:
+    """
+    Return the details of a validation for the LogValidationMiddleware to log.
+    """
+    url = validation_results.url or url
+    if domain is None and url:
+        domain = urlparse(url).netloc
+    return {
+        "success": bool(validation_results.result),
+        "url": url,
+        "domain": domain,
+        "version": getattr(validation_results.result, "version", None),
+    }
+
+
+async def _add_document_job(
+    response: dict, validation_results: validators.ValidationResult
+) -> dict:
+    """
+    If linked documents are processed asynchronously, queue up a job to
+    process them, and add its id and the URL to poll for its results to
+    the response.
+    """
+    carbon_txt_file = validation_results.result
+    if (
+        settings.ASYNC_DOCUMENT_PROCESSING
+        and carbon_txt_file
+        and needs_document_processing(carbon_txt_file)
+    ):
+        job = await sync_to_async(enqueue_document_processing)(
+            carbon_txt_file, url=validation_results.url
+        )
+        response["document_job"] = {
+            "id": job.id,
+            "status": job.status,
+            "url": reverse(
+                f"{ninja_api.urls_namespace}:document_job", kwargs={"job_id": job.id}
+            ),
+        }
+    return response
 
 
 @ninja_api.post(
     "/validate/file/",
     description="Accept contents of a carbon.txt file and validate it.",
+    auth=async_auth,
 )
-def validate_contents(
+async def validate_contents(
     request: HttpRequest, carbon_txt_submission: CarbonTextSubmission
 ) -> HttpResponse:
     """
@@ -108,14 +196,12 @@ def validate_contents(
     Returns:
         dict: A dictionary containing the success status and either the validated data or errors.
     """
-    validator = validators.CarbonTxtValidator(
-        plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
-        active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
-    )
+    validator = _create_validator()
 
-    validation_results = validator.validate_contents(
+    validation_results = await validator.avalidate_contents(
         carbon_txt_submission.text_contents
     )
+    record_validation(request, **_validation_log_fields(validation_results))
     if carbon_txt_file := validation_results.result:
         if validation_results:
             doc_results = sanitize_document_results(
@@ -123,12 +209,13 @@ def validate_contents(
             )
         # TODO: make sure empty doc_results show as {}, with no keys
         # https://github.com/thegreenwebfoundation/carbon-txt-validator/issues/59
-        return {
+        response = {
             "success": True,
             "data": carbon_txt_file,
             "logs": validation_results.logs,
             "document_data": doc_results,
-        }  # type: ignore
+        }
+        return await _add_document_job(response, validation_results)  # type: ignore
     else:
         return {
             "success": False,
@@ -138,10 +225,14 @@ def validate_contents(
 
 
 @ninja_api.post(
-    "/validate/url/", description="Fetch a file at a given URL and validate it."
+    "/validate/url/",
+    description="Fetch a file at a given URL and validate it.",
+    auth=async_auth,
 )
-def validate_url(
-    request: HttpRequest, carbon_txt_url_data: CarbonTextUrlSubmission
+async def validate_url(
+    request: HttpRequest,
+    carbon_txt_url_data: CarbonTextUrlSubmission,
+    fresh: bool = False,
 ) -> HttpResponse:
     """
     Endpoint to validate a carbon.txt file at the provided URL.
@@ -149,17 +240,21 @@ def validate_url(
     Args:
         request: The request object.
         carbon_txt_url_data: The request body containing the URL of the carbon.txt file.
+        fresh: Validate the URL again, rather than returning a cached response.
 
     Returns:
         dict: A dictionary containing the success status and either the validated data or errors.
     """
     url_string = str(carbon_txt_url_data.url)
-    validator = validators.CarbonTxtValidator(
-        plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
-        active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
-    )
-
-    validation_results = validator.validate_url(str(url_string))
+    if not fresh and (cached := await aget_cached_response("url", url_string)):
+        cached_response, log_fields = cached
+        record_validation(request, **log_fields)
+        return cached_response
+    validator = _create_validator()
+
+    validation_results = await validator.avalidate_url(str(url_string))
+    log_fields = _validation_log_fields(validation_results, url=url_string)
+    record_validation(request, **log_fields)
     if carbon_txt_file := validation_results.result:
         if validation_results:
             doc_results = sanitize_document_results(
@@ -167,25 +262,33 @@ def validate_url(
             )
         # TODO: make sure empty doc_results show as {}, with no keys
         # https://github.com/thegreenwebfoundation/carbon-txt-validator/issues/59
-        return {
+        response = {
             "success": True,
             "url": validation_results.url,
             "data": carbon_txt_file,
             "document_data": doc_results,
             "logs": validation_results.logs,
-        }  # type: ignore
+        }
+        response = await _add_document_job(response, validation_results)
     else:
-        return {
+        response = {
             "success": False,
             "url": validation_results.url,
             "errors": validation_results.exceptions,
             "logs": validation_results.logs,
-        }  # type: ignore
+        }
+    return await acache_response(
+        "url",
+        url_string,
+        ninja_api.create_response(request, response, status=200),
+        log_fields,
+    )
 
 
 @ninja_api.post(
     "/validate/domain/",
     description="Find a file for a given domain and validate it.",
+    auth=async_auth,
     openapi_extra={
         "requestBody": {
             "content": {
@@ -203,8 +306,10 @@ def validate_url(
         }
     },
 )
-def validate_domain(
-    request: HttpRequest, carbon_txt_domain_data: CarbonTextDomainSubmission
+async def validate_domain(
+    request: HttpRequest,
+    carbon_txt_domain_data: CarbonTextDomainSubmission,
+    fresh: bool = False,
 ) -> HttpResponse:
     """
     Endpoint to validate a carbon.txt file for the provided domain.
@@ -212,17 +317,22 @@ def validate_domain(
     Args:
         request: The request object.
         carbon_txt_domain_data: The request body containing the domain to validate.
+        fresh: Validate the domain again, rather than returning a cached response.
 
     Returns:
         dict: A dictionary containing the success status and either the validated data or errors.
     """
     domain_string = str(carbon_txt_domain_data.domain)
-    validator = validators.CarbonTxtValidator(
-        plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
-        active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
-    )
-
-    validation_results = validator.validate_domain(str(domain_string))
+    cache_value = normalise_domain(domain_string)
+    if not fresh and (cached := await aget_cached_response("domain", cache_value)):
+        cached_response, log_fields = cached
+        record_validation(request, **log_fields)
+        return cached_response
+    validator = _create_validator()
+
+    validation_results = await validator.avalidate_domain(str(domain_string))
+    log_fields = _validation_log_fields(validation_results, domain=domain_string)
+    record_validation(request, **log_fields)
     if carbon_txt_file := validation_results.result:
         if validation_results:
             doc_results = sanitize_document_results(
@@ -230,22 +340,328 @@ def validate_domain(
             )
         # TODO: make sure empty doc_results show as {}, with no keys
         # https://github.com/thegreenwebfoundation/carbon-txt-validator/issues/59
-        return {
+        response = {
             "success": True,
             "url": validation_results.url,
             "delegation_method": validation_results.delegation_method,
             "data": carbon_txt_file,
             "document_data": doc_results,
             "logs": validation_results.logs,
-        }  # type: ignore
+        }
+        response = await _add_document_job(response, validation_results)
     else:
-        return {
+        response = {
             "success": False,
             "url": validation_results.url,
             "delegation_method": validation_results.delegation_method,
             "errors": validation_results.exceptions,
             "logs": validation_results.logs,
-        }  # type: ignore
+        }
+    return await acache_response(
+        "domain",
+        cache_value,
+        ninja_api.create_response(request, response, status=200),
+        log_fields,
+    )
+
+
+def _is_url(item: str) -> bool:
+    return item.startswith(("http://", "https://"))
+
+
+async def _validate_batch_item(item: str) -> dict:
+    """
+    Validate a single domain or URL from a batch, returning the same fields
+    the domain and URL endpoints would.
+    """
+    # validators keep a log of each validation, so each item needs its own
+    validator = _create_validator()
+    try:
+        if _is_url(item):
+            url = str(_url_adapter.validate_python(item))
+            validation_results = await validator.avalidate_url(url)
+        else:
+            domain = _domain_adapter.validate_python(item)
+            validation_results = await validator.avalidate_domain(domain)
+    except pydantic.ValidationError as ex:
+        return {
+            "success": False,
+            "errors": [f"{'URL' if _is_url(item) else 'Domain'} is not valid: {ex}"],
+        }
+
+    if carbon_txt_file := validation_results.result:
+        response = {
+            "success": True,
+            "url": validation_results.url,
+            "delegation_method": validation_results.delegation_method,
+            "data": carbon_txt_file,
+            "document_data": sanitize_document_results(
+                validation_results.document_results or {}
+            ),
+            "logs": validation_results.logs,
+        }
+        return await _add_document_job(response, validation_results)
+    return {
+        "success": False,
+        "url": validation_results.url,
+        "delegation_method": validation_results.delegation_method,
+        "errors": validation_results.exceptions,
+        "logs": validation_results.logs,
+    }
+
+
+def _batch_line(request: HttpRequest, result: dict) -> str:
+    """
+    Record the validation of an item in a batch for logging, and return it
+    as a line of JSON.
+    """
+    item = result["item"]
+    url = result.get("url") or (item if _is_url(item) else None)
+    domain = None if _is_url(item) else item
+    record_validation(
+        request,
+        success=result["success"],
+        url=url,
+        domain=domain or (urlparse(url).netloc if url else None),
+        version=getattr(result.get("data"), "version", None),
+    )
+    return json.dumps(result, cls=NinjaJSONEncoder) + "\n"
+
+
+async def _stream_batch_results(
+    request: HttpRequest, items: list[str], throttled: dict[int, str]
+) -> AsyncIterator[str]:
+    """
+    Validate the items in a batch that weren't throttled, a few at a time,
+    yielding a line of JSON for each item as soon as it is done.
+    """
+    semaphore = asyncio.Semaphore(settings.BATCH_VALIDATION_CONCURRENCY)
+
+    async def validate(index: int, item: str) -> dict:
+        async with semaphore:
+            try:
+                result = await _validate_batch_item(item)
+            except Exception as ex:
+                logger.exception("batch_item_failed", item=item)
+                result = {"success": False, "errors": [f"{type(ex).__name__}: {ex}"]}
+        return {"index": index, "item": item, **result}
+
+    for index, error in throttled.items():
+        yield _batch_line(
+            request,
+            {"index": index, "item": items[index], "success": False, "errors": [error]},
+        )
+
+    tasks = [
+        asyncio.ensure_future(validate(index, item))
+        for index, item in enumerate(items)
+        if index not in throttled
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield _batch_line(request, await next_done)
+    finally:
+        # if the client goes away, stop validating the rest of the batch
+        for task in tasks:
+            task.cancel()
+
+
+@ninja_api.post(
+    "/validate/batch/",
+    description=(
+        "Validate a batch of domains and URLs, streaming back a line of JSON "
+        "for each one as soon as it has been validated."
+    ),
+    auth=async_auth,
+    # each item in the batch is throttled instead
+    throttle=[],
+)
+async def validate_batch(
+    request: HttpRequest, carbon_txt_batch_data: CarbonTextBatchSubmission
+) -> HttpResponse:
+    """
+    Endpoint to validate many domains and URLs in one request.
+
+    Items are validated concurrently, and each one counts against the rate
+    limit as a request of its own. Items over the rate limit are not
+    validated, and come back first, with an error.
+
+    Args:
+        request: The request object.
+        carbon_txt_batch_data: The request body containing the domains and URLs to validate.
+
+    Returns:
+        StreamingHttpResponse: Newline delimited JSON, with a line for each
+        item, holding its `index` in the batch, the `item` itself, and the
+        same fields the domain and URL endpoints return.
+    """
+    items = carbon_txt_batch_data.items
+    if len(items) > settings.BATCH_VALIDATION_MAX_ITEMS:
+        return ninja_api.create_response(
+            request,
+            {
+                "message": (
+                    f"Too many items: {len(items)}. A batch can hold at most "
+                    f"{settings.BATCH_VALIDATION_MAX_ITEMS} domains and URLs."
+                )
+            },
+            status=400,
+        )
+
+    throttled = {
+        index: "Too many requests."
+        for index in range(len(items))
+        if not throttle.allow_request(request)
+    }
+
+    return StreamingHttpResponse(
+        _stream_batch_results(request, items, throttled),
+        content_type="application/x-ndjson",
+    )
+
+
+async def _owns_purged_domains(
+    request: HttpRequest, domain: str | None, url: str | None
+) -> bool:
+    """
+    Check that the holder of the API key a purge was made with owns the
+    domain, and the host of the URL, being purged.
+    """
+    if request.auth.get("privilege_level") == "internal":  # type: ignore
+        return True
+    key_prefix = request.headers.get("X-Api-Key", "").split(".")[0]
+    hosts = {domain, urlparse(url).hostname if url else None} - {None}
+    owned = await asyncio.gather(*(aowns_domain(host, key_prefix) for host in hosts))  # type: ignore
+    return all(owned)
+
+
+@ninja_api.post(
+    "/cache/purge/",
+    description=(
+        "Clear the cached validations of a domain or URL, so the next request "
+        "for it validates the carbon.txt file again."
+    ),
+    # purging is only open to API key holders, even when validating isn't
+    auth=[AsyncRequiredAPIKeyHeaderAuth()],
+    throttle=[purge_throttle],
+)
+async def purge_cache(
+    request: HttpRequest, cache_purge_data: CachePurgeSubmission
+) -> HttpResponse:
+    """
+    Endpoint for site owners to clear the cached validations of their
+    domain or carbon.txt URL, once they have published a new carbon.txt file.
+    Purging a domain also clears the URLs we look for a carbon.txt file at
+    on that domain.
+
+    A valid API key is always needed, and the domain, and the host of the URL,
+    must have a `carbon-txt-purge=<key prefix>` DNS TXT record naming it, so
+    only their owners can purge them.
+
+    Args:
+        request: The request object.
+        cache_purge_data: The request body containing the domain, the URL, or both.
+
+    Returns:
+        dict: The domains and URLs purged from the cache.
+    """
+    if not (cache_purge_data.domain or cache_purge_data.url):
+        return ninja_api.create_response(
+            request,
+            {"message": "Pass a domain or a URL to purge from the cache."},
+            status=400,
+        )
+    url = str(cache_purge_data.url) if cache_purge_data.url else None
+    if not await _owns_purged_domains(request, cache_purge_data.domain, url):
+        return ninja_api.create_response(
+            request,
+            {
+                "message": (
+                    "Only the owner of a domain can purge it. Add a "
+                    '"carbon-txt-purge=<your API key prefix>" DNS TXT record '
+                    "to the domain to show you own it."
+                )
+            },
+            status=403,
+        )
+    purged = await apurge(domain=cache_purge_data.domain, url=url)
+    return {"purged": purged}  # type: ignore
+
+
+@ninja_api.get(
+    "/jobs/{job_id}/",
+    url_name="document_job",
+    description=(
+        "Check on a queued job processing the documents linked in a carbon.txt "
+        "file, and fetch the results once it is done."
+    ),
+)
+def get_document_job(request: HttpRequest, job_id: uuid.UUID) -> HttpResponse:
+    """
+    Endpoint to poll for the results of processing the documents linked in
+    a carbon.txt file, when they are processed asynchronously.
+
+    Args:
+        request: The request object.
+        job_id: The id of the job, returned in the `document_job` of a validation response.
+
+    Returns:
+        dict: The status of the job, and once it has finished, the document data, logs and errors.
+    """
+    job = DocumentProcessingJob.objects.filter(id=job_id).first()
+    if job is None:
+        return ninja_api.create_response(
+            request,
+            {"message": f"No document processing job {job_id} found."},
+            status=404,
+        )
+
+    response = {
+        "id": job.id,
+        "status": job.status,
+        "url": job.url,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status in (
+        DocumentProcessingJob.Status.DONE,
+        DocumentProcessingJob.Status.FAILED,
+    ):
+        response["document_data"] = job.document_results or {}
+        response["logs"] = job.logs
+        response["errors"] = job.errors
+    return response  # type: ignore
+
+
+@ninja_api.get(
+    "/ready/",
+    summary="Readiness check",
+    description="Check if this server has finished warming up, and is ready to take requests.",
+    auth=None,
+    throttle=[],
+)
+def get_readiness(request: HttpRequest) -> HttpResponse:
+    """
+    Endpoint for load balancers and orchestrators to check if this server
+    process has finished warming up. Returns a 503 until it has. The logs
+    and errors from warming up go to the server log, not the response, as
+    this endpoint is public.
+
+    Args:
+        request: The request object
+
+    Returns: Whether the server is ready, and how long warming up took
+    """
+    status = get_prewarm_status()
+    return ninja_api.create_response(
+        request,
+        {
+            "ready": status.ready,
+            "prewarm_enabled": status.enabled,
+            "prewarm_duration": status.duration,
+        },
+        status=200 if status.ready else 503,
+    )
 
 
 @ninja_api.get(
@@ -1,3 +1,8 @@
+import asyncio
+import contextlib
+import threading
+import weakref
+
 import httpx
 from django.conf import settings
 from django.http import HttpRequest
@@ -5,60 +10,157 @@ from ninja.errors import HttpError
 from ninja.security import APIKeyHeader
 from structlog import get_logger
 
+from .api_key_cache import get_shared_introspection_cache
+
 logger = get_logger()
 
+# Pooled clients for the introspection API, so checking a key reuses an open
+# connection. Async clients can only be used in the event loop they were
+# created in, so there is one per loop.
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client()
+        return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient()
+    return client
+
+
+def _introspection_request(key: str) -> dict:
+    """
+    The arguments for a request to the admin portal API key introspection API.
+    """
+    return {
+        "json": {"token": key},
+        "headers": {"X-GWF-Shared-Secret": settings.GWF_SHARED_SECRET},
+        "timeout": 5.0,
+    }
+
+
+def _active_key(resp: httpx.Response) -> dict | None:
+    """
+    Return the body of a response from the introspection API, if it says
+    the key is active, and for this service.
+    """
+    resp.raise_for_status()
+    body = resp.json()
+    if body["active"] and body["service"] == settings.CARBON_TXT_AUTH_SERVICE_NAME:
+        return body
+    return None
+
+
+@contextlib.contextmanager
+def _introspection_errors_logged(key: str):
+    """
+    Log anything that goes wrong checking a key, and raise it again, so the
+    failure isn't cached, and the request is treated as unauthorized.
+    """
+    prefix = key.split(".")[0]
+    try:
+        yield
+    except httpx.HTTPStatusError as ex:
+        # A non-200 respoonse from the introspection API
+        logger.error(
+            f"Introspection returned {ex.response.status_code} for key prefix {prefix}: {ex}"
+        )
+        raise
+    except httpx.HTTPError as ex:
+        # A lower-level network error
+        logger.error(
+            f"Network error contacting introspection endpoint for key prefix {prefix}: {ex}"
+        )
+        raise
+    except KeyError as ex:
+        # The request returned JSON without an "active" key
+        logger.error(f"Malformed introspection response for key prefix {prefix}: {ex}")
+        raise
+    except ValueError:
+        # This is raised in the call to key.split - GWF keys are in the
+        # format gwf_xxxxxx.xxxxx.. - so this isn't a real one.
+        logger.exception(f'Malformed API key provided: "{key[0:10]}..."')
+        raise
+    except Exception as ex:
+        # Anything else that might go wrong - we err on the side of caution.
+        logger.exception(
+            f"Unexpected error authorizing key with prefix {prefix}: {ex}"  # noqa
+        )
+        raise
+
+
+def _fetch_introspection(key: str) -> dict | None:
+    """
+    Check a key with the admin portal API key introspection API, returning
+    the response body if the key is active, and for this service.
+    """
+    with _introspection_errors_logged(key):
+        # GWF keys are in the format gwf_xxxxxx.xxxxx, anything else raises a ValueError
+        _prefix, _secret = key.split(".")
+        resp = _get_client().post(
+            settings.API_KEY_INTROSPECTION_URL, **_introspection_request(key)
+        )
+        return _active_key(resp)
+
+
+async def _afetch_introspection(key: str) -> dict | None:
+    """
+    Async version of _fetch_introspection.
+    """
+    with _introspection_errors_logged(key):
+        # GWF keys are in the format gwf_xxxxxx.xxxxx, anything else raises a ValueError
+        _prefix, _secret = key.split(".")
+        resp = await _get_async_client().post(
+            settings.API_KEY_INTROSPECTION_URL, **_introspection_request(key)
+        )
+        return _active_key(resp)
+
 
 def introspect_key(key: str | None) -> dict | None:
     """
     Hands off to the admin portal API key introspection API to authorize
-    the user's API key if authentication is enabled.
+    the user's API key if authentication is enabled. Results are cached for
+    a while, so each key is only checked now and then.
+    """
+    if not settings.REQUIRE_API_KEY:
+        return {"active": True}
+    if key:
+        return get_shared_introspection_cache().get(key, _fetch_introspection)
+    return None
+
+
+async def aintrospect_key(key: str | None) -> dict | None:
+    """
+    Async version of introspect_key, for the async API views.
     """
     if not settings.REQUIRE_API_KEY:
         return {"active": True}
     if key:
-        try:
-            prefix, _ = key.split(".")
-            resp = httpx.post(
-                settings.API_KEY_INTROSPECTION_URL,
-                json={"token": key},
-                headers={"X-GWF-Shared-Secret": settings.GWF_SHARED_SECRET},
-                timeout=5.0,
-            )
-            resp.raise_for_status()
-            body = resp.json()
-            if (
-                body["active"]
-                and body["service"] == settings.CARBON_TXT_AUTH_SERVICE_NAME
-            ):
-                return body
-
-        except httpx.HTTPStatusError as ex:
-            # A non-200 respoonse from the introspection API
-            logger.error(
-                f"Introspection returned {ex.response.status_code} for key prefix {prefix}: {ex}"
-            )
-        except httpx.HTTPError as ex:
-            # A lower-level network error
-            logger.error(
-                f"Network error contacting introspection endpoint for key prefix {prefix}: {ex}"
-            )
-        except KeyError as ex:
-            # The request returned JSON without an "active" key
-            logger.error(
-                f"Malformed introspection response for key prefix {prefix}: {ex}"
-            )
-        except ValueError:
-            # This is raised in the call to key.split - GWF keys are in the
-            # format gwf_xxxxxx.xxxxx.. - so this isn't a real one.
-            logger.exception(f'Malformed API key provided: "{key[0:10]}..."')
-        except Exception as ex:
-            # Anything else that might go wrong - we err on the side of caution.
-            logger.exception(
-                f"Unexpected error authorizing key with prefix {prefix}: {ex}"  # noqa
-            )
+        return await get_shared_introspection_cache().aget(key, _afetch_introspection)
     return None
 
 
+async def aintrospect_required_key(key: str | None) -> dict | None:
+    """
+    Like aintrospect_key, but checks the key with the introspection API even
+    when API keys are not required for validating, for endpoints that are
+    only open to API key holders.
+    """
+    if not (key and settings.API_KEY_INTROSPECTION_URL):
+        return None
+    return await get_shared_introspection_cache().aget(key, _afetch_introspection)
+
+
 class APIKeyHeaderAuth(APIKeyHeader):
     param_name = "X-Api-Key"
 
@@ -67,3 +169,32 @@ class APIKeyHeaderAuth(APIKeyHeader):
             return response
         else:
             raise HttpError(401, "A valid API key is required for this request.")
+
+
+class AsyncAPIKeyHeaderAuth(APIKeyHeader):
+    """
+    Checks API keys for async views without holding a thread while the
+    introspection API responds.
+    """
+
+    param_name = "X-Api-Key"
+
+    async def authenticate(self, request: HttpRequest, key: str) -> dict:
+        if response := await aintrospect_key(key):
+            return response
+        else:
+            raise HttpError(401, "A valid API key is required for this request.")
+
+
+class AsyncRequiredAPIKeyHeaderAuth(APIKeyHeader):
+    """
+    Requires a valid API key, whether or not REQUIRE_API_KEY is set.
+    """
+
+    param_name = "X-Api-Key"
+
+    async def authenticate(self, request: HttpRequest, key: str) -> dict:
+        if response := await aintrospect_required_key(key):
+            return response
+        else:
+            raise HttpError(401, "A valid API key is required for this request.")
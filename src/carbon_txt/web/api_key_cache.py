@@ -0,0 +1,225 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from django.conf import settings
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+# stands in for a key we have no usable cached result for, as None is the
+# result for keys the introspection API says are not valid
+_MISSING = object()
+
+
+def _hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class IntrospectionCache:
+    """
+    The results of checking API keys with the admin portal introspection API,
+    so each key is only checked once in a while, rather than on every request.
+
+    Results are kept in memory, keyed by a hash of the key, for `ttl` seconds
+    if the key was valid, and `negative_ttl` seconds if it wasn't. Concurrent
+    checks of the same key share one call to the introspection API. With a
+    `stale_while_revalidate` window, expired results are still returned for
+    that many seconds while the key is checked again in the background, so a
+    slow portal doesn't hold up requests.
+
+    Only answers from the introspection API are cached. If checking a key
+    fails, it is treated as invalid for that request, and checked again on
+    the next.
+
+    At most `max_entries` results are kept, so a flood of made up keys can't
+    grow the cache without limit. Once it is full, expired results are
+    cleared out, then the least recently used.
+    """
+
+    ttl: float
+    negative_ttl: float
+    stale_while_revalidate: float
+    max_entries: int
+
+    def __init__(
+        self,
+        ttl: float,
+        negative_ttl: float,
+        stale_while_revalidate: float = 0,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        # key hash -> (result, expires at, stale until), least recently used first
+        self._entries: OrderedDict[str, tuple[dict | None, float, float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._pending: dict[str, concurrent.futures.Future] = {}
+        self._apending: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _cached(self, key_hash: str) -> tuple[object, bool]:
+        """
+        Return the cached result for a key, or _MISSING, and whether it is
+        stale and needs checking again.
+        """
+        entry = self._entries.get(key_hash)
+        if entry is None:
+            return _MISSING, False
+        result, expires_at, stale_until = entry
+        now = time.monotonic()
+        if now < stale_until:
+            self._entries.move_to_end(key_hash)
+        if now < expires_at:
+            return result, False
+        if now < stale_until:
+            return result, True
+        del self._entries[key_hash]
+        return _MISSING, False
+
+    def _store(self, key_hash: str, result: dict | None) -> None:
+        ttl = self.ttl if result else self.negative_ttl
+        if ttl <= 0:
+            self._entries.pop(key_hash, None)
+            return
+        expires_at = time.monotonic() + ttl
+        self._entries[key_hash] = (
+            result,
+            expires_at,
+            expires_at + self.stale_while_revalidate,
+        )
+        self._entries.move_to_end(key_hash)
+        if len(self._entries) > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key_hash, (_, _, stale_until) in list(self._entries.items()):
+            if stale_until <= now:
+                del self._entries[key_hash]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str, fetch: Callable[[str], dict | None]) -> dict | None:
+        """
+        Return the result of checking a key, calling `fetch` to check it with
+        the introspection API if there is no fresh result cached. `fetch`
+        returns the result, and raises an exception if checking the key fails.
+        """
+        key_hash = _hash_key(key)
+        with self._lock:
+            result, stale = self._cached(key_hash)
+            if result is not _MISSING and not stale:
+                return result  # type: ignore
+            future = self._pending.get(key_hash)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._pending[key_hash] = future
+
+        if result is not _MISSING:
+            if leader:
+                threading.Thread(
+                    target=self._refresh,
+                    args=(key, key_hash, fetch, future),
+                    daemon=True,
+                ).start()
+            return result  # type: ignore
+        if leader:
+            self._refresh(key, key_hash, fetch, future)  # type: ignore
+        return future.result()  # type: ignore
+
+    def _refresh(
+        self,
+        key: str,
+        key_hash: str,
+        fetch: Callable[[str], dict | None],
+        future: concurrent.futures.Future,
+    ) -> None:
+        result = None
+        try:
+            result = fetch(key)
+        except Exception:  # noqa
+            # the fetch logs what went wrong, and we don't cache failures
+            with self._lock:
+                del self._pending[key_hash]
+        else:
+            with self._lock:
+                self._store(key_hash, result)
+                del self._pending[key_hash]
+        future.set_result(result)
+
+    async def aget(
+        self, key: str, afetch: Callable[[str], Awaitable[dict | None]]
+    ) -> dict | None:
+        """
+        Async version of get, with an `afetch` coroutine function to check
+        the key with the introspection API.
+        """
+        key_hash = _hash_key(key)
+        with self._lock:
+            result, stale = self._cached(key_hash)
+        if result is not _MISSING and not stale:
+            return result  # type: ignore
+
+        task = self._apending.get(key_hash)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._arefresh(key, key_hash, afetch))
+            self._apending[key_hash] = task
+
+        if result is not _MISSING:
+            return result  # type: ignore
+        # shielded, so one request going away doesn't cancel the check for
+        # the others waiting on it
+        return await asyncio.shield(task)
+
+    async def _arefresh(
+        self,
+        key: str,
+        key_hash: str,
+        afetch: Callable[[str], Awaitable[dict | None]],
+    ) -> dict | None:
+        try:
+            result = await afetch(key)
+        except Exception:  # noqa
+            # the fetch logs what went wrong, and we don't cache failures
+            return None
+        else:
+            with self._lock:
+                self._store(key_hash, result)
+            return result
+        finally:
+            if self._apending.get(key_hash) is asyncio.current_task():
+                del self._apending[key_hash]
+
+
+# Module-level shared cache, configured from the Django settings.
+_shared_introspection_cache: "IntrospectionCache | None" = None
+
+
+def get_shared_introspection_cache() -> "IntrospectionCache":
+    """
+    Get or create the shared IntrospectionCache singleton.
+    """
+    global _shared_introspection_cache
+    if _shared_introspection_cache is None:
+        _shared_introspection_cache = IntrospectionCache(
+            ttl=settings.API_KEY_CACHE_TTL,
+            negative_ttl=settings.API_KEY_NEGATIVE_CACHE_TTL,
+            stale_while_revalidate=settings.API_KEY_STALE_WHILE_REVALIDATE,
+            max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+        )
+    return _shared_introspection_cache
@@ -50,6 +50,19 @@ env = environ.Env(
     CARBON_TXT_AUTH_SERVICE_NAME=(str, "carbon_txt"),
     REQUIRE_API_KEY=(bool, False),
     THROTTLE_REQUESTS_PER_SECOND=(int, 2),
+    API_KEY_CACHE_TTL=(int, 300),
+    API_KEY_NEGATIVE_CACHE_TTL=(int, 30),
+    API_KEY_STALE_WHILE_REVALIDATE=(int, 0),
+    API_KEY_CACHE_MAX_ENTRIES=(int, 10_000),
+    BATCH_VALIDATION_MAX_ITEMS=(int, 100),
+    BATCH_VALIDATION_CONCURRENCY=(int, 10),
+    VALIDATION_CACHE_TTL=(int, 300),
+    CACHE_PURGE_REQUESTS_PER_MINUTE=(int, 10),
+    VALIDATION_LOG_BATCH_SIZE=(int, 100),
+    VALIDATION_LOG_FLUSH_INTERVAL=(float, 5.0),
+    VALIDATION_LOG_MAX_BUFFERED=(int, 10_000),
+    ASYNC_DOCUMENT_PROCESSING=(bool, False),
+    PREWARM_ON_BOOT=(bool, False),
 )
 
 # fetch environment variables from .env file
@@ -88,6 +101,43 @@ CARBON_TXT_AUTH_SERVICE_NAME = env("CARBON_TXT_AUTH_SERVICE_NAME")
 REQUIRE_API_KEY = env("REQUIRE_API_KEY")
 THROTTLE_REQUESTS_PER_SECOND = env("THROTTLE_REQUESTS_PER_SECOND")
 
+# How long, in seconds, the results of checking API keys with the
+# introspection API are cached for, for valid and invalid keys, and how long
+# expired results are still used while a key is checked again
+API_KEY_CACHE_TTL = env("API_KEY_CACHE_TTL")
+API_KEY_NEGATIVE_CACHE_TTL = env("API_KEY_NEGATIVE_CACHE_TTL")
+API_KEY_STALE_WHILE_REVALIDATE = env("API_KEY_STALE_WHILE_REVALIDATE")
+# The most API key check results each server process keeps in memory
+API_KEY_CACHE_MAX_ENTRIES = env("API_KEY_CACHE_MAX_ENTRIES")
+
+# The most domains and URLs /api/validate/batch/ accepts in one request, and
+# how many of them it validates at the same time
+BATCH_VALIDATION_MAX_ITEMS = env("BATCH_VALIDATION_MAX_ITEMS")
+BATCH_VALIDATION_CONCURRENCY = env("BATCH_VALIDATION_CONCURRENCY")
+
+# How long, in seconds, responses from the domain and URL validation endpoints
+# are cached for. Set to 0 to turn the cache off
+VALIDATION_CACHE_TTL = env("VALIDATION_CACHE_TTL")
+
+# How many times a minute each API key can purge cached validations
+CACHE_PURGE_REQUESTS_PER_MINUTE = env("CACHE_PURGE_REQUESTS_PER_MINUTE")
+
+# Validation log entries are queued, and written in batches of up to
+# VALIDATION_LOG_BATCH_SIZE, at least every VALIDATION_LOG_FLUSH_INTERVAL
+# seconds. Past VALIDATION_LOG_MAX_BUFFERED queued entries, new ones are
+# dropped. Set the interval to 0 to save each entry as it is logged
+VALIDATION_LOG_BATCH_SIZE = env("VALIDATION_LOG_BATCH_SIZE")
+VALIDATION_LOG_FLUSH_INTERVAL = env("VALIDATION_LOG_FLUSH_INTERVAL")
+VALIDATION_LOG_MAX_BUFFERED = env("VALIDATION_LOG_MAX_BUFFERED")
+
+# When set, linked documents like CSRD reports are processed by
+# `carbon-txt worker`, rather than while the API request waits
+ASYNC_DOCUMENT_PROCESSING = env("ASYNC_DOCUMENT_PROCESSING")
+
+# When set, each server process loads the plugins and sets up Arelle as it
+# starts, rather than on the first request that needs them
+PREWARM_ON_BOOT = env("PREWARM_ON_BOOT")
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env("DEBUG")
 
@@ -106,6 +156,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "django_structlog",
     "carbon_txt.web.validation_logging",
+    "carbon_txt.web.document_jobs",
 ]
 
 MIDDLEWARE = [
@@ -39,3 +39,7 @@ LOGGING["loggers"] = {  # type: ignore
 }
 
 REQUIRE_API_KEY = False  # Override when testing
+VALIDATION_CACHE_TTL = 0  # Override when testing
+API_KEY_CACHE_TTL = 0  # Override when testing
+API_KEY_NEGATIVE_CACHE_TTL = 0  # Override when testing
+VALIDATION_LOG_FLUSH_INTERVAL = 0  # Override when testing
@@ -11,8 +11,13 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from carbon_txt.web.prewarm import start_prewarm
+
 os.environ.setdefault(
     "DJANGO_SETTINGS_MODULE", "carbon_txt.web.config.settings.development"
 )
 
 application = get_wsgi_application()
+
+# warm up this process in the background, if PREWARM_ON_BOOT is set
+start_prewarm()
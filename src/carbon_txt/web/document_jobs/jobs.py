@@ -0,0 +1,160 @@
+import datetime
+import time
+
+import pydantic_core
+import structlog
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ... import parsers_toml, schemas, validators
+from ...plugins import pm
+from .models import DocumentProcessingJob
+
+logger = structlog.get_logger(__name__)
+
+parser = parsers_toml.CarbonTxtParser()
+
+# jobs left running for longer than this are assumed to belong to a worker
+# that died, and are picked up again
+DEFAULT_STALE_AFTER = datetime.timedelta(minutes=30)
+
+# stop retrying jobs that have been picked up this many times, as they are
+# likely to be what is killing the worker
+MAX_ATTEMPTS = 3
+
+
+def needs_document_processing(carbon_txt_file: schemas.CarbonTxtFile) -> bool:
+    """
+    Check if a carbon.txt file links to any documents, and there are plugins
+    active to process them.
+    """
+    if not carbon_txt_file.org.disclosures:
+        return False
+    return bool(pm.hook.process_document.get_hookimpls())
+
+
+def enqueue_document_processing(
+    carbon_txt_file: schemas.CarbonTxtFile, url: str | None = None
+) -> DocumentProcessingJob:
+    """
+    Queue up the documents linked in a validated carbon.txt file to be
+    processed by a worker.
+    """
+    return DocumentProcessingJob.objects.create(
+        carbon_txt=carbon_txt_file.model_dump(mode="json"), url=url
+    )
+
+
+def claim_next_job(
+    stale_after: datetime.timedelta = DEFAULT_STALE_AFTER,
+) -> DocumentProcessingJob | None:
+    """
+    Claim the oldest job waiting to be run, or left behind by a worker
+    that died, marking it as running. Returns None if there are no jobs.
+
+    Claiming a job is a single conditional UPDATE, so several workers can
+    share a queue, on any database Django supports, without picking up
+    the same job.
+    """
+    now = timezone.now()
+    stale = Q(
+        status=DocumentProcessingJob.Status.RUNNING, started_at__lt=now - stale_after
+    )
+
+    DocumentProcessingJob.objects.filter(stale, attempts__gte=MAX_ATTEMPTS).update(
+        status=DocumentProcessingJob.Status.FAILED,
+        finished_at=now,
+        errors=[f"Gave up after {MAX_ATTEMPTS} attempts to process documents"],
+    )
+
+    claimable = DocumentProcessingJob.objects.filter(
+        Q(status=DocumentProcessingJob.Status.PENDING) | stale
+    ).only("id", "attempts")
+
+    for job in claimable[:10]:
+        # the attempts counter doubles as a version number. If another
+        # worker claimed the job first, it will have changed, and we
+        # update nothing
+        claimed = DocumentProcessingJob.objects.filter(
+            id=job.id, attempts=job.attempts
+        ).update(
+            status=DocumentProcessingJob.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return DocumentProcessingJob.objects.get(id=job.id)
+    return None
+
+
+def run_job(
+    job: DocumentProcessingJob, validator: validators.CarbonTxtValidator
+) -> DocumentProcessingJob:
+    """
+    Run the document processing plugins for a claimed job, and store the
+    results on it.
+    """
+    logger.info("document_job_started", job_id=str(job.id), url=job.url)
+    try:
+        carbon_txt_file = parser.validate_as_carbon_txt(job.carbon_txt)
+        results = validator.process_linked_documents(carbon_txt_file)
+    except Exception as ex:
+        logger.exception("document_job_failed", job_id=str(job.id), url=job.url)
+        job.status = DocumentProcessingJob.Status.FAILED
+        job.errors = [f"{type(ex).__name__}: {ex}"]
+    else:
+        job.status = (
+            DocumentProcessingJob.Status.FAILED
+            if results.exceptions
+            else DocumentProcessingJob.Status.DONE
+        )
+        # plugins return pydantic models and exceptions, so we convert them
+        # to plain JSON as we would for an API response
+        job.document_results = pydantic_core.to_jsonable_python(
+            validators.sanitize_document_results(results.document_results or {}),
+            fallback=str,
+        )
+        job.logs = pydantic_core.to_jsonable_python(results.logs, fallback=str)
+        job.errors = pydantic_core.to_jsonable_python(results.exceptions, fallback=str)
+
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=["status", "document_results", "logs", "errors", "finished_at"]
+    )
+    logger.info("document_job_finished", job_id=str(job.id), status=job.status)
+    return job
+
+
+def run_worker(
+    poll_interval: float = 1.0,
+    once: bool = False,
+    stale_after: datetime.timedelta = DEFAULT_STALE_AFTER,
+) -> int:
+    """
+    Run queued document processing jobs, polling for new ones every
+    `poll_interval` seconds when the queue is empty. If `once` is set, return
+    as soon as the queue is empty instead.
+
+    Returns the number of jobs run.
+    """
+    # a single validator is reused for every job, so plugins are only
+    # registered, and expensive state like Arelle sessions set up, once
+    validator = validators.CarbonTxtValidator(
+        plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
+        active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
+    )
+    jobs_run = 0
+    while True:
+        # long running processes need to drop database connections that
+        # have gone away, as Django only does this per request
+        close_old_connections()
+        job = claim_next_job(stale_after=stale_after)
+        if job is None:
+            if once:
+                return jobs_run
+            time.sleep(poll_interval)
+            continue
+        run_job(job, validator)
+        jobs_run += 1
@@ -0,0 +1,43 @@
+import typing
+import uuid
+
+from django.db import models
+
+
+class DocumentProcessingJob(models.Model):
+    """
+    This class represents the processing of the documents linked in a
+    carbon.txt file, like CSRD reports, queued up by the API so it can return
+    the syntax validation results straight away. Jobs are picked up and run
+    by `carbon-txt worker`, and their results fetched from `/api/jobs/<id>/`.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    id: models.UUIDField = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False
+    )
+    status: models.CharField = models.CharField(
+        choices=Status, default=Status.PENDING, max_length=16, db_index=True
+    )
+    # the validated carbon.txt file, serialised as JSON, for the worker to
+    # run the document processing plugins over
+    carbon_txt: models.JSONField = models.JSONField()
+    url: models.TextField = models.TextField(blank=True, null=True)
+    document_results: models.JSONField = models.JSONField(blank=True, null=True)
+    logs: models.JSONField = models.JSONField(default=list)
+    errors: models.JSONField = models.JSONField(default=list)
+    # how many times a worker has picked this job up
+    attempts: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(
+        default=0
+    )
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    started_at: models.DateTimeField = models.DateTimeField(blank=True, null=True)
+    finished_at: models.DateTimeField = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering: typing.ClassVar[list[str]] = ["created_at"]
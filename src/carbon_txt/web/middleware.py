@@ -1,5 +1,6 @@
 from collections.abc import Callable
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.http import HttpRequest, HttpResponse
 
 
@@ -13,15 +14,31 @@ class AddTrailingSlashMiddleware:
     https://docs.djangoproject.com/en/5.1/topics/http/middleware/
     """
 
+    # run in the same mode as the views, so async views served over ASGI
+    # don't need a thread per request for this middleware
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response: Callable):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore
+
+        self.add_trailing_slash(request)
+        response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        self.add_trailing_slash(request)
+        return await self.get_response(request)
+
+    def add_trailing_slash(self, request: HttpRequest) -> None:
         # Note: 'validate' is the endpoint that requires a trailing slash.
         # we still want /api/docs and /api/openapi.json to work
         # without a trailing slash.
         if "api/validate" in request.path and not request.path.endswith("/"):
             request.path_info = request.path = f"{request.path}/"
-
-        response = self.get_response(request)
-        return response
@@ -0,0 +1,92 @@
+import importlib
+import threading
+import time
+from dataclasses import dataclass, field
+
+import structlog
+from django.conf import settings
+
+from .. import validators
+from ..plugins import pm
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class PrewarmStatus:
+    """
+    How far this process has got with warming up. Each web server worker
+    process warms itself up, so each has its own status.
+    """
+
+    enabled: bool = False
+    started_at: float | None = None
+    finished_at: float | None = None
+    logs: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ready(self) -> bool:
+        """
+        If prewarming is disabled we are ready straight away. Otherwise we are
+        ready once it has finished, even if it failed, so a plugin that can't
+        warm up doesn't stop the server taking requests.
+        """
+        return not self.enabled or self.finished_at is not None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+_status = PrewarmStatus()
+_lock = threading.Lock()
+
+
+def get_prewarm_status() -> PrewarmStatus:
+    return _status
+
+
+def prewarm() -> PrewarmStatus:
+    """
+    Do the slow work a first request would otherwise pay for: load the URL
+    conf, and with it the API, register the configured plugins, importing
+    any optional extras they use, and give each plugin a chance to set up
+    anything expensive, like the Arelle session used for CSRD reports.
+    """
+    _status.started_at = time.monotonic()
+    try:
+        importlib.import_module(settings.ROOT_URLCONF)
+        validators.CarbonTxtValidator(
+            plugins_dir=settings.CARBON_TXT_PLUGINS_DIR,
+            active_plugins=settings.ACTIVE_CARBON_TXT_PLUGINS,
+        )
+        pm.hook.prewarm(logs=_status.logs)
+    except Exception as ex:
+        logger.exception("prewarm_failed")
+        _status.errors.append(f"{type(ex).__name__}: {ex}")
+    _status.finished_at = time.monotonic()
+    logger.info(
+        "prewarm_finished",
+        duration=_status.duration,
+        logs=_status.logs,
+        errors=_status.errors,
+    )
+    return _status
+
+
+def start_prewarm() -> None:
+    """
+    If PREWARM_ON_BOOT is set, start warming up this process in a
+    background thread, so the server can start answering readiness checks
+    straight away. Called once the WSGI or ASGI application is loaded.
+    """
+    if not settings.PREWARM_ON_BOOT:
+        return
+    with _lock:
+        if _status.enabled:
+            return
+        _status.enabled = True
+    threading.Thread(target=prewarm, name="carbon-txt-prewarm", daemon=True).start()
@@ -0,0 +1,119 @@
+import hashlib
+import time
+
+import dns.asyncresolver
+import dns.exception
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+CACHE_KEY_PREFIX = "validation_response"
+
+# where we look for a carbon.txt file on a domain, before any delegation
+CARBON_TXT_PATHS = ("/carbon.txt", "/.well-known/carbon.txt")
+
+# the DNS TXT record a site owner publishes on their domain, naming the prefix
+# of the API key allowed to purge its cached validations
+PURGE_TXT_RECORD = "carbon-txt-purge"
+
+logger = structlog.get_logger(__name__)
+
+
+def normalise_domain(domain: str) -> str:
+    """
+    Return the form of a domain we cache its validations under, so
+    `Example.com` and `example.com` share a cache entry.
+    """
+    return domain.strip().lower()
+
+
+def cache_key(endpoint: str, value: str) -> str:
+    """
+    Return the key for the cached response from an endpoint, for the given
+    domain or URL. The value is hashed, so the key is safe for any backend.
+    """
+    digest = hashlib.sha256(value.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{endpoint}:{digest}"
+
+
+def _add_cache_headers(response: HttpResponse, age: int) -> HttpResponse:
+    response["Cache-Control"] = f"max-age={max(settings.VALIDATION_CACHE_TTL - age, 0)}"
+    response["Age"] = str(age)
+    return response
+
+
+async def aget_cached_response(
+    endpoint: str, value: str
+) -> tuple[HttpResponse, dict] | None:
+    """
+    Return the cached response from an endpoint for the given domain or URL,
+    with headers saying how old it is, and the details of the validation to
+    log, or None if there isn't one.
+    """
+    if not settings.VALIDATION_CACHE_TTL:
+        return None
+    cached = await cache.aget(cache_key(endpoint, value))
+    if cached is None:
+        return None
+    content, content_type, cached_at, log_fields = cached
+    response = HttpResponse(content, content_type=content_type)
+    return _add_cache_headers(response, age=int(time.time() - cached_at)), log_fields
+
+
+async def acache_response(
+    endpoint: str, value: str, response: HttpResponse, log_fields: dict
+) -> HttpResponse:
+    """
+    Cache a response from an endpoint for the given domain or URL, along
+    with the details of the validation to log, for `VALIDATION_CACHE_TTL`
+    seconds, and return it with headers saying so.
+    """
+    if not settings.VALIDATION_CACHE_TTL:
+        return response
+    await cache.aset(
+        cache_key(endpoint, value),
+        (response.content, response["Content-Type"], time.time(), log_fields),
+        timeout=settings.VALIDATION_CACHE_TTL,
+    )
+    return _add_cache_headers(response, age=0)
+
+
+async def apurge(domain: str | None = None, url: str | None = None) -> list[str]:
+    """
+    Remove the cached responses for a domain, and the URLs we look for a
+    carbon.txt file at on it, and for a URL. Returns the domains and URLs
+    purged.
+    """
+    purged = []
+    keys = []
+    if domain:
+        domain = normalise_domain(domain)
+        purged.append(domain)
+        keys.append(cache_key("domain", domain))
+        for path in CARBON_TXT_PATHS:
+            purged.append(f"https://{domain}{path}")
+            keys.append(cache_key("url", f"https://{domain}{path}"))
+    if url:
+        purged.append(url)
+        keys.append(cache_key("url", url))
+    await cache.adelete_many(keys)
+    return purged
+
+
+async def aowns_domain(domain: str, key_prefix: str) -> bool:
+    """
+    Check whether the holder of an API key owns a domain, by looking for a
+    `carbon-txt-purge=<key prefix>` DNS TXT record on it.
+    """
+    try:
+        answers = await dns.asyncresolver.resolve(normalise_domain(domain), "TXT")
+    except dns.exception.DNSException as ex:
+        logger.info("purge_ownership_lookup_failed", domain=domain, error=str(ex))
+        return False
+    for answer in answers:
+        txt_record = answer.to_text().strip('"')
+        name, _, value = txt_record.partition("=")
+        if name.strip() == PURGE_TXT_RECORD and value.strip() == key_prefix:
+            return True
+    return False
@@ -26,3 +26,12 @@ class AuthRateThrottleWithInternalOverride(AuthRateThrottle):
                 path=request.path,
             )
         return result
+
+
+class PurgeRateThrottle(AuthRateThrottle):
+    """
+    Limits how often each API key can purge cached validations, whether or
+    not API keys are required for validating.
+    """
+
+    scope = "purge"
@@ -0,0 +1,163 @@
+import atexit
+import queue
+import threading
+from collections import defaultdict
+
+import structlog
+from django.conf import settings
+from django.db import connections
+from django.db.models import Model
+
+logger = structlog.get_logger(__name__)
+
+
+class ValidationLogBuffer:
+    """
+    A bounded queue of validation log entries, written to the database in
+    batches with `bulk_create` by a background thread, so requests don't wait
+    on a database write each.
+
+    Queued entries are written once `batch_size` of them are waiting, or
+    every `flush_interval` seconds, whichever comes first. Once `max_size`
+    entries are waiting, new ones are dropped, and counted in `dropped`,
+    rather than let the queue grow without limit while the database is slow.
+    Entries lost because writing a batch failed are counted in `dropped` too.
+
+    With a `flush_interval` of 0, entries are saved straight away in the
+    calling thread instead, with no background thread.
+    """
+
+    batch_size: int
+    flush_interval: float
+    max_size: int
+    dropped: int
+
+    def __init__(
+        self, batch_size: int = 100, flush_interval: float = 5.0, max_size: int = 10_000
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue[Model] = queue.Queue(maxsize=max_size)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def buffered(self) -> bool:
+        """Whether entries are queued, rather than saved as they are added."""
+        return self.flush_interval > 0
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def add(self, entry: Model) -> None:
+        """
+        Queue an entry to be written, or save it straight away if the buffer
+        is switched off.
+        """
+        if not self.buffered:
+            entry.save()
+            return
+
+        self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            logger.warning("validation_log_buffer_full", dropped=self._drop(1))
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every queued entry to the database, returning how many were
+        written.
+        """
+        with self._flush_lock:
+            entries: dict[type[Model], list[Model]] = defaultdict(list)
+            while True:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                entries[type(entry)].append(entry)
+
+            written = 0
+            for model_class, model_entries in entries.items():
+                try:
+                    model_class.objects.bulk_create(  # type: ignore
+                        model_entries, batch_size=self.batch_size
+                    )
+                except Exception:
+                    logger.exception(
+                        "validation_log_write_failed",
+                        model=model_class.__name__,
+                        entries=len(model_entries),
+                        dropped=self._drop(len(model_entries)),
+                    )
+                else:
+                    written += len(model_entries)
+            return written
+
+    def _drop(self, count: int) -> int:
+        """
+        Count `count` entries as dropped, returning how many have been
+        dropped in all.
+        """
+        with self._dropped_lock:
+            self.dropped += count
+            return self.dropped
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None and not self._stopping.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="carbon-txt-validation-log", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            # the connection belongs to this thread, so don't leave it open
+            # between flushes
+            connections.close_all()
+
+    def close(self, timeout: float | None = 10) -> None:
+        """
+        Stop the background thread, and write anything still queued.
+        """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+# Module-level shared buffer, configured from the Django settings.
+_shared_log_buffer: "ValidationLogBuffer | None" = None
+
+
+def get_shared_log_buffer() -> "ValidationLogBuffer":
+    """
+    Get or create the shared ValidationLogBuffer singleton. Anything still
+    queued when the process exits is written before it does.
+    """
+    global _shared_log_buffer
+    if _shared_log_buffer is None:
+        _shared_log_buffer = ValidationLogBuffer(
+            batch_size=settings.VALIDATION_LOG_BATCH_SIZE,
+            flush_interval=settings.VALIDATION_LOG_FLUSH_INTERVAL,
+            max_size=settings.VALIDATION_LOG_MAX_BUFFERED,
+        )
+        atexit.register(_shared_log_buffer.close)
+    return _shared_log_buffer
@@ -1,14 +1,44 @@
 import json
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Iterator
 from urllib.parse import urlparse
 
 import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 
+from carbon_txt.web.validation_logging.buffer import (
+    ValidationLogBuffer,
+    get_shared_log_buffer,
+)
 from carbon_txt.web.validation_logging.models import ValidationLogEntry
 
 
+def record_validation(request: HttpRequest, **fields) -> None:
+    """
+    Record the url, domain, success and version of a validation on the
+    request, for LogValidationMiddleware to log, so it doesn't need to parse
+    them back out of the request and response. Batch validations record
+    each of their items.
+    """
+    if not hasattr(request, "_recorded_validations"):
+        request._recorded_validations = []  # type: ignore
+    request._recorded_validations.append(fields)  # type: ignore
+
+
+def _take_recorded_validations(request: HttpRequest) -> list[dict] | None:
+    """
+    Return the validations recorded on the request since this was last
+    called, or None if the view doesn't record its validations.
+    """
+    recorded = getattr(request, "_recorded_validations", None)
+    if recorded is None:
+        return None
+    taken = list(recorded)
+    recorded.clear()
+    return taken
+
+
 class LogValidationMiddleware:
     """
     Middleware to log the domains requested by users of the carbon.txt validator.
@@ -16,32 +46,89 @@ class LogValidationMiddleware:
     All requests to `/api/validate` endpoints are tracked, along with the `success` flag
     returned in the response. In the case where a URL was supplied, we also log the
     url tested and the domain.
+
+    Views record what to log on the request with `record_validation`. For
+    views that don't, like requests rejected before they reach the view,
+    the details are parsed out of the request and response instead.
+
+    Batch validations stream back a line of JSON for each domain or URL in
+    the batch, and each line is logged as a validation of its own, as it is
+    sent.
+
+    Log entries are written to the database in batches, by the shared
+    ValidationLogBuffer, rather than while the request waits.
     """
 
+    # run in the same mode as the views, so async views served over ASGI
+    # don't need a thread per request for this middleware
+    sync_capable = True
+    async_capable = True
+
     def __init__(
         self,
         get_response: Callable,
         logger=None,
         log_model_class=ValidationLogEntry,
         source=ValidationLogEntry.Source.VALIDATOR_API,
+        log_buffer: ValidationLogBuffer | None = None,
     ):
         if logger is None:
             logger = structlog.get_logger(__name__)
+        if log_buffer is None:
+            log_buffer = get_shared_log_buffer()
         self.get_response = get_response
         self.logger = logger
         self.log_model_class = log_model_class
         self.source = source
+        self.log_buffer = log_buffer
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore
+
         response = self.get_response(request)
 
         if "api/validate" in request.path:
+            if isinstance(response, StreamingHttpResponse):
+                self.log_streamed_validations(request, response)
+                return response
             try:
                 self.log_validation(request, response)
             except Exception as ex:
                 self.logger.exception(f"Validation logging failed with exception: {ex}")  # noqa
         return response
 
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(request)
+
+        if "api/validate" in request.path:
+            if isinstance(response, StreamingHttpResponse):
+                self.log_streamed_validations(request, response)
+                return response
+            try:
+                await self._in_thread_if_unbuffered(self.log_validation)(
+                    request, response
+                )
+            except Exception as ex:
+                self.logger.exception(f"Validation logging failed with exception: {ex}")  # noqa
+        return response
+
+    def _in_thread_if_unbuffered(self, func: Callable) -> Callable:
+        """
+        Wrap a logging method to be awaited from async code. Queueing a log
+        entry doesn't block, but saving it straight away talks to the
+        database, which is sync, so needs a thread.
+        """
+        if self.log_buffer.buffered:
+
+            async def queue_entries(*args):
+                return func(*args)
+
+            return queue_entries
+        return sync_to_async(func)
+
     def log_validation(self, request: HttpRequest, response: HttpResponse):
         """
         This method parses out the relevant details of the request and response
@@ -49,25 +136,103 @@ class LogValidationMiddleware:
         event, as well as adding a log entry in the database. we can then use these
         to track uptake of the carbon.txt standard.
         """
-        request_json = json.loads(request.body)
-        response_json = json.loads(response.content)
-        log_params = {}
-        log_params["endpoint"] = request.path
-        log_params["success"] = response_json.get("success")
+        recorded = _take_recorded_validations(request)
+        if recorded is None:
+            request_json = json.loads(request.body)
+            response_json = json.loads(response.content)
+            recorded = [self._fields_from_json(request_json, response_json)]
+        for fields in recorded:
+            self._log(request, fields)
+
+    def log_streamed_validations(
+        self, request: HttpRequest, response: StreamingHttpResponse
+    ):
+        """
+        Wrap the content of a streamed batch validation response, so each
+        line of JSON in it is logged once it has been sent.
+        """
+        if response.is_async:
+            response.streaming_content = self._alog_lines(
+                request, response.streaming_content
+            )
+        else:
+            response.streaming_content = self._log_lines(
+                request, response.streaming_content
+            )
+
+    def _log_lines(self, request: HttpRequest, content: Iterator) -> Iterator:
+        buffer = b""
+        for chunk in content:
+            yield chunk
+            buffer = self._log_sent_chunk(request, buffer, chunk)
+
+    async def _alog_lines(
+        self, request: HttpRequest, content: AsyncIterator
+    ) -> AsyncIterator:
+        log_sent_chunk = self._in_thread_if_unbuffered(self._log_sent_chunk)
+        buffer = b""
+        async for chunk in content:
+            yield chunk
+            buffer = await log_sent_chunk(request, buffer, chunk)
+
+    def _log_sent_chunk(self, request: HttpRequest, buffer: bytes, chunk: bytes):
+        """
+        Log the validations the view recorded as it streamed this chunk, or
+        if it doesn't record them, those in each line of JSON completed by
+        this chunk. Returns what is left of the last, incomplete line.
+        """
+        try:
+            if (recorded := _take_recorded_validations(request)) is not None:
+                for fields in recorded:
+                    self._log(request, fields)
+                return b""
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for line in lines:
+                self.log_batch_item(request, line)
+        except Exception as ex:
+            self.logger.exception(f"Validation logging failed with exception: {ex}")  # noqa
+        return buffer
+
+    def log_batch_item(self, request: HttpRequest, line: bytes):
+        """
+        Log the result for one domain or URL in a batch validation, as if it
+        had been sent to the domain or URL endpoint on its own.
+        """
+        response_json = json.loads(line)
+        item = response_json.get("item", "")
+        if item.startswith(("http://", "https://")):
+            request_json = {"url": item}
+        else:
+            request_json = {"domain": item}
+        self._log(request, self._fields_from_json(request_json, response_json))
+
+    def _fields_from_json(self, request_json: dict, response_json: dict) -> dict:
+        fields = {}
+        fields["success"] = response_json.get("success")
 
         if "url" in response_json:
-            log_params["url"] = response_json["url"]
+            fields["url"] = response_json["url"]
         elif "url" in request_json:
-            log_params["url"] = request_json["url"]
+            fields["url"] = request_json["url"]
 
         if "domain" in request_json:
-            log_params["domain"] = request_json["domain"]
+            fields["domain"] = request_json["domain"]
         elif "url" in request_json:
-            log_params["domain"] = urlparse(log_params["url"]).netloc
+            fields["domain"] = urlparse(fields["url"]).netloc
 
         if data := response_json.get("data"):  # noqa
             if version := data.get("version"):
-                log_params["version"] = version
+                fields["version"] = version
+
+        return fields
+
+    def _log(self, request: HttpRequest, fields: dict):
+        log_params = {"endpoint": request.path}
+        log_params.update(
+            (name, value)
+            for name, value in fields.items()
+            if value is not None or name == "success"
+        )
 
         if settings.REQUIRE_API_KEY and request.auth and "username" in request.auth:
             log_params["username"] = request.auth["username"]
@@ -77,4 +242,4 @@ class LogValidationMiddleware:
         log_params["source"] = self.source
 
         log_entry = self.log_model_class(**log_params)
-        log_entry.save()
+        self.log_buffer.add(log_entry)
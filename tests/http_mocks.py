@@ -338,6 +338,7 @@ def mocked_dns_delegating_carbon_txt_domain(
             return []
 
     mocker.patch("dns.resolver.resolve", side_effect=dns_lookup_side_effect)
+    mocker.patch("dns.asyncresolver.resolve", side_effect=dns_lookup_side_effect)
     for method in ["get", "head"]:
         httpx_mock.add_response(
             method=method,
@@ -396,6 +397,7 @@ def mocked_dns_delegating_carbon_txt_url(
             return []
 
     mocker.patch("dns.resolver.resolve", side_effect=dns_lookup_side_effect)
+    mocker.patch("dns.asyncresolver.resolve", side_effect=dns_lookup_side_effect)
 
     for method in ["get", "head"]:
         httpx_mock.add_response(
@@ -505,6 +507,7 @@ def mocked_carbon_txt_domain_with_file_and_dns_delegation(
             return []
 
     mocker.patch("dns.resolver.resolve", side_effect=dns_lookup_side_effect)
+    mocker.patch("dns.asyncresolver.resolve", side_effect=dns_lookup_side_effect)
 
     for method in ["get", "head"]:
         httpx_mock.add_response(
@@ -626,6 +629,7 @@ def mocked_carbon_txt_domain_with_recursive_delegation(
             return []
 
     mocker.patch("dns.resolver.resolve", side_effect=dns_lookup_side_effect)
+    mocker.patch("dns.asyncresolver.resolve", side_effect=dns_lookup_side_effect)
 
     for method in ["get", "head"]:
         httpx_mock.add_response(
@@ -1,9 +1,16 @@
+import asyncio
+import json
+import time
 from pathlib import Path
 
 import httpx
 import pytest
+from django.core.cache import cache
 from structlog import get_logger
 
+from carbon_txt.http_client import AsyncHTTPClient
+from carbon_txt.validators import CarbonTxtValidator
+
 logger = get_logger()
 
 
@@ -18,6 +25,120 @@ def test_hitting_validate_endpoint_ok(
     assert res.status_code == 200
 
 
+@pytest.mark.django_db(transaction=True)
+def test_validations_wait_on_the_network_concurrently(
+    async_client, mocker, mocked_carbon_txt_url
+):
+    """
+    The validate endpoints are async, so one server process can wait on the
+    network for many validations at once, rather than one per thread.
+    """
+    head = AsyncHTTPClient.head
+
+    async def slow_head(self, *args, **kwargs):
+        await asyncio.sleep(0.5)
+        return await head(self, *args, **kwargs)
+
+    mocker.patch.object(AsyncHTTPClient, "head", slow_head)
+
+    async def validate_many():
+        return await asyncio.gather(
+            *(
+                async_client.post(
+                    "/api/validate/url/",
+                    {"url": mocked_carbon_txt_url},
+                    content_type="application/json",
+                )
+                for _ in range(10)
+            )
+        )
+
+    started = time.perf_counter()
+    responses = asyncio.run(validate_many())
+
+    assert all(res.json()["success"] for res in responses)
+    # each validation waits half a second, but they all wait together
+    assert time.perf_counter() - started < 2.5
+
+
+async def _post_batch(async_client, items: list[str]):
+    """
+    Post a batch to the batch endpoint, returning the response and the
+    lines of JSON streamed back in it.
+    """
+    res = await async_client.post(
+        "/api/validate/batch/", {"items": items}, content_type="application/json"
+    )
+    if not res.streaming:
+        return res, []
+    content = b"".join([chunk async for chunk in res.streaming_content])
+    return res, [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_validate_batch_streams_a_line_per_item(
+    async_client, mocked_carbon_txt_domain, mocked_carbon_txt_url
+):
+    items = [mocked_carbon_txt_domain, mocked_carbon_txt_url, "not a domain"]
+
+    res, lines = asyncio.run(_post_batch(async_client, items))
+
+    assert res.status_code == 200
+    assert res["Content-Type"] == "application/x-ndjson"
+    results = {line["index"]: line for line in lines}
+    assert sorted(results) == [0, 1, 2]
+    assert [results[index]["item"] for index in range(3)] == items
+
+    assert results[0]["success"]
+    assert results[0]["url"] == mocked_carbon_txt_url
+    assert results[1]["success"]
+    assert results[1]["data"]["org"]["disclosures"]
+    assert not results[2]["success"]
+    assert "Domain is not valid" in results[2]["errors"][0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_validate_batch_rejects_too_many_items(async_client, settings):
+    settings.BATCH_VALIDATION_MAX_ITEMS = 2
+
+    res, _ = asyncio.run(_post_batch(async_client, ["a.com", "b.com", "c.com"]))
+
+    assert res.status_code == 400
+    assert "at most 2" in res.json()["message"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_validate_batch_throttles_each_item(
+    async_client, mocker, mocked_carbon_txt_url
+):
+    """
+    Each item in a batch counts against the rate limit, so a batch can't be
+    used to validate more domains than separate requests could.
+    """
+    cache.clear()
+    mock_settings = mocker.patch("carbon_txt.web.throttling.settings")
+    mock_settings.REQUIRE_API_KEY = True
+    validate_url = mocker.spy(CarbonTxtValidator, "avalidate_url")
+
+    # the rate limit in tests is two requests a second
+    res, lines = asyncio.run(_post_batch(async_client, [mocked_carbon_txt_url] * 3))
+    cache.clear()
+
+    assert res.status_code == 200
+    results = {line["index"]: line for line in lines}
+    assert results[0]["success"]
+    assert results[1]["success"]
+    assert results[2] == {
+        "index": 2,
+        "item": mocked_carbon_txt_url,
+        "success": False,
+        "errors": ["Too many requests."],
+    }
+    # throttled items come back straight away, without being validated
+    assert lines[0]["index"] == 2
+    assert validate_url.call_count == 2
+
+
 @pytest.mark.parametrize("url_suffix", ["", "/"])
 def test_hitting_validate_endpoint_fail(live_server, url_suffix):
     path_to_failing_file = (
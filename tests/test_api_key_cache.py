@@ -0,0 +1,232 @@
+"""Tests for the cache of API key introspection results."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import carbon_txt.web.api_key_cache as cache_module
+from carbon_txt.web.api_key_auth import aintrospect_key, introspect_key
+from carbon_txt.web.api_key_cache import IntrospectionCache
+
+KEY = "gwf_abc.def"
+VALID = {"active": True, "service": "carbon_txt", "username": "someone"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A clock for the cache that only moves when the test moves it.
+    """
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(
+        cache_module, "time", SimpleNamespace(monotonic=lambda: now.value)
+    )
+    return now
+
+
+class CountingFetch:
+    """
+    Stands in for a call to the introspection API, counting how often it
+    is made, and returning or raising what it has been given.
+    """
+
+    def __init__(self, result=None, error=None, delay=0):
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, key):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+    async def acall(self, key):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestIntrospectionCache:
+    def test_valid_keys_are_cached_for_the_ttl(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        fetch = CountingFetch(result=VALID)
+
+        assert cache.get(KEY, fetch) == VALID
+        clock.value += 59
+        assert cache.get(KEY, fetch) == VALID
+        assert fetch.calls == 1
+
+        clock.value += 1
+        cache.get(KEY, fetch)
+        assert fetch.calls == 2
+
+    def test_invalid_keys_are_cached_for_less_time(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        fetch = CountingFetch(result=None)
+
+        assert cache.get(KEY, fetch) is None
+        assert cache.get(KEY, fetch) is None
+        clock.value += 5
+        cache.get(KEY, fetch)
+
+        assert fetch.calls == 2
+
+    def test_failed_checks_are_not_cached(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        fetch = CountingFetch(error=httpx.ConnectError("Connection refused"))
+
+        assert cache.get(KEY, fetch) is None
+        assert cache.get(KEY, fetch) is None
+
+        assert fetch.calls == 2
+        assert len(cache) == 0
+
+    def test_the_least_recently_used_results_are_dropped_once_full(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5, max_entries=2)
+        fetch = CountingFetch(result=VALID)
+
+        cache.get("gwf_a.key", fetch)
+        cache.get("gwf_b.key", fetch)
+        cache.get("gwf_a.key", fetch)
+        cache.get("gwf_c.key", fetch)
+        assert len(cache) == 2
+        assert fetch.calls == 3
+
+        # b was used least recently, so it has to be checked again
+        cache.get("gwf_a.key", fetch)
+        cache.get("gwf_b.key", fetch)
+        assert fetch.calls == 4
+
+    def test_expired_results_are_dropped_first_once_full(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5, max_entries=2)
+        cache.get("gwf_valid.key", CountingFetch(result=VALID))
+        cache.get("gwf_invalid.key", CountingFetch(result=None))
+
+        clock.value += 10
+        fetch = CountingFetch(result=VALID)
+        cache.get("gwf_new.key", fetch)
+        cache.get("gwf_valid.key", fetch)
+
+        assert len(cache) == 2
+        assert fetch.calls == 1
+
+    def test_concurrent_checks_of_a_key_share_one_call(self):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        fetch = CountingFetch(result=VALID, delay=0.2)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get(KEY, fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [VALID] * 5
+        assert fetch.calls == 1
+
+    def test_concurrent_async_checks_of_a_key_share_one_call(self):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        fetch = CountingFetch(result=VALID, delay=0.2)
+
+        async def check_many():
+            return await asyncio.gather(
+                *(cache.aget(KEY, fetch.acall) for _ in range(5))
+            )
+
+        assert asyncio.run(check_many()) == [VALID] * 5
+        assert fetch.calls == 1
+
+    def test_stale_results_are_used_while_the_key_is_checked_again(self, clock):
+        cache = IntrospectionCache(ttl=60, negative_ttl=5, stale_while_revalidate=30)
+        refreshed = {**VALID, "username": "renamed"}
+
+        async def check_over_time():
+            fetch = CountingFetch(result=VALID)
+            await cache.aget(KEY, fetch.acall)
+
+            # once expired, the old result is returned straight away, while
+            # the key is checked in the background
+            clock.value += 61
+            fetch.result = refreshed
+            fetch.delay = 0.1
+            stale = await cache.aget(KEY, fetch.acall)
+            await asyncio.sleep(0.2)
+            fresh = await cache.aget(KEY, fetch.acall)
+
+            # past the window, callers wait for the key to be checked
+            clock.value += 91
+            fetch.result = None
+            expired = await cache.aget(KEY, fetch.acall)
+            return stale, fresh, expired, fetch.calls
+
+        stale, fresh, expired, calls = asyncio.run(check_over_time())
+
+        assert stale == VALID
+        assert fresh == refreshed
+        assert expired is None
+        assert calls == 3
+
+
+class TestIntrospectingKeys:
+    @pytest.fixture
+    def shared_cache(self, mocker):
+        mock_settings = mocker.patch("carbon_txt.web.api_key_auth.settings")
+        mock_settings.REQUIRE_API_KEY = True
+        mock_settings.API_KEY_INTROSPECTION_URL = "http://example.com/introspect"
+        mock_settings.GWF_SHARED_SECRET = "def456"
+        mock_settings.CARBON_TXT_AUTH_SERVICE_NAME = "carbon_txt"
+        cache = IntrospectionCache(ttl=60, negative_ttl=5)
+        mocker.patch(
+            "carbon_txt.web.api_key_auth.get_shared_introspection_cache",
+            return_value=cache,
+        )
+        return cache
+
+    def test_keys_are_only_introspected_once(self, shared_cache, httpx_mock):
+        httpx_mock.add_response(url="http://example.com/introspect", json=VALID)
+
+        assert introspect_key(KEY) == VALID
+        assert introspect_key(KEY) == VALID
+        assert asyncio.run(aintrospect_key(KEY)) == VALID
+
+        assert len(httpx_mock.get_requests()) == 1
+
+    def test_async_checks_share_the_cache(self, shared_cache, httpx_mock):
+        httpx_mock.add_response(url="http://example.com/introspect", json=VALID)
+
+        assert asyncio.run(aintrospect_key(KEY)) == VALID
+        assert asyncio.run(aintrospect_key(KEY)) == VALID
+        assert introspect_key(KEY) == VALID
+
+        assert len(httpx_mock.get_requests()) == 1
+
+
+class TestSharedIntrospectionCache:
+    def test_configured_from_settings(self, settings, monkeypatch):
+        monkeypatch.setattr(cache_module, "_shared_introspection_cache", None)
+        settings.API_KEY_CACHE_TTL = 120
+        settings.API_KEY_NEGATIVE_CACHE_TTL = 10
+        settings.API_KEY_STALE_WHILE_REVALIDATE = 30
+        settings.API_KEY_CACHE_MAX_ENTRIES = 500
+
+        cache = cache_module.get_shared_introspection_cache()
+
+        assert (
+            cache.ttl,
+            cache.negative_ttl,
+            cache.stale_while_revalidate,
+            cache.max_entries,
+        ) == (120, 10, 30, 500)
+        assert cache_module.get_shared_introspection_cache() is cache
@@ -79,3 +79,45 @@ class TestCLI:
 
         # check that we see output from the test plugin
         assert "Test Plugin:" in result.stdout
+
+    def test_validate_stream(self, minimal_carbon_txt_org):
+        """
+        Run our CLI to `carbontxt validate stream`, piping in newline-delimited
+        JSON records, and confirm we get back one JSON result line per record.
+        """
+        records = [
+            {"id": 1, "contents": minimal_carbon_txt_org},
+            {"id": "not-toml", "contents": "nonsense = ["},
+        ]
+        stdin = "\n".join(json.dumps(record) for record in records) + "\n"
+
+        result = runner.invoke(app, ["validate", "stream"], input=stdin)
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+
+        assert result.exit_code == 1
+        assert len(lines) == 2
+
+        assert lines[0]["id"] == 1
+        assert lines[0]["success"] is True
+        domain = lines[0]["data"]["org"]["disclosures"][0]["domain"]
+        assert domain == "used-in-tests.carbontxt.org"
+
+        assert lines[1]["id"] == "not-toml"
+        assert lines[1]["success"] is False
+        assert lines[1]["errors"]
+
+    def test_validate_stream_with_malformed_record(self, minimal_carbon_txt_org):
+        """
+        A line that isn't a valid record is reported as a failure,
+        without stopping the rest of the stream from being validated.
+        """
+        stdin = "not json\n" + json.dumps({"id": 2, "contents": minimal_carbon_txt_org})
+
+        result = runner.invoke(app, ["validate", "stream"], input=stdin)
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+
+        assert len(lines) == 2
+        assert lines[0]["id"] is None
+        assert lines[0]["success"] is False
+        assert lines[1]["id"] == 2
+        assert lines[1]["success"] is True
@@ -0,0 +1,215 @@
+"""Tests for the persistent, SQLite-backed cache of extracted CSRD datapoints."""
+
+import datetime
+import pathlib
+
+import pytest
+from typer.testing import CliRunner
+
+import carbon_txt.processors.csrd_datapoint_cache as cache_module
+from carbon_txt.cli import app
+from carbon_txt.exceptions import NoMatchingDatapointsError
+from carbon_txt.processors.csrd_datapoint_cache import (
+    CSRDDatapointCache,
+    report_version,
+)
+from carbon_txt.processors.csrd_document import DataPoint
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml")
+
+REPORT_URL = "https://example.com/report.xhtml"
+CODES = ["EnergyConsumptionFromFossilSources", "EnergyConsumptionFromNuclearSources"]
+
+runner = CliRunner()
+
+
+def sample_results():
+    return [
+        DataPoint(
+            name="Total energy consumption from fossil sources",
+            short_code="EnergyConsumptionFromFossilSources",
+            value="1000",
+            unit="",
+            context="report.xhtml - 12",
+            file=REPORT_URL,
+            start_date=datetime.date(2026, 1, 1),
+            end_date=datetime.date(2026, 12, 31),
+        ),
+        NoMatchingDatapointsError(
+            "Could not find datapoint",
+            datapoint_short_code="EnergyConsumptionFromNuclearSources",
+            datapoint_readable_label="Total energy consumption from nuclear sources",
+        ),
+    ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CSRDDatapointCache(tmp_path / "csrd.sqlite3")
+
+
+@pytest.fixture
+def reset_shared_datapoint_cache():
+    cache_module._shared_datapoint_cache = None
+    yield
+    cache_module._shared_datapoint_cache = None
+
+
+class TestCSRDDatapointCache:
+    def test_round_trips_datapoints_and_errors(self, cache):
+        cache.set(REPORT_URL, "etag:abc", CODES, sample_results())
+
+        datapoint, error = cache.get(REPORT_URL, "etag:abc", CODES)
+
+        assert datapoint == sample_results()[0]
+        assert isinstance(error, NoMatchingDatapointsError)
+        assert error.short_code == "EnergyConsumptionFromNuclearSources"
+
+    def test_misses_on_a_different_version_or_codes(self, cache):
+        cache.set(REPORT_URL, "etag:abc", CODES, sample_results())
+
+        assert cache.get(REPORT_URL, "etag:def", CODES) is None
+        assert cache.get(REPORT_URL, "etag:abc", CODES[:1]) is None
+        # the order the codes are asked for in doesn't matter
+        assert cache.get(REPORT_URL, "etag:abc", list(reversed(CODES))) is not None
+
+    def test_expired_entries_are_misses(self, tmp_path, mocker):
+        cache = CSRDDatapointCache(tmp_path / "csrd.sqlite3", ttl_seconds=60)
+        cache.set(REPORT_URL, "etag:abc", CODES, sample_results())
+
+        now = cache_module.time.time()
+        mocker.patch.object(cache_module.time, "time", return_value=now + 61)
+
+        assert cache.get(REPORT_URL, "etag:abc", CODES) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_over_max_bytes(self, tmp_path):
+        cache = CSRDDatapointCache(tmp_path / "csrd.sqlite3", max_bytes=None)
+        cache.set("https://example.com/1.xhtml", "etag:1", CODES, sample_results())
+        entry_size = cache.total_bytes
+
+        cache.max_bytes = entry_size * 2
+        cache.set("https://example.com/2.xhtml", "etag:2", CODES, sample_results())
+        # reading the first entry makes the second the least recently used
+        assert cache.get("https://example.com/1.xhtml", "etag:1", CODES)
+        cache.set("https://example.com/3.xhtml", "etag:3", CODES, sample_results())
+
+        assert len(cache) == 2
+        assert cache.get("https://example.com/2.xhtml", "etag:2", CODES) is None
+        assert cache.get("https://example.com/1.xhtml", "etag:1", CODES)
+
+
+class TestReportVersion:
+    def test_local_files_use_sha256(self):
+        version = report_version(LOCAL_FILE_1)
+        assert version.startswith("sha256:")
+        assert version == report_version(LOCAL_FILE_1)
+
+    def test_missing_local_files_have_no_version(self):
+        assert report_version("/no/such/report.xhtml") is None
+
+    def test_remote_reports_use_etag(self, httpx_mock):
+        httpx_mock.add_response(
+            url=REPORT_URL, method="HEAD", headers={"etag": '"abc123"'}
+        )
+        assert report_version(REPORT_URL) == 'etag:"abc123"'
+
+    def test_remote_reports_without_etag_have_no_version(self, httpx_mock):
+        httpx_mock.add_response(url=REPORT_URL, method="HEAD")
+        assert report_version(REPORT_URL) is None
+
+
+class TestPluginUsesDatapointCache:
+    def test_cache_hit_skips_arelle(
+        self, tmp_path, monkeypatch, mocker, httpx_mock, reset_shared_datapoint_cache
+    ):
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.processors.csrd_document import GreenwebCSRDProcessor
+        from carbon_txt.schemas.common import Disclosure
+
+        cache_path = tmp_path / "csrd.sqlite3"
+        monkeypatch.setenv(cache_module.CACHE_PATH_ENV_VAR, str(cache_path))
+        codes = GreenwebCSRDProcessor().local_datapoint_codes
+        CSRDDatapointCache(cache_path).set(
+            REPORT_URL, 'etag:"abc123"', codes, sample_results()
+        )
+        httpx_mock.add_response(
+            url=REPORT_URL, method="HEAD", headers={"etag": '"abc123"'}
+        )
+        extract = mocker.patch(
+            "carbon_txt.process_csrd_document.extract_report_datapoints"
+        )
+
+        doc = Disclosure(doc_type="csrd-report", url=REPORT_URL, domain="example.com")
+        result = process_document(document=doc, logs=[])
+
+        extract.assert_not_called()
+        assert result["plugin_name"] == "csrd_greenweb"
+        assert result["document_results"][0] == sample_results()[0]
+
+    @pytest.mark.parametrize("problem", ["unwritable", "corrupt"])
+    def test_broken_cache_falls_back_to_extracting(
+        self,
+        tmp_path,
+        monkeypatch,
+        mocker,
+        httpx_mock,
+        reset_shared_datapoint_cache,
+        problem,
+    ):
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.schemas.common import Disclosure
+
+        if problem == "unwritable":
+            # the cache's directory can't be created under a regular file
+            (tmp_path / "not-a-directory").write_text("")
+            cache_path = tmp_path / "not-a-directory" / "csrd.sqlite3"
+        else:
+            cache_path = tmp_path / "csrd.sqlite3"
+            cache_path.write_bytes(b"this is not a database" * 100)
+        monkeypatch.setenv(cache_module.CACHE_PATH_ENV_VAR, str(cache_path))
+        results = sample_results()
+        extract = mocker.patch(
+            "carbon_txt.process_csrd_document.extract_report_datapoints",
+            return_value=results,
+        )
+
+        for method in ["HEAD", "GET"]:
+            httpx_mock.add_response(
+                url=REPORT_URL,
+                method=method,
+                content=pathlib.Path(LOCAL_FILE_1).read_bytes(),
+                headers={"etag": '"abc123"', "content-type": "application/xhtml+xml"},
+                is_reusable=True,
+            )
+
+        doc = Disclosure(doc_type="csrd-report", url=REPORT_URL, domain="example.com")
+        logs = []
+        result = process_document(document=doc, logs=logs)
+
+        extract.assert_called_once()
+        assert result["document_results"] == results
+        assert any("Could not read cached datapoints" in log for log in logs)
+
+
+class TestWarmCacheCommand:
+    def test_warm_cache_from_local_report(self, tmp_path):
+        cache_path = tmp_path / "csrd.sqlite3"
+
+        result = runner.invoke(
+            app,
+            ["csrd", "warm-cache", LOCAL_FILE_1, "--cache-path", str(cache_path)],
+        )
+
+        assert result.exit_code == 0
+        cache = CSRDDatapointCache(cache_path)
+        assert len(cache) == 1
+
+        # running it again finds the report already cached
+        result = runner.invoke(
+            app,
+            ["csrd", "warm-cache", LOCAL_FILE_1, "--cache-path", str(cache_path)],
+        )
+        assert result.exit_code == 0
+        assert "already cached" in " ".join(result.stderr.split())
@@ -0,0 +1,218 @@
+"""Tests for the per-report indexes of every fact in a CSRD report."""
+
+import datetime
+import os
+import pathlib
+
+import pytest
+
+import carbon_txt.processors.csrd_document as document_module
+import carbon_txt.processors.csrd_fact_index as fact_index_module
+from carbon_txt.exceptions import NoMatchingDatapointsError
+from carbon_txt.process_csrd_document import extract_report_datapoints
+from carbon_txt.processors.csrd_document import (
+    ArelleProcessor,
+    GreenwebCSRDProcessor,
+    IndexedFact,
+)
+from carbon_txt.processors.csrd_fact_index import (
+    CSRDFactIndexStore,
+    FactIndex,
+    get_shared_fact_index_store,
+)
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml")
+
+REPORT_URL = "https://example.com/report.xhtml"
+
+# a datapoint the GreenwebCSRDProcessor doesn't ask for by default
+OTHER_CODE = "LocationBasedGreenhouseGasEmissions"
+
+
+def sample_facts():
+    return [
+        IndexedFact(
+            local_name="EnergyConsumptionFromFossilSources",
+            value="1000",
+            unit="",
+            sourceline=12,
+            start_date=datetime.date(2026, 1, 1),
+            end_date=datetime.date(2027, 1, 1),
+        ),
+        IndexedFact(
+            local_name="PercentageOfRenewableSourcesInTotalEnergyConsumption",
+            value="0.25",
+            unit="percentage",
+            sourceline=14,
+            start_date=datetime.date(2026, 1, 1),
+            end_date=datetime.date(2027, 1, 1),
+        ),
+    ]
+
+
+def sort_key(result):
+    # Arelle doesn't return the facts for a datapoint in any set order
+    return (result.short_code, result.context)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CSRDFactIndexStore(tmp_path / "indexes")
+
+
+@pytest.fixture
+def reset_shared_fact_index_store():
+    fact_index_module._shared_fact_index_store = None
+    yield
+    fact_index_module._shared_fact_index_store = None
+
+
+@pytest.fixture
+def shared_store(reset_shared_fact_index_store, monkeypatch, tmp_path):
+    monkeypatch.setenv(fact_index_module.FACT_INDEX_PATH_ENV_VAR, str(tmp_path))
+    return get_shared_fact_index_store()
+
+
+class TestCSRDFactIndexStore:
+    def test_round_trips_facts_as_datapoints(self, store):
+        store.write(REPORT_URL, "etag:abc", sample_facts())
+
+        index = store.open(REPORT_URL, "etag:abc")
+        try:
+            (fossil,) = index._get_datapoints_for_datapoint_code(
+                "EnergyConsumptionFromFossilSources",
+                GreenwebCSRDProcessor.esrs_datapoints,
+            )
+            (renewable,) = index._get_datapoints_for_datapoint_code(
+                "PercentageOfRenewableSourcesInTotalEnergyConsumption",
+                GreenwebCSRDProcessor.esrs_datapoints,
+            )
+        finally:
+            index.close()
+
+        assert fossil.name == "Total energy consumption from fossil sources"
+        assert fossil.value == "1000"
+        assert fossil.context == "item.modelDocument.basename - 12"
+        assert fossil.file == REPORT_URL
+        assert fossil.end_date == datetime.date(2027, 1, 1)
+        assert renewable.value == 0.25
+        assert renewable.unit == "percentage"
+
+    def test_missing_datapoints_raise_an_error(self, store):
+        store.write(REPORT_URL, "etag:abc", sample_facts())
+
+        index = store.open(REPORT_URL, "etag:abc")
+        with pytest.raises(NoMatchingDatapointsError):
+            index._get_datapoints_for_datapoint_code(OTHER_CODE, {})
+        index.close()
+
+    def test_misses_on_a_different_version(self, store):
+        store.write(REPORT_URL, "etag:abc", sample_facts())
+
+        assert store.open(REPORT_URL, "etag:def") is None
+        assert store.open("https://example.com/other.xhtml", "etag:abc") is None
+
+    def test_new_versions_replace_the_old_index(self, store):
+        store.write(REPORT_URL, "etag:abc", sample_facts())
+        store.write(REPORT_URL, "etag:def", sample_facts())
+
+        assert store.open(REPORT_URL, "etag:abc") is None
+        assert len(store) == 1
+
+    def test_indexes_from_older_formats_are_ignored(self, store, monkeypatch):
+        store.write(REPORT_URL, "etag:abc", sample_facts())
+        monkeypatch.setattr(fact_index_module, "FORMAT_VERSION", 2)
+
+        assert store.open(REPORT_URL, "etag:abc") is None
+
+    def test_least_recently_used_indexes_are_evicted(self, store):
+        first = store.write("https://example.com/a.xhtml", "etag:a", sample_facts())
+        os.utime(first, (0, 0))
+        store.max_bytes = first.stat().st_size
+        store.write("https://example.com/b.xhtml", "etag:b", sample_facts())
+
+        assert store.open("https://example.com/a.xhtml", "etag:a") is None
+        assert store.open("https://example.com/b.xhtml", "etag:b") is not None
+
+
+class TestIndexingReports:
+    def test_first_parse_indexes_every_fact(self, shared_store, mocker):
+        # the first parse loads the report with Arelle, and writes the index
+        first = extract_report_datapoints(LOCAL_FILE_1)
+        assert len(shared_store) == 1
+
+        # later queries, for any datapoint, are answered from the index
+        load_with_arelle = mocker.spy(document_module, "ArelleProcessor")
+        second = extract_report_datapoints(LOCAL_FILE_1)
+        other = extract_report_datapoints(LOCAL_FILE_1, datapoint_codes=[OTHER_CODE])
+
+        assert load_with_arelle.call_count == 0
+        assert sorted(second, key=sort_key) == sorted(first, key=sort_key)
+        assert len(other) == 15
+        assert {datapoint.short_code for datapoint in other} == {OTHER_CODE}
+
+    def test_indexed_datapoints_match_arelle(self, shared_store):
+        codes = [*GreenwebCSRDProcessor().local_datapoint_codes, OTHER_CODE]
+        processor = GreenwebCSRDProcessor(
+            arelle_processor=ArelleProcessor(LOCAL_FILE_1, datapoint_codes=codes)
+        )
+        try:
+            from_arelle = processor.get_esrs_datapoint_values(codes)
+        finally:
+            processor.close()
+
+        extract_report_datapoints(LOCAL_FILE_1)
+        processor = GreenwebCSRDProcessor(report_url=LOCAL_FILE_1)
+        try:
+            assert isinstance(processor.arelle_processor, FactIndex)
+            from_index = processor.get_esrs_datapoint_values(codes)
+        finally:
+            processor.close()
+        assert sorted(from_index, key=sort_key) == sorted(from_arelle, key=sort_key)
+
+    def test_reports_still_load_when_the_index_cant_be_written(
+        self, shared_store, mocker
+    ):
+        mocker.patch.object(shared_store, "write", side_effect=OSError("disk full"))
+
+        results = extract_report_datapoints(LOCAL_FILE_1)
+
+        assert not any(isinstance(r, NoMatchingDatapointsError) for r in results)
+        assert len(shared_store) == 0
+
+    def test_a_known_version_is_not_checked_again(self, shared_store, mocker):
+        check_version = mocker.patch(
+            "carbon_txt.processors.csrd_datapoint_cache.report_version"
+        )
+
+        extract_report_datapoints(
+            REPORT_URL, report_path=LOCAL_FILE_1, version='etag:"v1"'
+        )
+        processor = GreenwebCSRDProcessor(
+            report_url=REPORT_URL, report_path=LOCAL_FILE_1, version='etag:"v1"'
+        )
+        try:
+            assert isinstance(processor.arelle_processor, FactIndex)
+        finally:
+            processor.close()
+
+        check_version.assert_not_called()
+
+
+class TestSharedFactIndexStore:
+    def test_disabled_by_default(self, reset_shared_fact_index_store, monkeypatch):
+        monkeypatch.delenv(fact_index_module.FACT_INDEX_PATH_ENV_VAR, raising=False)
+        assert get_shared_fact_index_store() is None
+
+    def test_configured_from_environment(
+        self, reset_shared_fact_index_store, monkeypatch, tmp_path
+    ):
+        monkeypatch.setenv(fact_index_module.FACT_INDEX_PATH_ENV_VAR, str(tmp_path))
+        monkeypatch.setenv(fact_index_module.FACT_INDEX_MAX_MB_ENV_VAR, "10")
+
+        store = get_shared_fact_index_store()
+
+        assert store.path == tmp_path
+        assert store.max_bytes == 10 * 1024 * 1024
+        assert get_shared_fact_index_store() is store
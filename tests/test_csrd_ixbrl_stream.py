@@ -0,0 +1,158 @@
+"""Tests for the streaming iXBRL fast path, and its fallback to Arelle."""
+
+import pathlib
+
+import pytest
+
+from carbon_txt.exceptions import UnsupportedIXBRLDocument
+from carbon_txt.processors.csrd_document import (
+    ArelleProcessor,
+    GreenwebCSRDProcessor,
+)
+from carbon_txt.processors.csrd_ixbrl_stream import (
+    FAST_PATH_ENV_VAR,
+    StreamingIXBRLProcessor,
+)
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml")
+LOCAL_FILE_2 = str(FIXTURE_DIR / "esrs-e2-efrag-2026-12-31-en-no-renewables.xhtml")
+LOCAL_XBRL_FILE = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xbrl")
+
+SYNTHETIC_REPORT = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"
+    xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+    xmlns:ixt4="http://www.xbrl.org/inlineXBRL/transformation/2020-02-12"
+    xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    xmlns:esrs="https://xbrl.efrag.org/taxonomy/esrs/2023-12-22">
+  <head><title>Report</title></head>
+  <body>
+    <div style="display:none">
+      <ix:header>
+        <ix:resources>
+          <xbrli:context id="c-1">
+            <xbrli:entity>
+              <xbrli:identifier scheme="http://standards.iso.org/iso/17442">test</xbrli:identifier>
+            </xbrli:entity>
+            <xbrli:period>
+              <xbrli:startDate>2025-01-01</xbrli:startDate>
+              <xbrli:endDate>2025-12-31</xbrli:endDate>
+            </xbrli:period>
+          </xbrli:context>
+          <xbrli:unit id="u-1"><xbrli:measure>xbrli:pure</xbrli:measure></xbrli:unit>
+        </ix:resources>
+      </ix:header>
+    </div>
+    <p><ix:nonFraction name="esrs:EnergyConsumptionFromFossilSources" contextRef="c-1"
+      unitRef="u-1" decimals="0" scale="6" sign="-"
+      format="ixt4:num-comma-decimal">1.234,5</ix:nonFraction></p>
+    <p><ix:nonFraction name="esrs:EnergyConsumptionFromNuclearSources" contextRef="c-1"
+      unitRef="u-1" decimals="0" format="ixt4:num-dot-decimal">2,000.0</ix:nonFraction></p>
+    <p><ix:nonFraction name="esrs:PercentageOfRenewableSourcesInTotalEnergyConsumption"
+      contextRef="c-1" unitRef="u-1" decimals="2" scale="-2"
+      format="ixt4:num-dot-decimal">12.5</ix:nonFraction>%</p>
+    {extra}
+  </body>
+</html>
+"""
+
+
+def sorted_results(results):
+    return sorted(repr(result) for result in results)
+
+
+def arelle_results(report, codes):
+    processor = GreenwebCSRDProcessor(arelle_processor=ArelleProcessor(report))
+    try:
+        return processor.get_esrs_datapoint_values(codes)
+    finally:
+        processor.close()
+
+
+@pytest.fixture
+def synthetic_report(tmp_path):
+    def write(extra=""):
+        path = tmp_path / "report.xhtml"
+        path.write_text(SYNTHETIC_REPORT.format(extra=extra))
+        return str(path)
+
+    return write
+
+
+class TestStreamingIXBRLProcessor:
+    @pytest.mark.parametrize("report", [LOCAL_FILE_1, LOCAL_FILE_2])
+    def test_results_match_arelle(self, report):
+        processor = GreenwebCSRDProcessor(report_url=report)
+        codes = processor.local_datapoint_codes
+
+        assert isinstance(processor.arelle_processor, StreamingIXBRLProcessor)
+        assert sorted_results(
+            processor.get_esrs_datapoint_values(codes)
+        ) == sorted_results(arelle_results(report, codes))
+
+    def test_applies_scale_sign_and_transformations_like_arelle(self, synthetic_report):
+        report = synthetic_report()
+        codes = GreenwebCSRDProcessor().local_datapoint_codes
+
+        streamed = GreenwebCSRDProcessor(report_url=report)
+        results = streamed.get_esrs_datapoint_values(codes)
+
+        assert sorted_results(results) == sorted_results(arelle_results(report, codes))
+        values = {result.short_code: result.value for result in results}
+        assert values["EnergyConsumptionFromFossilSources"] == "-1234500000"
+        assert values["EnergyConsumptionFromNuclearSources"] == "2000"
+        assert values["PercentageOfRenewableSourcesInTotalEnergyConsumption"] == 0.125
+
+    def test_only_collects_the_requested_facts(self):
+        processor = StreamingIXBRLProcessor(
+            LOCAL_FILE_1, ["EnergyConsumptionFromFossilSources"]
+        )
+
+        assert list(processor._facts_by_local_name) == [
+            "EnergyConsumptionFromFossilSources"
+        ]
+        with pytest.raises(UnsupportedIXBRLDocument):
+            processor._get_datapoints_for_datapoint_code(
+                "EnergyConsumptionFromNuclearSources", {}
+            )
+
+    def test_remote_reports_need_a_local_copy(self):
+        with pytest.raises(UnsupportedIXBRLDocument):
+            StreamingIXBRLProcessor("https://example.com/report.xhtml", [])
+
+
+class TestFallbackToArelle:
+    def test_plain_xbrl_instances_are_not_streamed(self):
+        with pytest.raises(UnsupportedIXBRLDocument, match="Not an inline XBRL"):
+            StreamingIXBRLProcessor(
+                LOCAL_XBRL_FILE, ["EnergyConsumptionFromFossilSources"]
+            )
+
+    def test_unsupported_markup_uses_arelle(self, synthetic_report):
+        report = synthetic_report(
+            extra=(
+                '<ix:tuple name="esrs:SomeTuple">'
+                '<ix:nonNumeric name="esrs:Note" contextRef="c-1">text</ix:nonNumeric>'
+                "</ix:tuple>"
+            )
+        )
+        processor = GreenwebCSRDProcessor(report_url=report)
+        assert isinstance(processor.arelle_processor, ArelleProcessor)
+
+    def test_uncollected_codes_are_read_with_arelle(self):
+        processor = GreenwebCSRDProcessor(report_url=LOCAL_FILE_1)
+        # a fact outside the datapoints we stream for by default
+        results = processor.get_esrs_datapoint_values(
+            ["GrossScope1GreenhouseGasEmissions"]
+        )
+
+        assert isinstance(processor.arelle_processor, ArelleProcessor)
+        assert len(results) == 16
+        assert sorted_results(results) == sorted_results(
+            arelle_results(LOCAL_FILE_1, ["GrossScope1GreenhouseGasEmissions"])
+        )
+
+    def test_fast_path_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv(FAST_PATH_ENV_VAR, "0")
+        processor = GreenwebCSRDProcessor(report_url=LOCAL_FILE_1)
+        assert isinstance(processor.arelle_processor, ArelleProcessor)
@@ -4,8 +4,11 @@ These functions provide fast, cheap checks before invoking the expensive
 Arelle XBRL processor.
 """
 
+import os
+
 import httpx
 import pytest
+import pytest_httpx
 
 from carbon_txt.process_csrd_document import (
     _looks_like_esef_url,
@@ -320,3 +323,159 @@ class TestPrevalidationRejectsHtmlPage:
         # Should return early — no Arelle processing, no exception
         assert "plugin_name" not in result
         assert any("does not contain iXBRL" in log for log in logs)
+
+
+# ---------------------------------------------------------------------------
+# downloading remote reports once
+# ---------------------------------------------------------------------------
+
+IXBRL_HEADER = b'<?xml version="1.0"?><html xmlns:ix="http://www.xbrl.org/2013/inlineXBRL">'
+
+
+class TestRemoteReportsAreDownloadedOnce:
+    """The content sniff streams the report, rather than downloading all of it,
+    and reports that pass are spooled to disk for Arelle to load."""
+
+    def _add_streamed_report(self, httpx_mock, url, chunks, read_chunks, headers=None):
+        def stream():
+            for chunk in chunks:
+                read_chunks.append(chunk)
+                yield chunk
+
+        httpx_mock.add_response(
+            url=url,
+            method="HEAD",
+            status_code=200,
+            headers={"content-type": "application/xhtml+xml"},
+        )
+        httpx_mock.add_response(
+            url=url,
+            method="GET",
+            status_code=200,
+            headers=headers,
+            stream=pytest_httpx.IteratorStream(stream()),
+        )
+
+    def test_sniff_stops_reading_after_the_first_chunks(self, httpx_mock):
+        url = "https://example.com/report.xhtml"
+        chunks = [IXBRL_HEADER + b" " * 8192] + [b" " * 8192] * 99
+        read_chunks = []
+        self._add_streamed_report(httpx_mock, url, chunks, read_chunks)
+
+        assert _quick_validate_remote_csrd_url(url) is True
+        assert len(read_chunks) == 1
+
+    def test_report_is_spooled_to_the_given_file(self, httpx_mock, tmp_path):
+        url = "https://example.com/report.xhtml"
+        chunks = [IXBRL_HEADER] + [b"<p>%d</p>" % i for i in range(2000)]
+        read_chunks = []
+        self._add_streamed_report(httpx_mock, url, chunks, read_chunks)
+
+        spool_path = tmp_path / "report.xhtml"
+        with open(spool_path, "w+b") as spool:
+            assert _quick_validate_remote_csrd_url(url, spool_to=spool) is True
+
+        assert spool_path.read_bytes() == b"".join(chunks)
+
+    def test_failed_downloads_leave_the_spool_empty(self, httpx_mock, tmp_path):
+        url = "https://example.com/report.xhtml"
+
+        def stream():
+            yield IXBRL_HEADER + b" " * 8192
+            yield b" " * 8192
+            raise httpx.ReadError("Connection reset by peer")
+
+        httpx_mock.add_response(
+            url=url,
+            method="HEAD",
+            headers={"content-type": "application/xhtml+xml"},
+        )
+        httpx_mock.add_response(
+            url=url, method="GET", stream=pytest_httpx.IteratorStream(stream())
+        )
+        logs = []
+
+        spool_path = tmp_path / "report.xhtml"
+        with open(spool_path, "w+b") as spool:
+            assert (
+                _quick_validate_remote_csrd_url(url, logs=logs, spool_to=spool) is True
+            )
+
+        # Arelle is left to fetch the report itself
+        assert spool_path.read_bytes() == b""
+        assert any("could not download" in log for log in logs)
+
+    def test_reports_over_the_size_limit_stop_downloading(self, httpx_mock, tmp_path):
+        url = "https://example.com/report.xhtml"
+        chunks = [IXBRL_HEADER + b" " * 8192] + [b" " * 8192] * 99
+        read_chunks = []
+        self._add_streamed_report(httpx_mock, url, chunks, read_chunks)
+        logs = []
+
+        spool_path = tmp_path / "report.xhtml"
+        with open(spool_path, "w+b") as spool:
+            assert (
+                _quick_validate_remote_csrd_url(
+                    url, logs=logs, spool_to=spool, max_spool_bytes=64 * 1024
+                )
+                is False
+            )
+
+        assert spool_path.read_bytes() == b""
+        assert len(read_chunks) < len(chunks)
+        assert any("limit on reports we download" in log for log in logs)
+
+    def test_reports_declared_over_the_size_limit_are_not_downloaded(
+        self, httpx_mock, tmp_path
+    ):
+        url = "https://example.com/report.xhtml"
+        chunks = [IXBRL_HEADER + b" " * 8192] + [b" " * 8192] * 99
+        read_chunks = []
+        self._add_streamed_report(
+            httpx_mock,
+            url,
+            chunks,
+            read_chunks,
+            headers={"content-length": str(sum(len(chunk) for chunk in chunks))},
+        )
+
+        with open(tmp_path / "report.xhtml", "w+b") as spool:
+            assert (
+                _quick_validate_remote_csrd_url(
+                    url, spool_to=spool, max_spool_bytes=64 * 1024
+                )
+                is False
+            )
+
+        assert len(read_chunks) == 1
+
+    def test_plugin_passes_the_spooled_report_to_arelle(self, httpx_mock, mocker):
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.schemas.common import Disclosure
+
+        url = "https://example.com/report.xhtml"
+        chunks = [IXBRL_HEADER] + [b"<p>%d</p>" % i for i in range(2000)]
+        self._add_streamed_report(httpx_mock, url, chunks, [])
+
+        spooled = {}
+
+        def fake_extract(report_url, report_path=None, version=None):
+            spooled["report_url"] = report_url
+            spooled["report_path"] = report_path
+            with open(report_path, "rb") as report:
+                spooled["content"] = report.read()
+            return []
+
+        mocker.patch(
+            "carbon_txt.process_csrd_document.extract_report_datapoints",
+            side_effect=fake_extract,
+        )
+
+        doc = Disclosure(doc_type="csrd-report", url=url, domain="example.com")
+        result = process_document(document=doc, logs=[])
+
+        assert result["plugin_name"] == "csrd_greenweb"
+        assert spooled["report_url"] == url
+        assert spooled["content"] == b"".join(chunks)
+        # the temporary copy is removed once we are done with it
+        assert not os.path.exists(spooled["report_path"])
@@ -0,0 +1,167 @@
+"""Tests for reading CSRD reports from zipped ESEF report packages."""
+
+import json
+import os
+import pathlib
+import zipfile
+
+import pytest
+
+from carbon_txt.exceptions import ReportPackageTooLarge
+from carbon_txt.process_csrd_document import _quick_validate_remote_csrd_url
+from carbon_txt.processors.csrd_document import GreenwebCSRDProcessor
+from carbon_txt.processors.csrd_report_package import (
+    MAX_DECOMPRESSED_MB_ENV_VAR,
+    _copy_entry,
+    find_report_entry,
+    report_package_entry,
+)
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml"
+
+INLINE_REPORT_PACKAGE = {
+    "documentInfo": {"documentType": "https://xbrl.org/report-package/2023/xbri"}
+}
+
+
+def make_package(path, files):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as package:
+        for name, content in files.items():
+            package.writestr(name, content)
+    return str(path)
+
+
+@pytest.fixture
+def report_package(tmp_path):
+    return make_package(
+        tmp_path / "efrag-2026-12-31-en.zip",
+        {
+            "efrag-2026/META-INF/reportPackage.json": json.dumps(INLINE_REPORT_PACKAGE),
+            "efrag-2026/reports/esrs-e1-efrag-2026-12-31-en.xhtml": (
+                LOCAL_FILE_1.read_bytes()
+            ),
+        },
+    )
+
+
+class TestFindReportEntry:
+    def test_finds_report_in_report_package(self, report_package):
+        with zipfile.ZipFile(report_package) as package:
+            entry = find_report_entry(package)
+        assert entry.filename == "efrag-2026/reports/esrs-e1-efrag-2026-12-31-en.xhtml"
+
+    def test_finds_report_in_legacy_esef_package(self, tmp_path):
+        path = make_package(
+            tmp_path / "legacy.zip",
+            {
+                "legacy/META-INF/taxonomyPackage.xml": "<taxonomyPackage/>",
+                "legacy/META-INF/catalog.xml": "<catalog/>",
+                "legacy/www.example.com/extension.xsd": "<schema/>",
+                "legacy/reports/report.xhtml": "<html/>",
+            },
+        )
+        with zipfile.ZipFile(path) as package:
+            assert find_report_entry(package).filename == "legacy/reports/report.xhtml"
+
+    @pytest.mark.parametrize(
+        "files",
+        [
+            # no manifest
+            {"top/reports/report.xhtml": "<html/>"},
+            # more than one top level directory
+            {
+                "one/META-INF/taxonomyPackage.xml": "<taxonomyPackage/>",
+                "two/reports/report.xhtml": "<html/>",
+            },
+            # an inline XBRL document set
+            {
+                "top/META-INF/taxonomyPackage.xml": "<taxonomyPackage/>",
+                "top/reports/report-1.xhtml": "<html/>",
+                "top/reports/report-2.xhtml": "<html/>",
+            },
+            # a non-inline report package
+            {
+                "top/META-INF/reportPackage.json": json.dumps(
+                    {
+                        "documentInfo": {
+                            "documentType": "https://xbrl.org/report-package/2023/xbr"
+                        }
+                    }
+                ),
+                "top/reports/report.json": "{}",
+            },
+        ],
+    )
+    def test_other_archives_are_not_read(self, tmp_path, files):
+        path = make_package(tmp_path / "archive.zip", files)
+        with zipfile.ZipFile(path) as package:
+            assert find_report_entry(package) is None
+
+
+class TestReportPackageEntry:
+    def test_unpacks_only_the_report_and_cleans_up(self, report_package):
+        with report_package_entry(report_package) as entry_path:
+            assert os.listdir(os.path.dirname(entry_path)) == [
+                "esrs-e1-efrag-2026-12-31-en.xhtml"
+            ]
+            assert pathlib.Path(entry_path).read_bytes() == LOCAL_FILE_1.read_bytes()
+        assert not os.path.exists(entry_path)
+
+    def test_plain_reports_are_left_alone(self):
+        with report_package_entry(str(LOCAL_FILE_1)) as entry_path:
+            assert entry_path is None
+
+    def test_reports_over_the_size_limit_are_refused(self, report_package):
+        with (
+            pytest.raises(ReportPackageTooLarge),
+            report_package_entry(report_package, max_bytes=1024),
+        ):
+            pass
+
+    def test_size_limit_is_read_from_the_environment(self, report_package, monkeypatch):
+        monkeypatch.setenv(MAX_DECOMPRESSED_MB_ENV_VAR, "0")
+        with (
+            pytest.raises(ReportPackageTooLarge),
+            report_package_entry(report_package),
+        ):
+            pass
+
+    def test_size_limit_is_checked_while_decompressing(self, report_package, tmp_path):
+        # the headers can't be trusted, so the bytes actually decompressed
+        # are counted too
+        with zipfile.ZipFile(report_package) as package:
+            entry = find_report_entry(package)
+            with pytest.raises(ReportPackageTooLarge):
+                _copy_entry(package, entry, tmp_path / "report.xhtml", 1024)
+
+
+class TestProcessingReportPackages:
+    def test_datapoints_match_the_unzipped_report(self, report_package):
+        zipped = GreenwebCSRDProcessor(report_url=report_package)
+        unzipped = GreenwebCSRDProcessor(report_url=str(LOCAL_FILE_1))
+        codes = zipped.local_datapoint_codes
+
+        zipped_results = zipped.get_esrs_datapoint_values(codes)
+        unzipped_results = unzipped.get_esrs_datapoint_values(codes)
+
+        assert len(zipped_results) == len(unzipped_results) > 0
+        assert {result.file for result in zipped_results} == {report_package}
+        assert sorted((r.short_code, r.value) for r in zipped_results) == sorted(
+            (r.short_code, r.value) for r in unzipped_results
+        )
+
+    def test_remote_report_packages_pass_the_pre_check(self, httpx_mock, tmp_path):
+        url = "https://example.com/efrag-2026-12-31-en.zip"
+        content = pathlib.Path(
+            make_package(
+                tmp_path / "package.zip",
+                {"top/META-INF/reportPackage.json": json.dumps(INLINE_REPORT_PACKAGE)},
+            )
+        ).read_bytes()
+        httpx_mock.add_response(
+            url=url, method="HEAD", headers={"content-type": "application/zip"}
+        )
+        httpx_mock.add_response(url=url, method="GET", content=content)
+
+        assert _quick_validate_remote_csrd_url(url) is True
@@ -0,0 +1,275 @@
+"""Tests for the on-disk store of downloaded CSRD reports."""
+
+import os
+import pathlib
+
+import httpx
+import pytest
+
+import carbon_txt.processors.csrd_report_store as store_module
+from carbon_txt.process_csrd_document import _looks_like_csrd_report
+from carbon_txt.processors.csrd_report_store import (
+    CSRDReportStore,
+    ReportTooLargeForStore,
+    get_shared_report_store,
+)
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml"
+
+REPORT_URL = "https://example.com/report.xhtml"
+REPORT_BODY = LOCAL_FILE_1.read_bytes()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CSRDReportStore(tmp_path / "reports")
+
+
+@pytest.fixture
+def reset_shared_report_store():
+    store_module._shared_report_store = None
+    yield
+    store_module._shared_report_store = None
+
+
+class TestFetch:
+    def test_reports_are_downloaded_once_then_revalidated(self, store, httpx_mock):
+        httpx_mock.add_response(
+            url=REPORT_URL, content=REPORT_BODY, headers={"etag": '"v1"'}
+        )
+        httpx_mock.add_response(
+            url=REPORT_URL, status_code=304, match_headers={"If-None-Match": '"v1"'}
+        )
+
+        first = store.fetch(REPORT_URL)
+        second = store.fetch(REPORT_URL)
+
+        assert first == second
+        assert first["etag"] == '"v1"'
+        with store.checkout(second) as report_path:
+            assert pathlib.Path(report_path).read_bytes() == REPORT_BODY
+            assert report_path.endswith(".xhtml")
+
+    def test_changed_reports_replace_the_stored_copy(self, store, httpx_mock):
+        httpx_mock.add_response(
+            url=REPORT_URL,
+            content=b"<ix:header>v1",
+            headers={"last-modified": "Mon, 01 Jan 2026 00:00:00 GMT"},
+        )
+        httpx_mock.add_response(
+            url=REPORT_URL,
+            content=b"<ix:header>v2",
+            headers={"last-modified": "Tue, 02 Jan 2026 00:00:00 GMT"},
+            match_headers={"If-Modified-Since": "Mon, 01 Jan 2026 00:00:00 GMT"},
+        )
+
+        first = store.fetch(REPORT_URL)
+        second = store.fetch(REPORT_URL)
+
+        assert second["body"] != first["body"]
+        assert not (store.path / first["body"]).exists()
+        assert (store.path / second["body"]).read_bytes() == b"<ix:header>v2"
+        assert len(store) == 1
+
+    def test_unacceptable_content_is_not_stored(self, store, httpx_mock):
+        httpx_mock.add_response(url=REPORT_URL, content=b"<html>Not a report</html>")
+
+        assert store.fetch(REPORT_URL, accept=_looks_like_csrd_report) is None
+        assert len(store) == 0
+
+    def test_missing_reports_are_not_stored(self, store, httpx_mock):
+        httpx_mock.add_response(url=REPORT_URL, status_code=404)
+
+        assert store.fetch(REPORT_URL) is None
+        assert len(store) == 0
+
+    def test_stored_copy_is_used_when_the_server_is_unreachable(
+        self, store, httpx_mock
+    ):
+        httpx_mock.add_response(
+            url=REPORT_URL, content=REPORT_BODY, headers={"etag": '"v1"'}
+        )
+        httpx_mock.add_exception(httpx.ConnectError("Connection refused"))
+
+        first = store.fetch(REPORT_URL)
+
+        assert store.fetch(REPORT_URL) == first
+
+
+class TestEviction:
+    def test_least_recently_used_reports_are_evicted(self, tmp_path):
+        store = CSRDReportStore(tmp_path / "reports", max_bytes=25)
+        entries = {}
+        for index, name in enumerate(["a", "b"]):
+            url = f"https://example.com/{name}.xhtml"
+            entries[name] = store.put(url, iter([b"x" * 10]))
+            # give each report a distinct, increasing last used time
+            os.utime(store.path / entries[name]["body"], (index, index))
+
+        # using "a" makes "b" the least recently used
+        store.touch(entries["a"])
+        store.put("https://example.com/c.xhtml", iter([b"x" * 10]))
+
+        assert store.get("https://example.com/a.xhtml") is not None
+        assert store.get("https://example.com/b.xhtml") is None
+        assert store.get("https://example.com/c.xhtml") is not None
+        assert store.total_bytes == 20
+
+    def test_checked_out_reports_survive_eviction(self, tmp_path):
+        store = CSRDReportStore(tmp_path / "reports", max_bytes=15)
+        entry = store.put("https://example.com/a.xhtml", iter([b"a" * 10]))
+
+        with store.checkout(entry) as report_path:
+            store.put("https://example.com/b.xhtml", iter([b"b" * 10]))
+
+            assert store.get("https://example.com/a.xhtml") is None
+            assert pathlib.Path(report_path).read_bytes() == b"a" * 10
+        assert not os.path.exists(report_path)
+
+    def test_the_report_just_stored_is_never_evicted(self, tmp_path):
+        store = CSRDReportStore(tmp_path / "reports", max_bytes=15)
+        entry = store.put("https://example.com/a.xhtml", iter([b"a" * 10]))
+        # another process used "a" after we started storing "b"
+        future = entry["stored_at"] + 3600
+        os.utime(store.path / entry["body"], (future, future))
+
+        stored = store.put("https://example.com/b.xhtml", iter([b"b" * 10]))
+
+        with store.checkout(stored) as report_path:
+            assert pathlib.Path(report_path).read_bytes() == b"b" * 10
+        assert store.get("https://example.com/a.xhtml") is None
+
+    def test_reports_bigger_than_the_store_are_not_stored(self, tmp_path):
+        store = CSRDReportStore(tmp_path / "reports", max_bytes=10)
+
+        with pytest.raises(ReportTooLargeForStore):
+            store.put(REPORT_URL, iter([b"x" * 8, b"x" * 12]))
+
+        assert len(store) == 0
+        assert [path.name for path in store.path.iterdir()] == ["checkouts"]
+
+    def test_reports_bigger_than_the_store_are_not_downloaded(
+        self, tmp_path, httpx_mock
+    ):
+        store = CSRDReportStore(tmp_path / "reports", max_bytes=10)
+        httpx_mock.add_response(url=REPORT_URL, content=b"<ix:header>" * 10)
+
+        with pytest.raises(ReportTooLargeForStore):
+            store.fetch(REPORT_URL)
+
+    def test_orphaned_bodies_are_cleared_up(self, store):
+        orphan = store.path / "left-behind.xhtml"
+        orphan.write_bytes(b"x")
+        os.utime(orphan, (0, 0))
+
+        store.put(REPORT_URL, iter([b"<ix:header>"]))
+
+        assert not orphan.exists()
+
+
+class TestSharedReportStore:
+    def test_disabled_by_default(self, reset_shared_report_store, monkeypatch):
+        monkeypatch.delenv(store_module.REPORT_STORE_PATH_ENV_VAR, raising=False)
+        assert get_shared_report_store() is None
+
+    def test_configured_from_environment(
+        self, reset_shared_report_store, monkeypatch, tmp_path
+    ):
+        monkeypatch.setenv(store_module.REPORT_STORE_PATH_ENV_VAR, str(tmp_path))
+        monkeypatch.setenv(store_module.REPORT_STORE_MAX_MB_ENV_VAR, "10")
+
+        store = get_shared_report_store()
+
+        assert store.path == tmp_path
+        assert store.max_bytes == 10 * 1024 * 1024
+        assert get_shared_report_store() is store
+
+
+class TestPluginUsesReportStore:
+    def test_plugin_reads_reports_from_the_store(self, store, httpx_mock, mocker):
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.schemas.common import Disclosure
+
+        mocker.patch(
+            "carbon_txt.process_csrd_document.get_shared_report_store",
+            return_value=store,
+        )
+        report_paths = []
+
+        def extract(report_url, report_path=None, version=None):
+            report_paths.append(report_path)
+            assert pathlib.Path(report_path).read_bytes() == REPORT_BODY
+            return ["a datapoint"]
+
+        mocker.patch(
+            "carbon_txt.process_csrd_document.extract_report_datapoints",
+            side_effect=extract,
+        )
+        httpx_mock.add_response(
+            url=REPORT_URL, content=REPORT_BODY, headers={"etag": '"v1"'}
+        )
+        httpx_mock.add_response(url=REPORT_URL, status_code=304)
+
+        doc = Disclosure(doc_type="csrd-report", url=REPORT_URL, domain="example.com")
+        for _ in range(2):
+            result = process_document(document=doc, logs=[])
+            assert result["document_results"] == ["a datapoint"]
+
+        # the second validation revalidated the stored copy, with no HEAD
+        # request, or second download
+        requests = httpx_mock.get_requests()
+        assert [request.method for request in requests] == ["GET", "GET"]
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert len(report_paths) == 2
+
+    @pytest.mark.parametrize("problem", ["too_large", "evicted"])
+    def test_plugin_downloads_reports_the_store_cant_hold(
+        self, tmp_path, httpx_mock, mocker, problem
+    ):
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.schemas.common import Disclosure
+
+        if problem == "too_large":
+            store = CSRDReportStore(tmp_path / "reports", max_bytes=10)
+        else:
+            store = CSRDReportStore(tmp_path / "reports")
+            fetch = store.fetch
+
+            def fetch_then_evict(*args, **kwargs):
+                # another process evicts the report before we check it out
+                entry = fetch(*args, **kwargs)
+                (store.path / entry["body"]).unlink()
+                return entry
+
+            mocker.patch.object(store, "fetch", side_effect=fetch_then_evict)
+
+        mocker.patch(
+            "carbon_txt.process_csrd_document.get_shared_report_store",
+            return_value=store,
+        )
+        report_paths = []
+
+        def extract(report_url, report_path=None, version=None):
+            report_paths.append(report_path)
+            assert pathlib.Path(report_path).read_bytes() == REPORT_BODY
+            return ["a datapoint"]
+
+        mocker.patch(
+            "carbon_txt.process_csrd_document.extract_report_datapoints",
+            side_effect=extract,
+        )
+        httpx_mock.add_response(
+            url=REPORT_URL,
+            content=REPORT_BODY,
+            headers={"content-type": "application/xhtml+xml"},
+            is_reusable=True,
+        )
+
+        doc = Disclosure(doc_type="csrd-report", url=REPORT_URL, domain="example.com")
+        logs = []
+        result = process_document(document=doc, logs=logs)
+
+        assert result["document_results"] == ["a datapoint"]
+        assert "downloading it instead" in " ".join(logs)
+        assert not report_paths[0].startswith(str(store.path))
@@ -4,7 +4,10 @@ These tests exercise the new session reuse infrastructure and the
 modified ArelleProcessor that uses skipDTS + a manual facts index.
 """
 
+import concurrent.futures
 import pathlib
+import time
+import zipfile
 
 import pytest
 from arelle import ModelXbrl  # type: ignore
@@ -16,6 +19,10 @@ from carbon_txt.processors.csrd_document import (
     GreenwebCSRDProcessor,
     get_shared_session_manager,
 )
+from carbon_txt.processors.csrd_taxonomy_packages import (
+    cache_path_for_url,
+    preload_taxonomy_package,
+)
 from carbon_txt.exceptions import NoLoadableCSRDFile
 
 
@@ -23,6 +30,33 @@ FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
 LOCAL_FILE_1 = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml")
 LOCAL_FILE_2 = str(FIXTURE_DIR / "esrs-e2-efrag-2026-12-31-en-no-renewables.xhtml")
 
+ESRS_TAXONOMY_URL = "https://xbrl.efrag.org/taxonomy/esrs/2023-12-22/esrs_all.xsd"
+
+
+def make_taxonomy_package(path):
+    """Write a minimal taxonomy package, remapping the ESRS taxonomy URLs."""
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr(
+            "esrs/META-INF/taxonomyPackage.xml",
+            """<?xml version="1.0" encoding="UTF-8"?>
+<tp:taxonomyPackage xmlns:tp="http://xbrl.org/2016/taxonomy-package" xml:lang="en">
+  <tp:identifier>https://example.com/esrs</tp:identifier>
+  <tp:name>Test ESRS taxonomy</tp:name>
+</tp:taxonomyPackage>""",
+        )
+        package.writestr(
+            "esrs/META-INF/catalog.xml",
+            """<?xml version="1.0" encoding="UTF-8"?>
+<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+  <rewriteURI uriStartString="https://xbrl.efrag.org/taxonomy/"
+    rewritePrefix="../xbrl.efrag.org/taxonomy/"/>
+</catalog>""",
+        )
+        package.writestr(
+            "esrs/xbrl.efrag.org/taxonomy/esrs/2023-12-22/esrs_all.xsd", "<schema/>"
+        )
+    return str(path)
+
 
 @pytest.fixture(autouse=True)
 def reset_shared_session_manager():
@@ -125,6 +159,244 @@ class TestArelleSessionManager:
             mgr.close()
 
 
+class TestArelleSessionManagerMemoryBounds:
+    """Tests for releasing models, and recycling long-lived sessions."""
+
+    def test_close_model_releases_loaded_model(self):
+        """close_model() drops the model from the session's loaded models."""
+        mgr = ArelleSessionManager()
+        try:
+            model = mgr.load_report(LOCAL_FILE_1)
+            assert mgr.live_models == 1
+
+            mgr.close_model(model)
+            assert mgr.live_models == 0
+        finally:
+            mgr.close()
+
+    def test_unloadable_report_is_not_kept_open(self):
+        """A report Arelle can't load doesn't linger in the session."""
+        mgr = ArelleSessionManager()
+        try:
+            with pytest.raises(NoLoadableCSRDFile):
+                mgr.load_report("https://www.example.com/no-csrd-report")
+            assert mgr.live_models == 0
+        finally:
+            mgr.close()
+
+    def test_processor_close_releases_model(self):
+        """Closing a GreenwebCSRDProcessor closes the model it parsed."""
+        mgr = ArelleSessionManager()
+        try:
+            processor = GreenwebCSRDProcessor(
+                arelle_processor=ArelleProcessor(LOCAL_FILE_1, session_manager=mgr)
+            )
+            processor.get_esrs_datapoint_values(processor.local_datapoint_codes)
+            assert mgr.live_models == 1
+
+            processor.close()
+            assert mgr.live_models == 0
+        finally:
+            mgr.close()
+
+    def test_recycles_session_after_max_reports(self):
+        """The session is replaced once it has loaded max_reports_per_session reports."""
+        mgr = ArelleSessionManager(max_reports_per_session=2)
+        try:
+            mgr.close_model(mgr.load_report(LOCAL_FILE_1))
+            first_session = mgr._session
+            mgr.close_model(mgr.load_report(LOCAL_FILE_2))
+            assert mgr._session is first_session
+            assert mgr.reports_loaded == 2
+
+            mgr.load_report(LOCAL_FILE_1)
+            assert mgr._session is not first_session
+            assert mgr.reports_loaded == 1
+            assert mgr.live_models == 1
+        finally:
+            mgr.close()
+
+    def test_recycling_waits_for_open_models_to_be_closed(self):
+        """A session isn't closed while models loaded with it are still in use."""
+        mgr = ArelleSessionManager(max_reports_per_session=1)
+        try:
+            in_use = mgr.load_report(LOCAL_FILE_1)
+            first_session = mgr._session
+
+            # another thread could still be reading the first model
+            second = mgr.load_report(LOCAL_FILE_2)
+            assert mgr._session is first_session
+            assert mgr.live_models == 2
+            assert in_use.facts
+
+            mgr.close_model(second)
+            assert mgr._session is first_session
+
+            # the session is recycled once its last model is closed
+            mgr.close_model(in_use)
+            assert mgr._session is None
+
+            mgr.load_report(LOCAL_FILE_1)
+            assert mgr._session is not first_session
+            assert mgr.reports_loaded == 1
+        finally:
+            mgr.close()
+
+    def test_recycles_session_over_memory_threshold(self):
+        """The session is replaced once resident memory passes max_rss_bytes."""
+        mgr = ArelleSessionManager(max_rss_bytes=1)
+        try:
+            mgr.close_model(mgr.load_report(LOCAL_FILE_1))
+            first_session = mgr._session
+
+            mgr.load_report(LOCAL_FILE_2)
+            assert mgr._session is not first_session
+        finally:
+            mgr.close()
+
+    def test_session_age(self):
+        """session_age is None until a session starts, then counts up."""
+        mgr = ArelleSessionManager()
+        try:
+            assert mgr.session_age is None
+            mgr.start()
+            assert mgr.session_age >= 0
+            mgr.close()
+            assert mgr.session_age is None
+        finally:
+            mgr.close()
+
+    def test_shared_manager_is_only_created_once(self, monkeypatch):
+        """Threads asking for the shared manager at once all get the same one."""
+        monkeypatch.setattr(csrd_module, "_shared_session_manager", None)
+        read_limits = csrd_module._session_limits_from_env
+
+        def slowly_read_limits():
+            time.sleep(0.05)
+            return read_limits()
+
+        monkeypatch.setattr(csrd_module, "_session_limits_from_env", slowly_read_limits)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as threads:
+            managers = list(
+                threads.map(lambda _: get_shared_session_manager(), range(4))
+            )
+
+        assert all(manager is managers[0] for manager in managers)
+
+    def test_shared_manager_limits_from_environment(self, monkeypatch):
+        """The shared manager reads its recycling limits from the environment."""
+        monkeypatch.setenv(csrd_module.MAX_REPORTS_PER_SESSION_ENV_VAR, "10")
+        monkeypatch.setenv(csrd_module.MAX_RSS_MB_ENV_VAR, "512")
+
+        mgr = get_shared_session_manager()
+
+        assert mgr.max_reports_per_session == 10
+        assert mgr.max_rss_bytes == 512 * 1024 * 1024
+
+
+class TestArelleSessionManagerTaxonomies:
+    """Tests for the cache directory, offline mode and taxonomy packages."""
+
+    def test_uses_managed_cache_directory_offline(self, tmp_path):
+        """Arelle caches into our directory, and makes no network requests."""
+        mgr = ArelleSessionManager(cache_directory=str(tmp_path), offline=True)
+        try:
+            model = mgr.load_report(LOCAL_FILE_1)
+            assert isinstance(model, ModelXbrl.ModelXbrl)
+
+            web_cache = mgr._session._cntlr.webCache
+            assert web_cache.cacheDir == str(tmp_path)
+            assert web_cache.workOffline is True
+        finally:
+            mgr.close()
+
+    def test_taxonomy_packages_are_preloaded_into_the_cache(self, tmp_path):
+        """Taxonomy URLs resolve to files from the local packages we are given."""
+        package_dir = tmp_path / "packages"
+        package_dir.mkdir()
+        package = make_taxonomy_package(package_dir / "esrs.zip")
+        cache_dir = str(tmp_path / "cache")
+        mgr = ArelleSessionManager(
+            cache_directory=cache_dir,
+            offline=True,
+            taxonomy_packages=[str(package_dir)],
+        )
+        try:
+            assert mgr.taxonomy_packages == [package]
+
+            mgr.load_report(LOCAL_FILE_1)
+
+            web_cache = mgr._session._cntlr.webCache
+            cached = web_cache.getfilename(ESRS_TAXONOMY_URL)
+            assert cached == str(cache_path_for_url(cache_dir, ESRS_TAXONOMY_URL))
+            assert pathlib.Path(cached).read_text() == "<schema/>"
+        finally:
+            mgr.close()
+
+    def test_preloading_is_skipped_for_cached_files(self, tmp_path):
+        package = make_taxonomy_package(tmp_path / "esrs.zip")
+        cache_dir = str(tmp_path / "cache")
+
+        assert preload_taxonomy_package(package, cache_dir) == 1
+        assert preload_taxonomy_package(package, cache_dir) == 0
+
+    def test_missing_taxonomy_packages_are_skipped(self, tmp_path):
+        mgr = ArelleSessionManager(taxonomy_packages=[str(tmp_path / "missing.zip")])
+        assert mgr.taxonomy_packages == []
+
+    def test_shared_manager_taxonomies_from_environment(self, monkeypatch, tmp_path):
+        """The shared manager reads its cache, offline and package settings
+        from the environment."""
+        package = make_taxonomy_package(tmp_path / "esrs.zip")
+        monkeypatch.setenv(csrd_module.CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+        monkeypatch.setenv(csrd_module.OFFLINE_ENV_VAR, "true")
+        monkeypatch.setenv(csrd_module.TAXONOMY_PACKAGES_ENV_VAR, package)
+
+        mgr = get_shared_session_manager()
+
+        assert mgr.cache_directory == str(tmp_path / "cache")
+        assert mgr.offline is True
+        assert mgr.taxonomy_packages == [package]
+
+    def test_managed_cache_by_default(self, monkeypatch):
+        monkeypatch.delenv(csrd_module.CACHE_DIR_ENV_VAR, raising=False)
+        monkeypatch.delenv(csrd_module.OFFLINE_ENV_VAR, raising=False)
+
+        mgr = get_shared_session_manager()
+
+        assert mgr.cache_directory == csrd_module.DEFAULT_CACHE_DIR
+        assert mgr.offline is False
+
+
+class TestPreloadTaxonomiesCommand:
+    def test_preloads_packages_into_cache(self, tmp_path):
+        from typer.testing import CliRunner
+
+        from carbon_txt.cli import app
+
+        package = make_taxonomy_package(tmp_path / "esrs.zip")
+        cache_dir = str(tmp_path / "cache")
+
+        result = CliRunner().invoke(
+            app, ["csrd", "preload-taxonomies", package, "--cache-dir", cache_dir]
+        )
+
+        assert result.exit_code == 0
+        assert cache_path_for_url(cache_dir, ESRS_TAXONOMY_URL).exists()
+
+    def test_fails_without_packages(self, monkeypatch):
+        from typer.testing import CliRunner
+
+        from carbon_txt.cli import app
+
+        monkeypatch.delenv(csrd_module.TAXONOMY_PACKAGES_ENV_VAR, raising=False)
+
+        result = CliRunner().invoke(app, ["csrd", "preload-taxonomies"])
+
+        assert result.exit_code == 1
+
+
 class TestGetSharedSessionManager:
     """Tests for the module-level singleton."""
 
@@ -171,6 +443,57 @@ class TestArelleProcessorChanges:
         finally:
             mgr.close()
 
+    def test_targeted_index_only_holds_requested_names(self):
+        """Only the requested datapoint codes are indexed up front."""
+        mgr = ArelleSessionManager()
+        try:
+            codes = ["EnergyConsumptionFromFossilSources"]
+            processor = ArelleProcessor(
+                LOCAL_FILE_1, session_manager=mgr, datapoint_codes=codes
+            )
+            assert list(processor._facts_by_local_name) == codes
+        finally:
+            mgr.close()
+
+    def test_targeted_index_adds_other_names_when_queried(self):
+        """Names outside the targeted index are indexed on first query,
+        giving the same datapoints as a full index."""
+        mgr = ArelleSessionManager()
+        try:
+            code = "EnergyConsumptionFromNuclearSources"
+            targeted = ArelleProcessor(
+                LOCAL_FILE_1,
+                session_manager=mgr,
+                datapoint_codes=["EnergyConsumptionFromFossilSources"],
+            )
+            full = ArelleProcessor(LOCAL_FILE_1, session_manager=mgr)
+
+            results = targeted._get_datapoints_for_datapoint_code(code, {})
+            assert sorted(map(repr, results)) == sorted(
+                map(repr, full._get_datapoints_for_datapoint_code(code, {}))
+            )
+            assert code in targeted._facts_by_local_name
+        finally:
+            mgr.close()
+
+    def test_period_dates_are_read_once_per_context(self):
+        """Context dates are memoised by context id, across datapoints."""
+        mgr = ArelleSessionManager()
+        try:
+            processor = ArelleProcessor(LOCAL_FILE_1, session_manager=mgr)
+            processor._get_datapoints_for_datapoint_code(
+                "EnergyConsumptionFromFossilSources", {}
+            )
+            # the fixture reports every datapoint for the same two periods
+            assert set(processor._period_dates) == {"c-1", "c-2"}
+
+            processor._get_datapoints_for_datapoint_code(
+                "EnergyConsumptionFromNuclearSources", {}
+            )
+            assert set(processor._period_dates) == {"c-1", "c-2"}
+        finally:
+            mgr.close()
+
     def test_xbrls_property_backward_compat(self):
         """The .xbrls property returns a list with one model."""
         mgr = ArelleSessionManager()
@@ -0,0 +1,374 @@
+"""Tests for the ArelleWorkerPool, which parses CSRD reports in worker processes."""
+
+import concurrent.futures
+import csv
+import io
+import json
+import os
+import pathlib
+import pickle
+import queue
+import signal
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from typer.testing import CliRunner
+
+import carbon_txt.processors.csrd_worker_pool as pool_module
+from carbon_txt.cli import app
+from carbon_txt.exceptions import (
+    CSRDWorkerPoolFull,
+    NoMatchingDatapointsError,
+    ReportLoadLimitExceeded,
+)
+from carbon_txt.processors.csrd_document import DataPoint, GreenwebCSRDProcessor
+from carbon_txt.processors.csrd_worker_pool import (
+    ArelleWorkerPool,
+    get_shared_worker_pool,
+)
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures"
+LOCAL_FILE_1 = str(FIXTURE_DIR / "esrs-e1-efrag-2026-12-31-en.xhtml")
+LOCAL_FILE_2 = str(FIXTURE_DIR / "esrs-e2-efrag-2026-12-31-en-no-renewables.xhtml")
+
+
+@pytest.fixture
+def worker_pool():
+    pool = ArelleWorkerPool(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def reset_shared_worker_pool():
+    pool_module._shared_worker_pool = None
+    yield
+    if pool_module._shared_worker_pool is not None:
+        pool_module._shared_worker_pool.shutdown()
+    pool_module._shared_worker_pool = None
+
+
+class TestArelleWorkerPool:
+    def test_extract_matches_in_process_results(self, worker_pool):
+        """Datapoints parsed in a worker match those parsed in this process."""
+        codes = GreenwebCSRDProcessor().local_datapoint_codes
+
+        pooled = worker_pool.extract(LOCAL_FILE_1, codes)
+        in_process = GreenwebCSRDProcessor(
+            report_url=LOCAL_FILE_1
+        ).get_esrs_datapoint_values(codes)
+
+        assert sorted(repr(r) for r in pooled) == sorted(repr(r) for r in in_process)
+        assert any(isinstance(r, DataPoint) for r in pooled)
+
+    def test_missing_datapoints_cross_the_process_boundary(self, worker_pool):
+        """NoMatchingDatapointsErrors survive being pickled back from a worker."""
+        code = "PercentageOfRenewableSourcesInTotalEnergyConsumption"
+
+        results = worker_pool.extract(LOCAL_FILE_2, [code])
+
+        assert len(results) == 1
+        assert isinstance(results[0], NoMatchingDatapointsError)
+        assert results[0].short_code == code
+        assert results[0].datapoint_readable_label
+
+    def test_refuses_work_when_queue_is_full(self):
+        """Submissions beyond the workers plus queue depth are refused."""
+        pool = ArelleWorkerPool(max_workers=1, max_queue_depth=0)
+        pool._in_flight = 1
+
+        with pytest.raises(CSRDWorkerPoolFull):
+            pool.submit(LOCAL_FILE_1, ["EnergyConsumptionFromFossilSources"])
+
+    def test_recovers_from_a_crashed_worker(self, worker_pool):
+        """If a worker process dies, the pool restarts and the report is retried."""
+        code = "EnergyConsumptionFromFossilSources"
+        worker_pool.extract(LOCAL_FILE_1, [code])
+
+        for pid in list(worker_pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+
+        results = worker_pool.extract(LOCAL_FILE_1, [code])
+
+        assert results
+        assert worker_pool.in_flight == 0
+
+
+class TestLoadLimits:
+    def test_loads_that_take_too_long_are_stopped(self, tmp_path):
+        """A report that takes longer than the timeout fails, and the pool recovers."""
+        # reading from a FIFO with nothing writing to it blocks forever
+        stuck_report = tmp_path / "stuck-report.xhtml"
+        os.mkfifo(stuck_report)
+        code = "EnergyConsumptionFromFossilSources"
+        pool = ArelleWorkerPool(max_workers=1, load_timeout=2)
+
+        try:
+            started = time.monotonic()
+            with pytest.raises(ReportLoadLimitExceeded) as exc_info:
+                pool.extract(str(stuck_report), [code])
+
+            assert exc_info.value.limit == "time"
+            assert time.monotonic() - started < 30
+            assert pool.in_flight == 0
+            assert pool.extract(LOCAL_FILE_1, [code])
+        finally:
+            pool.shutdown()
+
+    def test_other_loads_are_retried_when_one_takes_too_long(self, tmp_path, mocker):
+        """
+        Stopping a report that takes too long stops the other workers too,
+        so the reports they were loading are loaded again.
+        """
+        stuck_report = tmp_path / "stuck-report.xhtml"
+        os.mkfifo(stuck_report)
+        other_stuck_report = tmp_path / "other-stuck-report.xhtml"
+        os.mkfifo(other_stuck_report)
+        code = "EnergyConsumptionFromFossilSources"
+        pool = ArelleWorkerPool(max_workers=2, load_timeout=2)
+
+        # the first time the other report is loaded, it hangs until the
+        # stuck report has run out of time, so we know it was stopped too
+        stopped = threading.Event()
+        stop_stuck_executor = pool._stop_stuck_executor
+        submit = pool._submit
+        wait_for_result = pool._wait_for_result
+        other_attempts = []
+
+        def stop_and_signal(executor, load_id):
+            stop_stuck_executor(executor, load_id)
+            stopped.set()
+
+        def submit_other_as_stuck(executor, report_url, *args, **kwargs):
+            if report_url == LOCAL_FILE_1:
+                other_attempts.append(report_url)
+                if len(other_attempts) == 1:
+                    return submit(executor, str(other_stuck_report), *args, **kwargs)
+            return submit(executor, report_url, *args, **kwargs)
+
+        def wait_for_the_stop(executor, future, load_id, report_url):
+            if report_url == LOCAL_FILE_1 and len(other_attempts) == 1:
+                assert stopped.wait(30)
+            return wait_for_result(executor, future, load_id, report_url)
+
+        mocker.patch.object(pool, "_stop_stuck_executor", stop_and_signal)
+        mocker.patch.object(pool, "_submit", submit_other_as_stuck)
+        mocker.patch.object(pool, "_wait_for_result", wait_for_the_stop)
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as threads:
+                stuck = threads.submit(pool.extract, str(stuck_report), [code])
+                other = threads.submit(pool.extract, LOCAL_FILE_1, [code])
+
+                with pytest.raises(ReportLoadLimitExceeded):
+                    stuck.result()
+                assert other.result()
+
+            assert len(other_attempts) == 2
+            assert pool.in_flight == 0
+        finally:
+            pool.shutdown()
+
+    def test_loads_are_timed_from_when_a_worker_starts_them(self, mocker):
+        """
+        A report waiting for a free worker isn't timed until the worker says it
+        has started loading it, even though its future already counts as running.
+        """
+        pool = ArelleWorkerPool(max_workers=1, load_timeout=1)
+        executor = mocker.Mock()
+        load_starts = queue.Queue()
+        pool._load_starts[executor] = load_starts
+        pool._timed_loads.add(1)
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+
+        def start_then_finish():
+            time.sleep(1.5)
+            load_starts.put((1, os.getpid(), time.time()))
+            time.sleep(0.5)
+            future.set_result(["datapoints"])
+
+        worker = threading.Thread(target=start_then_finish)
+        worker.start()
+        try:
+            assert pool._wait_for_result(executor, future, 1, LOCAL_FILE_1) == [
+                "datapoints"
+            ]
+        finally:
+            worker.join()
+
+    def test_loads_stopped_by_another_timing_out_dont_use_up_their_retry(self, mocker):
+        """
+        A report whose worker was stopped because another report took too
+        long is tried again, even if a worker has already crashed on it.
+        """
+        pool = ArelleWorkerPool(max_workers=1)
+        crashed, stopped, working = (mocker.Mock() for _ in range(3))
+        pool._stopped_executors.add(stopped)
+        mocker.patch.object(
+            pool, "_get_executor", side_effect=[crashed, stopped, working]
+        )
+
+        def submit(executor, *args, **kwargs):
+            future = concurrent.futures.Future()
+            if executor is working:
+                future.set_result(["datapoints"])
+            else:
+                future.set_exception(BrokenProcessPool("A worker died"))
+            return future
+
+        mocker.patch.object(pool, "_submit", side_effect=submit)
+
+        assert pool.extract(LOCAL_FILE_1, ["EnergyConsumptionFromFossilSources"]) == [
+            "datapoints"
+        ]
+
+    def test_loads_that_use_too_much_memory_are_stopped(self):
+        """A report that needs more memory than the limit fails, and the pool recovers."""
+        code = "EnergyConsumptionFromFossilSources"
+        pool = ArelleWorkerPool(max_workers=1, max_memory_bytes=1024 * 1024)
+
+        try:
+            with pytest.raises(ReportLoadLimitExceeded) as exc_info:
+                pool.extract(LOCAL_FILE_1, [code])
+
+            assert exc_info.value.limit == "memory"
+            assert "1MB" in str(exc_info.value)
+            assert pool.in_flight == 0
+        finally:
+            pool.shutdown()
+
+    def test_out_of_memory_loads_are_not_mistaken_for_empty_reports(self, mocker):
+        """Arelle swallows MemoryErrors, so we check the model it returns for them."""
+        from carbon_txt.processors.csrd_document import ArelleSessionManager
+
+        manager = ArelleSessionManager()
+        model = mocker.Mock(errors=["MemoryError"])
+        mocker.patch.object(manager, "start")
+        mocker.patch.object(manager, "close_model")
+        manager._session = mocker.Mock()
+        manager._session.get_models.return_value = [model]
+
+        with pytest.raises(ReportLoadLimitExceeded) as exc_info:
+            manager.load_report(LOCAL_FILE_1)
+
+        assert exc_info.value.limit == "memory"
+        manager.close_model.assert_called_once_with(model)
+
+    def test_limit_errors_survive_pickling(self):
+        error = ReportLoadLimitExceeded("too slow", limit="time")
+
+        unpickled = pickle.loads(pickle.dumps(error))
+
+        assert str(unpickled) == "too slow"
+        assert unpickled.limit == "time"
+
+
+class TestGetSharedWorkerPool:
+    def test_disabled_by_default(self, reset_shared_worker_pool, monkeypatch):
+        monkeypatch.delenv(pool_module.POOL_SIZE_ENV_VAR, raising=False)
+        assert get_shared_worker_pool() is None
+
+    def test_configured_from_environment(self, reset_shared_worker_pool, monkeypatch):
+        monkeypatch.setenv(pool_module.POOL_SIZE_ENV_VAR, "3")
+        monkeypatch.setenv(pool_module.QUEUE_DEPTH_ENV_VAR, "5")
+
+        pool = get_shared_worker_pool()
+
+        assert pool is not None
+        assert pool.max_workers == 3
+        assert pool.max_queue_depth == 5
+        assert get_shared_worker_pool() is pool
+
+    def test_load_limits_start_a_worker_process(
+        self, reset_shared_worker_pool, monkeypatch
+    ):
+        # limits can only be enforced outside this process, so setting one
+        # without a pool size starts a single worker
+        monkeypatch.delenv(pool_module.POOL_SIZE_ENV_VAR, raising=False)
+        monkeypatch.setenv(pool_module.LOAD_TIMEOUT_ENV_VAR, "30")
+        monkeypatch.setenv(pool_module.LOAD_MAX_MB_ENV_VAR, "2048")
+
+        pool = get_shared_worker_pool()
+
+        assert pool is not None
+        assert pool.max_workers == 1
+        assert pool.load_timeout == 30
+        assert pool.max_memory_bytes == 2048 * 1024 * 1024
+
+
+class TestPluginUsesWorkerPool:
+    def test_plugin_hands_reports_to_configured_pool(self, mocker):
+        """When a worker pool is configured, the plugin parses reports through it."""
+        from carbon_txt.process_csrd_document import process_document
+        from carbon_txt.schemas.common import Disclosure
+
+        fake_pool = mocker.MagicMock(ArelleWorkerPool)
+        fake_pool.extract.return_value = ["a datapoint"]
+        mocker.patch(
+            "carbon_txt.process_csrd_document.get_shared_worker_pool",
+            return_value=fake_pool,
+        )
+        mocker.patch(
+            "carbon_txt.process_csrd_document._quick_validate_remote_csrd_url",
+            return_value=True,
+        )
+
+        url = "https://example.com/report.xhtml"
+        doc = Disclosure(doc_type="csrd-report", url=url, domain="example.com")
+        result = process_document(document=doc, logs=[])
+
+        assert result["document_results"] == ["a datapoint"]
+        report_url, codes = fake_pool.extract.call_args.args
+        assert report_url == url
+        assert codes == GreenwebCSRDProcessor().local_datapoint_codes
+
+
+class TestExtractCommand:
+    def test_extracts_requested_datapoints_as_jsonl(self):
+        code = "EnergyConsumptionFromFossilSources"
+        missing = str(FIXTURE_DIR / "no-such-report.xhtml")
+
+        result = CliRunner().invoke(
+            app,
+            ["csrd", "extract", LOCAL_FILE_1, LOCAL_FILE_2, missing, "-d", code],
+        )
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+
+        # a report that couldn't be read fails the run, but not the others
+        assert result.exit_code == 1
+        by_report = {}
+        for row in rows:
+            by_report.setdefault(row["report"], []).append(row)
+
+        assert {row["short_code"] for row in by_report[LOCAL_FILE_1]} == {code}
+        assert all(row["value"] is not None for row in by_report[LOCAL_FILE_1])
+        # a datapoint missing from a report is written with the reason
+        [not_found] = by_report[LOCAL_FILE_2]
+        assert not_found["value"] is None
+        assert "Could not find datapoint" in not_found["error"]
+        [failed] = by_report[missing]
+        assert failed["error"].startswith("FileNotFoundError")
+
+    def test_extracts_default_datapoints_as_csv(self):
+        result = CliRunner().invoke(
+            app, ["csrd", "extract", LOCAL_FILE_1, "--format", "csv"]
+        )
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+
+        assert result.exit_code == 0
+        assert {row["short_code"] for row in rows} == set(
+            GreenwebCSRDProcessor().local_datapoint_codes
+        )
+
+    def test_only_requested_datapoints_are_indexed(self):
+        codes = ["EnergyConsumptionFromFossilSources"]
+        processor = GreenwebCSRDProcessor(
+            report_url=LOCAL_FILE_1, datapoint_codes=codes
+        )
+        try:
+            assert list(processor.arelle_processor._facts_by_local_name) == codes
+        finally:
+            processor.close()
@@ -0,0 +1,163 @@
+import datetime
+import uuid
+
+import pytest
+from django.utils import timezone
+
+from carbon_txt.web.document_jobs.jobs import (
+    MAX_ATTEMPTS,
+    claim_next_job,
+    run_job,
+    run_worker,
+)
+from carbon_txt.web.document_jobs.models import DocumentProcessingJob
+
+
+@pytest.fixture
+def async_document_processing(settings_with_plugin_dir_set, settings):
+    settings.ASYNC_DOCUMENT_PROCESSING = True
+
+
+def make_job(**kwargs):
+    carbon_txt = {
+        "version": "0.2",
+        "upstream": {"services": []},
+        "org": {
+            "disclosures": [
+                {
+                    "domain": "www.hillbob.de",
+                    "doc_type": "sustainability-page",
+                    "url": "https://www.hillbob.de/klimaneutral",
+                }
+            ]
+        },
+    }
+    return DocumentProcessingJob.objects.create(carbon_txt=carbon_txt, **kwargs)
+
+
+@pytest.mark.django_db
+class TestAsyncDocumentProcessingAPI:
+    def test_documents_are_processed_inline_by_default(
+        self, settings_with_plugin_dir_set, client, shorter_carbon_txt_string
+    ):
+        res = client.post(
+            "/api/validate/file/",
+            {"text_contents": shorter_carbon_txt_string},
+            content_type="application/json",
+        )
+        parsed_response = res.json()
+
+        assert "document_job" not in parsed_response
+        assert parsed_response["document_data"]["test_plugin"][0]["test_key"] == (
+            "TEST PLUGIN VALUE"
+        )
+        assert not DocumentProcessingJob.objects.exists()
+
+    def test_documents_are_queued_and_results_polled_for(
+        self, async_document_processing, client, shorter_carbon_txt_string
+    ):
+        # Given the API is set to process documents asynchronously,
+        # when I validate a carbon.txt file linking to documents
+        res = client.post(
+            "/api/validate/file/",
+            {"text_contents": shorter_carbon_txt_string},
+            content_type="application/json",
+        )
+        parsed_response = res.json()
+
+        # I get the syntax results straight away, with a job to poll
+        assert parsed_response["success"] is True
+        assert parsed_response["document_data"] == {}
+        job = parsed_response["document_job"]
+        assert job["status"] == "pending"
+        assert job["url"] == f"/api/jobs/{job['id']}/"
+
+        pending = client.get(job["url"]).json()
+        assert pending["status"] == "pending"
+        assert "document_data" not in pending
+
+        # When a worker has run the job
+        assert run_worker(once=True) == 1
+
+        # the document results are available from the job
+        done = client.get(job["url"]).json()
+        assert done["status"] == "done"
+        assert done["document_data"]["test_plugin"][0]["test_key"] == (
+            "TEST PLUGIN VALUE"
+        )
+        assert any("Test Plugin" in log for log in done["logs"])
+        assert done["errors"] == []
+
+    def test_no_job_is_queued_without_plugins_to_process_documents(
+        self, reset_plugin_registry, settings, client, shorter_carbon_txt_string
+    ):
+        settings.ASYNC_DOCUMENT_PROCESSING = True
+
+        res = client.post(
+            "/api/validate/file/",
+            {"text_contents": shorter_carbon_txt_string},
+            content_type="application/json",
+        )
+
+        assert res.json()["success"] is True
+        assert "document_job" not in res.json()
+        assert not DocumentProcessingJob.objects.exists()
+
+    def test_unknown_jobs_are_not_found(self, client):
+        res = client.get(f"/api/jobs/{uuid.uuid4()}/")
+        assert res.status_code == 404
+
+
+@pytest.mark.django_db
+class TestClaimingJobs:
+    def test_jobs_are_only_claimed_once(self):
+        job = make_job()
+
+        claimed = claim_next_job()
+
+        assert claimed.id == job.id
+        assert claimed.status == DocumentProcessingJob.Status.RUNNING
+        assert claimed.attempts == 1
+        assert claim_next_job() is None
+
+    def test_jobs_are_claimed_oldest_first(self):
+        first = make_job()
+        make_job()
+
+        assert claim_next_job().id == first.id
+
+    def test_jobs_left_by_dead_workers_are_claimed_again(self):
+        job = make_job(
+            status=DocumentProcessingJob.Status.RUNNING,
+            started_at=timezone.now() - datetime.timedelta(hours=1),
+            attempts=1,
+        )
+
+        assert claim_next_job(stale_after=datetime.timedelta(minutes=30)).id == job.id
+        assert claim_next_job(stale_after=datetime.timedelta(minutes=30)) is None
+
+    def test_jobs_that_keep_killing_workers_are_given_up_on(self):
+        job = make_job(
+            status=DocumentProcessingJob.Status.RUNNING,
+            started_at=timezone.now() - datetime.timedelta(hours=1),
+            attempts=MAX_ATTEMPTS,
+        )
+
+        assert claim_next_job() is None
+        job.refresh_from_db()
+        assert job.status == DocumentProcessingJob.Status.FAILED
+        assert job.errors
+
+
+@pytest.mark.django_db
+def test_failing_jobs_record_the_error(mocker):
+    job = make_job()
+    validator = mocker.Mock()
+    validator.process_linked_documents.side_effect = RuntimeError("Arelle fell over")
+
+    run_job(claim_next_job(), validator)
+
+    job.refresh_from_db()
+    assert job.status == DocumentProcessingJob.Status.FAILED
+    assert job.errors == ["RuntimeError: Arelle fell over"]
+    assert job.finished_at is not None
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from carbon_txt.exceptions import UnreachableCarbonTxtFile  # type: ignore
@@ -307,3 +309,54 @@ class TestFinder:
         assert mocked_carbon_txt_domain not in [
             str(r.url) for r in httpx_mock.get_requests()
         ]
+
+
+class TestAsyncFinder:
+    """
+    The async lookups used by the API follow the same rules as the sync ones.
+    """
+
+    def test_looking_up_domain_simple(self, mocked_carbon_txt_domain):
+        finder = FileFinder()
+
+        result = asyncio.run(finder.aresolve_domain(mocked_carbon_txt_domain))
+
+        assert result.uri == f"https://{mocked_carbon_txt_domain}/carbon.txt"
+        assert result.delegation_method is None
+
+    def test_looking_up_domain_with_delegation_using_dns(
+        self, mocked_dns_delegating_carbon_txt_domain
+    ):
+        finder = FileFinder()
+
+        result = asyncio.run(
+            finder.aresolve_domain(mocked_dns_delegating_carbon_txt_domain)
+        )
+
+        assert result.uri == "https://managed-service.example.com/carbon.txt"
+        assert result.delegation_method == "dns"
+
+    def test_looking_up_domain_with_delegation_using_http(
+        self, mocked_http_delegating_carbon_txt_domain
+    ):
+        finder = FileFinder()
+
+        result = asyncio.run(
+            finder.aresolve_domain(mocked_http_delegating_carbon_txt_domain)
+        )
+
+        assert result.uri == "https://managed-service.example.com/carbon.txt"
+        assert result.delegation_method == "http"
+
+    def test_looking_up_uri_with_no_carbon_txt_at_all(self, mocked_404_carbon_txt_url):
+        finder = FileFinder()
+
+        with pytest.raises(UnreachableCarbonTxtFile):
+            asyncio.run(finder.aresolve_uri(mocked_404_carbon_txt_url))
+
+    def test_fetch_carbon_txt_file(self, mocked_carbon_txt_url):
+        finder = FileFinder()
+
+        result = asyncio.run(finder.afetch_carbon_txt_file(mocked_carbon_txt_url))
+
+        assert result == finder.fetch_carbon_txt_file(mocked_carbon_txt_url)
@@ -1,6 +1,8 @@
+import asyncio
 import re
 
-from carbon_txt.http_client import HTTPClient
+from carbon_txt import http_client
+from carbon_txt.http_client import AsyncHTTPClient, HTTPClient
 
 
 class TestHttpClient:
@@ -55,3 +57,47 @@ class TestHttpClient:
         # Then the http transport library should be called with the timeout.
         for request in httpx_mock.get_requests():
             assert re.match(user_agent_re, request.headers["User-Agent"])
+
+    def test_request_headers_are_kept(self, mocked_carbon_txt_domain, httpx_mock):
+        """
+        Headers passed with a request, like those for conditional requests,
+        are sent along with the User-Agent
+        """
+        client = HTTPClient(http_user_agent="MyCarbonTxtApp/1.0")
+
+        client.get(
+            f"https://{mocked_carbon_txt_domain}/carbon.txt",
+            headers={"If-None-Match": '"v1"'},
+        )
+
+        for request in httpx_mock.get_requests():
+            assert request.headers["User-Agent"] == "MyCarbonTxtApp/1.0"
+            assert request.headers["If-None-Match"] == '"v1"'
+
+
+class TestAsyncHttpClient:
+    def test_requests_share_one_client_per_event_loop(
+        self, mocked_carbon_txt_domain, httpx_mock
+    ):
+        """
+        Requests made in one event loop reuse a pooled httpx client, and its
+        connections, rather than opening a new client each.
+        """
+        url = f"https://{mocked_carbon_txt_domain}/carbon.txt"
+        httpx_mock.add_response(url=url, is_reusable=True)
+        client = AsyncHTTPClient(http_timeout=2.0)
+
+        async def fetch_twice():
+            await client.get(url)
+            pooled = http_client._get_async_client()
+            await client.head(url)
+            assert http_client._get_async_client() is pooled
+            await http_client.aclose_async_client()
+            return pooled
+
+        first = asyncio.run(fetch_twice())
+        second = asyncio.run(fetch_twice())
+
+        assert first is not second
+        assert first.is_closed and second.is_closed
+        assert len(httpx_mock.get_requests()) == 4
@@ -0,0 +1,135 @@
+import pytest
+
+from carbon_txt.web import prewarm as prewarm_module
+from carbon_txt.web.prewarm import PrewarmStatus, prewarm, start_prewarm
+
+
+@pytest.fixture
+def fresh_status(monkeypatch):
+    """
+    Give each test its own prewarm status, rather than the one for this process
+    """
+    status = PrewarmStatus()
+    monkeypatch.setattr(prewarm_module, "_status", status)
+    return status
+
+
+class TestReadinessEndpoint:
+    def test_ready_straight_away_without_prewarming(self, fresh_status, client):
+        res = client.get("/api/ready/")
+
+        assert res.status_code == 200
+        assert res.json()["ready"] is True
+        assert res.json()["prewarm_enabled"] is False
+
+    def test_not_ready_until_prewarming_has_finished(
+        self, fresh_status, settings_with_active_csrd_greenweb_plugin, client
+    ):
+        fresh_status.enabled = True
+
+        res = client.get("/api/ready/")
+        assert res.status_code == 503
+        assert res.json()["ready"] is False
+
+        prewarm()
+
+        res = client.get("/api/ready/")
+        assert res.status_code == 200
+        assert res.json()["ready"] is True
+        assert fresh_status.errors == []
+        assert res.json()["prewarm_duration"] > 0
+        assert any(
+            "Prewarmed CSRD report processing" in log for log in fresh_status.logs
+        )
+
+    def test_warm_up_details_are_kept_out_of_the_response(
+        self, fresh_status, client, mocker
+    ):
+        fresh_status.enabled = True
+        mocked_pm = mocker.patch.object(prewarm_module, "pm")
+        mocked_pm.hook.prewarm.side_effect = RuntimeError("secret/path/to/report")
+        prewarm()
+
+        res = client.get("/api/ready/")
+
+        assert res.status_code == 200
+        assert set(res.json()) == {"ready", "prewarm_enabled", "prewarm_duration"}
+        assert "secret" not in res.content.decode()
+
+
+class TestPrewarming:
+    def test_prewarming_starts_the_arelle_session(
+        self, fresh_status, settings_with_active_csrd_greenweb_plugin
+    ):
+        from carbon_txt.processors.csrd_document import get_shared_session_manager
+
+        session_manager = get_shared_session_manager()
+        session_manager.close()
+
+        prewarm()
+
+        assert session_manager.session_age is not None
+        assert session_manager.reports_loaded >= 1
+
+    def test_only_the_worker_pool_is_warmed_when_configured(self, mocker):
+        """
+        With a worker pool, reports are never parsed in the web process, so
+        it doesn't start an Arelle session of its own.
+        """
+        from carbon_txt import process_csrd_document
+
+        worker_pool = mocker.Mock()
+        worker_pool.extract.return_value = []
+        mocker.patch.object(
+            process_csrd_document, "get_shared_worker_pool", return_value=worker_pool
+        )
+        session_manager = mocker.patch.object(
+            process_csrd_document, "get_shared_session_manager"
+        )
+        arelle_processor = mocker.patch.object(process_csrd_document, "ArelleProcessor")
+
+        process_csrd_document.prewarm(logs=[])
+
+        worker_pool.extract.assert_called_once()
+        assert worker_pool.extract.call_args.args[0] == str(
+            process_csrd_document.PREWARM_REPORT_PATH
+        )
+        session_manager.assert_not_called()
+        arelle_processor.assert_not_called()
+
+    def test_failures_are_recorded_and_do_not_block_readiness(
+        self, fresh_status, reset_plugin_registry, mocker
+    ):
+        fresh_status.enabled = True
+        mocked_pm = mocker.patch.object(prewarm_module, "pm")
+        mocked_pm.hook.prewarm.side_effect = RuntimeError("could not warm up")
+
+        prewarm()
+
+        assert fresh_status.ready
+        assert fresh_status.errors == ["RuntimeError: could not warm up"]
+
+    def test_start_prewarm_does_nothing_unless_enabled(
+        self, fresh_status, settings, mocker
+    ):
+        settings.PREWARM_ON_BOOT = False
+        thread = mocker.patch.object(prewarm_module.threading, "Thread")
+
+        start_prewarm()
+
+        thread.assert_not_called()
+        assert not fresh_status.enabled
+
+    def test_start_prewarm_runs_once_in_the_background(
+        self, fresh_status, settings, mocker
+    ):
+        settings.PREWARM_ON_BOOT = True
+        thread = mocker.patch.object(prewarm_module.threading, "Thread")
+
+        start_prewarm()
+        start_prewarm()
+
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+        assert fresh_status.enabled
+        assert not fresh_status.ready
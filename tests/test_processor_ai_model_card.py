@@ -1,10 +1,20 @@
+import csv
+import io
+import json
 import pathlib
 import unittest
 
 import pytest
 from httpx import HTTPError
+from pytest_httpx import IteratorStream
+from typer.testing import CliRunner
 
-from carbon_txt.processors.ai_model_card import GreenwebAIModelCardProcessor
+from carbon_txt.cli import app
+from carbon_txt.processors.ai_model_card import (
+    GreenwebAIModelCardProcessor,
+    find_model_cards,
+    hugging_face_card_source_url,
+)
 
 
 def model_card_fixture(filename):
@@ -125,3 +135,283 @@ class TestGreenwebAIModelCardProcessor(unittest.TestCase):
         processor = GreenwebAIModelCardProcessor(card_url=url)
         with self.assertRaises(HTTPError):
             processor.get_co2_eq_emissions()
+
+    def test_parses_model_name_from_first_heading(self):
+        url = self.setup_model_card_fixture_url("complete.md")
+        processor = GreenwebAIModelCardProcessor(card_url=url)
+        results = processor.get_co2_eq_emissions()
+        assert get_result(results, "name").value == "The name of the model"
+
+
+class TestHuggingFaceModelPages:
+    @pytest.mark.parametrize(
+        "url,source_url",
+        [
+            (
+                "https://huggingface.co/org/model",
+                "https://huggingface.co/org/model/raw/main/README.md",
+            ),
+            (
+                "https://hf.co/org/model/?library=transformers#model-card",
+                "https://huggingface.co/org/model/raw/main/README.md",
+            ),
+            (
+                "https://huggingface.co/org/model/tree/v1.0",
+                "https://huggingface.co/org/model/raw/v1.0/README.md",
+            ),
+            (
+                "https://huggingface.co/org/model/blob/main/README.md",
+                "https://huggingface.co/org/model/raw/main/README.md",
+            ),
+            ("https://huggingface.co/org/model/raw/main/README.md", None),
+            ("https://huggingface.co/org/model/resolve/main/README.md", None),
+            ("https://huggingface.co/datasets/org/dataset", None),
+            ("https://huggingface.co/docs/hub/model-cards", None),
+            ("https://huggingface.co/org", None),
+            ("https://example.com/org/model", None),
+        ],
+    )
+    def test_finds_the_source_of_model_pages(self, url, source_url):
+        assert hugging_face_card_source_url(url) == source_url
+
+    def test_model_pages_are_read_from_their_source(self, httpx_mock):
+        httpx_mock.add_response(
+            url="https://huggingface.co/org/model/raw/main/README.md",
+            content=model_card_fixture("complete.md"),
+            headers={"content-type": "text/plain"},
+        )
+        logs = []
+
+        processor = GreenwebAIModelCardProcessor(
+            card_url="https://huggingface.co/org/model", logs=logs
+        )
+        results = processor.get_co2_eq_emissions()
+
+        assert get_result(results, "emissions").value == 123.456
+        assert get_result(results, "emissions").file == (
+            "https://huggingface.co/org/model/raw/main/README.md"
+        )
+        assert "https://huggingface.co/org/model/raw/main/README.md" in logs[0]
+
+
+class TestPartialFetch:
+    def stream_card(self, httpx_mock, chunks):
+        """Serve a model card in chunks, recording how many were read."""
+        read = []
+
+        def body():
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        url = "https://example.com/README.md"
+        httpx_mock.add_response(
+            url=url,
+            stream=IteratorStream(body()),
+            headers={"content-type": "text/markdown"},
+        )
+        return url, read
+
+    def test_stops_reading_after_the_frontmatter_and_heading(self, httpx_mock):
+        card = model_card_fixture("complete.md").encode()
+        filler = b"Lots more about the model.\n" * 10_000
+        url, read = self.stream_card(httpx_mock, [card, filler, filler, filler])
+
+        results = GreenwebAIModelCardProcessor(card_url=url).get_co2_eq_emissions()
+
+        assert get_result(results, "name").value == "The name of the model"
+        assert get_result(results, "emissions").value == 123.456
+        assert len(read) == 1
+
+    def test_stops_reading_after_the_byte_budget(self, httpx_mock):
+        filler = b"Lots more about the model, but no heading.\n" * 100
+        url, read = self.stream_card(httpx_mock, [filler] * 10)
+
+        processor = GreenwebAIModelCardProcessor(card_url=url, max_bytes=len(filler))
+        results = processor.get_co2_eq_emissions()
+
+        assert get_result(results, "name") is None
+        assert len(read) == 1
+
+    def test_reads_frontmatter_split_across_many_chunks(self, httpx_mock):
+        card = model_card_fixture("complete.md").encode()
+        url, _ = self.stream_card(
+            httpx_mock, [card[i : i + 16] for i in range(0, len(card), 16)]
+        )
+
+        processor = GreenwebAIModelCardProcessor(card_url=url, max_bytes=len(card))
+        results = processor.get_co2_eq_emissions()
+
+        assert get_result(results, "geographical_location").value == (
+            "Amsterdam, Netherlands"
+        )
+
+    def test_stops_reading_unclosed_frontmatter_after_the_byte_budget(self, httpx_mock):
+        filler = b"key: value\n" * 100
+        url, read = self.stream_card(httpx_mock, [b"---\n"] + [filler] * 10)
+
+        processor = GreenwebAIModelCardProcessor(card_url=url, max_bytes=len(filler))
+        processor.get_co2_eq_emissions()
+
+        assert len(read) == 2
+
+
+class TestLocalModelCards:
+    @pytest.fixture
+    def mirror(self, tmp_path):
+        """A local mirror of a few model repositories."""
+        for repository, fixture in [
+            ("org/complete", "complete.md"),
+            ("org/partial", "partial.md"),
+            ("other/no_front_matter", "no_front_matter.md"),
+            # not a model card, but part of a cloned repository
+            ("org/complete/.git", "complete.md"),
+        ]:
+            directory = tmp_path / repository
+            directory.mkdir(parents=True)
+            (directory / "README.md").write_text(model_card_fixture(fixture))
+        return tmp_path
+
+    def test_reads_local_model_cards_without_an_http_client(self, mirror):
+        card = str(mirror / "org" / "complete" / "README.md")
+
+        processor = GreenwebAIModelCardProcessor(card_url=card)
+        results = processor.get_co2_eq_emissions()
+
+        assert processor.http_client is None
+        assert get_result(results, "name").value == "The name of the model"
+        assert get_result(results, "emissions").value == 123.456
+        assert get_result(results, "emissions").file == card
+
+    def test_stops_reading_local_unclosed_frontmatter_after_the_byte_budget(
+        self, tmp_path
+    ):
+        card = tmp_path / "README.md"
+        card.write_text("---\n" + "key: value\n" * 200_000)
+
+        processor = GreenwebAIModelCardProcessor(card_url=str(card), max_bytes=1024)
+        processor.READ_CHUNK_SIZE = 512
+        text, _ = processor._fetch_card()
+
+        assert len(text) == 1024
+
+    def test_finds_model_cards_in_a_mirror(self, mirror):
+        url = "https://example.com/README.md"
+
+        cards = find_model_cards([str(mirror), url])
+
+        assert cards == [
+            str(mirror / "org" / "complete" / "README.md"),
+            str(mirror / "org" / "partial" / "README.md"),
+            str(mirror / "other" / "no_front_matter" / "README.md"),
+            url,
+        ]
+
+    def test_extracts_model_cards_as_jsonl(self, mirror):
+        missing = str(mirror / "missing" / "README.md")
+
+        result = CliRunner().invoke(
+            app, ["model-cards", "extract", str(mirror), missing]
+        )
+        rows = [json.loads(line) for line in result.stdout.splitlines()]
+
+        # a card that couldn't be read fails the run, but not the others
+        assert result.exit_code == 1
+        by_card = {}
+        for row in rows:
+            by_card.setdefault(row["card"], []).append(row)
+
+        complete = {
+            row["short_code"]: row
+            for row in by_card[str(mirror / "org" / "complete" / "README.md")]
+        }
+        assert complete["name"]["value"] == "The name of the model"
+        assert complete["emissions"]["value"] == 123.456
+        assert complete["emissions"]["unit"] == "grams"
+        # fields missing from a card are written with the reason
+        partial = by_card[str(mirror / "org" / "partial" / "README.md")]
+        assert any(row["error"] for row in partial)
+        [failed] = by_card[missing]
+        assert failed["error"].startswith("FileNotFoundError")
+
+    def test_extracts_local_and_remote_model_cards_as_csv(
+        self, mirror, httpx_mock, tmp_path
+    ):
+        url = "https://example.com/README.md"
+        httpx_mock.add_response(
+            url=url,
+            content=model_card_fixture("complete.md"),
+            headers={"content-type": "text/markdown"},
+        )
+        card_list = tmp_path / "cards.txt"
+        card_list.write_text(f"{mirror / 'org' / 'complete'}\n{url}\n")
+
+        result = CliRunner().invoke(
+            app,
+            [
+                "model-cards",
+                "extract",
+                "--from-file",
+                str(card_list),
+                "--format",
+                "csv",
+            ],
+        )
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+
+        assert result.exit_code == 0
+        emissions = [row for row in rows if row["short_code"] == "emissions"]
+        assert {row["card"] for row in emissions} == {
+            str(mirror / "org" / "complete" / "README.md"),
+            url,
+        }
+        assert {row["value"] for row in emissions} == {"123.456"}
+
+
+class TestGetH1FromMarkdown:
+    @pytest.fixture
+    def processor(self):
+        return GreenwebAIModelCardProcessor(card_url="https://example.com/README.md")
+
+    @pytest.mark.parametrize(
+        "markdown,heading",
+        [
+            ("# The name of the model\n\nSome text\n", "The name of the model"),
+            ("## Sub heading\n\n# **Bold** `model` name #\n", "Bold model name"),
+            ("# [Linked](https://example.com) model\n", "Linked model"),
+            ("Setext *model*\n===\n", "Setext model"),
+            ("Not a title\n---\n\n   # Indented title\n", "Indented title"),
+            ("```\n# Not a heading\n```\n\n# Title\n", "Title"),
+            ("    # indented code\n\n# Title\n", "Title"),
+            ("Just a paragraph\n", None),
+        ],
+    )
+    def test_scans_lines_for_the_first_heading(
+        self, processor, mocker, markdown, heading
+    ):
+        document = mocker.patch("carbon_txt.processors.ai_model_card.Document")
+
+        assert processor.get_h1_from_markdown(markdown) == heading
+        document.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "markdown,heading",
+        [
+            # headings straight after a list could belong to it
+            ("- item\n# Title\n", "Title"),
+            ("> quote\nTitle\n===\n", None),
+            # reference links are resolved from anywhere in the document
+            ("# [Model][ref]\n\n[ref]: https://example.com\n", "Model"),
+        ],
+    )
+    def test_falls_back_to_mistletoe_when_ambiguous(
+        self, processor, mocker, markdown, heading
+    ):
+        from carbon_txt.processors.ai_model_card import Document
+
+        document = mocker.patch(
+            "carbon_txt.processors.ai_model_card.Document", side_effect=Document
+        )
+
+        assert processor.get_h1_from_markdown(markdown) == heading
+        document.assert_called_once_with(markdown)
@@ -79,6 +79,25 @@ class TestCSRDProcessorValidate:
         for item in res:
             assert isinstance(item, csrd_document.NoMatchingDatapointsError)
 
+    def test_loading_a_local_copy_of_a_remote_report(self, local_esrs_1_csrd_file):
+        """
+        Test that we can load a report already downloaded to disk, while the
+        datapoints still point at the URL the report came from.
+        """
+        report_url = "https://www.example.com/esrs-e1-efrag-2026-12-31-en.xhtml"
+        short_code = "PercentageOfRenewableSourcesInTotalEnergyConsumption"
+
+        csrd_processor = csrd_document.GreenwebCSRDProcessor(
+            report_url=report_url, report_path=local_esrs_1_csrd_file
+        )
+
+        res = csrd_processor.get_esrs_datapoint_values([short_code])
+
+        assert res
+        for datapoint in res:
+            assert datapoint.short_code == short_code
+            assert datapoint.file == report_url
+
     def test_safe_error_when_CSRD_unparsable(self):
         """
         Test that we get a graceful failure when we try to parse a unreachable or unparseable
@@ -0,0 +1,170 @@
+"""Tests for the cache of responses from the domain and URL validation endpoints."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import cache
+
+from carbon_txt.validators import CarbonTxtValidator
+from carbon_txt.web import api
+
+KEY = "gwf_owner.secret"
+
+
+@pytest.fixture
+def cache_enabled(settings):
+    settings.VALIDATION_CACHE_TTL = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def purge_key(settings, mocker):
+    """
+    Accept KEY as a valid API key, and publish a DNS TXT record on
+    example.com saying its holder owns the domain.
+    """
+    settings.API_KEY_INTROSPECTION_URL = "http://example.com/introspect"
+
+    async def introspect(key):
+        return (
+            {"active": True, "service": "carbon_txt"}
+            if key.startswith("gwf_")
+            else None
+        )
+
+    mocker.patch("carbon_txt.web.api_key_auth._afetch_introspection", introspect)
+    record = MagicMock()
+    record.to_text.return_value = '"carbon-txt-purge=gwf_owner"'
+    mocker.patch(
+        "dns.asyncresolver.resolve",
+        side_effect=lambda domain, record_type: (
+            [record] if domain == "example.com" else []
+        ),
+    )
+    return KEY
+
+
+def purge(client, data: dict, key: str | None = KEY):
+    headers = {"X-Api-Key": key} if key else {}
+    return client.post(
+        "/api/cache/purge/", data, content_type="application/json", headers=headers
+    )
+
+
+def validate(client, endpoint: str, data: dict, query: str = ""):
+    return client.post(
+        f"/api/validate/{endpoint}/{query}", data, content_type="application/json"
+    )
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    def test_repeat_validations_are_served_from_the_cache(
+        self, cache_enabled, client, mocker, mocked_carbon_txt_domain
+    ):
+        validate_domain = mocker.spy(CarbonTxtValidator, "avalidate_domain")
+
+        first = validate(client, "domain", {"domain": mocked_carbon_txt_domain})
+        # domains that only differ in case share an entry
+        second = validate(client, "domain", {"domain": "Example.COM"})
+
+        assert validate_domain.call_count == 1
+        assert first["Age"] == "0"
+        assert first["Cache-Control"] == "max-age=60"
+        assert second.json() == first.json()
+        assert second.json()["success"]
+        assert "Age" in second
+        assert second["Cache-Control"].startswith("max-age=")
+
+    def test_fresh_validations_bypass_and_refresh_the_cache(
+        self, cache_enabled, client, mocker, mocked_carbon_txt_url
+    ):
+        validate_url = mocker.spy(CarbonTxtValidator, "avalidate_url")
+
+        validate(client, "url", {"url": mocked_carbon_txt_url})
+        fresh = validate(client, "url", {"url": mocked_carbon_txt_url}, "?fresh=true")
+        validate(client, "url", {"url": mocked_carbon_txt_url})
+
+        assert validate_url.call_count == 2
+        assert fresh["Age"] == "0"
+
+    def test_purging_a_domain_clears_it_and_its_carbon_txt_urls(
+        self, cache_enabled, purge_key, client, mocker, mocked_carbon_txt_url
+    ):
+        validate_domain = mocker.spy(CarbonTxtValidator, "avalidate_domain")
+        validate_url = mocker.spy(CarbonTxtValidator, "avalidate_url")
+        validate(client, "domain", {"domain": "example.com"})
+        validate(client, "url", {"url": mocked_carbon_txt_url})
+
+        res = purge(client, {"domain": "example.com"})
+        validate(client, "domain", {"domain": "example.com"})
+        validate(client, "url", {"url": mocked_carbon_txt_url})
+
+        assert res.status_code == 200
+        assert mocked_carbon_txt_url in res.json()["purged"]
+        assert validate_domain.call_count == 2
+        assert validate_url.call_count == 2
+
+    def test_purging_needs_a_domain_or_url(self, cache_enabled, purge_key, client):
+        res = purge(client, {})
+
+        assert res.status_code == 400
+
+    def test_purging_needs_an_api_key_even_when_validating_does_not(
+        self, cache_enabled, purge_key, client, settings
+    ):
+        settings.REQUIRE_API_KEY = False
+
+        anonymous = purge(client, {"domain": "example.com"}, key=None)
+        invalid = purge(client, {"domain": "example.com"}, key="not-a-key")
+
+        assert anonymous.status_code == 401
+        assert invalid.status_code == 401
+
+    def test_only_the_owner_of_a_domain_can_purge_it(
+        self, cache_enabled, purge_key, client
+    ):
+        other_key = purge(client, {"domain": "example.com"}, key="gwf_other.secret")
+        other_domain = purge(client, {"domain": "example.org"})
+        other_url = purge(
+            client,
+            {"domain": "example.com", "url": "https://example.org/carbon.txt"},
+        )
+
+        assert other_key.status_code == 403
+        assert other_domain.status_code == 403
+        assert other_url.status_code == 403
+
+    def test_internal_keys_can_purge_any_domain(
+        self, cache_enabled, purge_key, client, mocker
+    ):
+        async def introspect(key):
+            return {"active": True, "privilege_level": "internal"}
+
+        mocker.patch("carbon_txt.web.api_key_auth._afetch_introspection", introspect)
+
+        res = purge(client, {"domain": "example.org"}, key="gwf_internal.secret")
+
+        assert res.status_code == 200
+
+    def test_purging_is_throttled(self, cache_enabled, purge_key, client, monkeypatch):
+        monkeypatch.setattr(api.purge_throttle, "num_requests", 1)
+
+        first = purge(client, {"domain": "example.com"})
+        second = purge(client, {"domain": "example.com"})
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+
+    def test_nothing_is_cached_when_the_ttl_is_zero(
+        self, client, mocker, mocked_carbon_txt_domain
+    ):
+        validate_domain = mocker.spy(CarbonTxtValidator, "avalidate_domain")
+
+        for _ in range(2):
+            res = validate(client, "domain", {"domain": mocked_carbon_txt_domain})
+
+        assert validate_domain.call_count == 2
+        assert "Cache-Control" not in res
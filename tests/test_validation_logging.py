@@ -1,11 +1,17 @@
+import asyncio
 import json
-from unittest.mock import MagicMock
+import time
+from unittest.mock import AsyncMock, MagicMock, call
 
 import pytest
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from structlog.stdlib import BoundLogger
 
-from carbon_txt.web.validation_logging.middleware import LogValidationMiddleware
+from carbon_txt.web.validation_logging.buffer import ValidationLogBuffer
+from carbon_txt.web.validation_logging.middleware import (
+    LogValidationMiddleware,
+    record_validation,
+)
 from carbon_txt.web.validation_logging.models import ValidationLogEntry
 
 validation_paths = ["/api/validate/path", "/api/validate/file"]
@@ -90,6 +96,114 @@ class TestLogValidationMiddleware:
         # And the error should be logged
         self.logger.exception.assert_called()
 
+    def test_validation_requests_logged_from_async_views(self):
+        """
+        Behind async views, the middleware is async too, and still logs
+        validation requests.
+        """
+
+        # Given the middleware is in front of an async view
+        self.setup(
+            path="/api/validate/file",
+            request={"text_content": ""},
+            response={"success": True},
+        )
+        get_response = AsyncMock(return_value=self.response)
+        middleware = LogValidationMiddleware(
+            get_response, self.logger, self.db_log_class, self.source
+        )
+
+        # When the request is made
+        returned = asyncio.run(middleware(self.request))
+
+        # Then the response is returned, and the request is logged
+        assert returned == self.response
+        get_response.assert_awaited_with(self.request)
+        self.db_log_class.assert_called_with(
+            endpoint="/api/validate/file", success=True, source=self.source
+        )
+        self.db_log_instance.save.assert_called()
+
+    def test_streamed_batch_validations_logged_per_item(self):
+        """
+        Each line of a streamed batch validation is logged as a validation of
+        its own, once it has been sent.
+        """
+
+        # Given a batch validation streaming back a result for a domain and
+        # a URL, with the second line split across chunks
+        lines = [
+            {
+                "index": 0,
+                "item": "www.example.com",
+                "success": True,
+                "url": "https://www.example.com/carbon.txt",
+            },
+            {"index": 1, "item": "https://example.org/carbon.txt", "success": False},
+        ]
+        content = "".join(json.dumps(line) + "\n" for line in lines)
+        split_at = content.index("example.org")
+        self.setup(path="/api/validate/batch/")
+        self.get_response.return_value = StreamingHttpResponse(
+            iter([content[:split_at], content[split_at:]])
+        )
+
+        # When the request is made, nothing is logged until the content is sent
+        returned = self.middleware(self.request)
+        self.db_log_class.assert_not_called()
+        streamed = b"".join(returned.streaming_content)
+
+        # Then the content is unchanged, and each item is logged
+        assert streamed == content.encode("utf-8")
+        assert self.db_log_class.call_args_list == [
+            call(
+                endpoint="/api/validate/batch/",
+                url="https://www.example.com/carbon.txt",
+                domain="www.example.com",
+                success=True,
+                source=self.source,
+            ),
+            call(
+                endpoint="/api/validate/batch/",
+                url="https://example.org/carbon.txt",
+                domain="example.org",
+                success=False,
+                source=self.source,
+            ),
+        ]
+
+    def test_streamed_batch_validations_logged_from_async_views(self):
+        """
+        Streamed batch validations from async views are logged per item too.
+        """
+
+        # Given the middleware is in front of an async view, streaming back
+        # a batch validation
+        async def stream():
+            yield json.dumps({"index": 0, "item": "example.com", "success": True})
+            yield "\n"
+
+        self.setup(path="/api/validate/batch/")
+        get_response = AsyncMock(return_value=StreamingHttpResponse(stream()))
+        middleware = LogValidationMiddleware(
+            get_response, self.logger, self.db_log_class, self.source
+        )
+
+        # When the request is made, and the content sent
+        async def request_and_stream():
+            returned = await middleware(self.request)
+            return [chunk async for chunk in returned.streaming_content]
+
+        asyncio.run(request_and_stream())
+
+        # Then the item is logged
+        self.db_log_class.assert_called_once_with(
+            endpoint="/api/validate/batch/",
+            domain="example.com",
+            success=True,
+            source=self.source,
+        )
+
     def test_non_api_validation_requests_not_logged(self):
         """
         Requests that are not to validation endpoints are not logged
@@ -240,3 +354,147 @@ class TestLogValidationMiddleware:
             version="0.5",
         )
         self.db_log_instance.save.assert_called()
+
+    def test_validations_recorded_by_the_view_are_logged_without_parsing(self):
+        """
+        When the view records what to log on the request, the middleware logs
+        that, rather than parsing the request and response.
+        """
+
+        # Given a view that recorded its validation, and a response that
+        # isn't JSON
+        self.setup(path="/api/validate/domain")
+        record_validation(
+            self.request,
+            success=True,
+            url="https://www.example.com/carbon.txt",
+            domain="www.example.com",
+            version=None,
+        )
+        self.response.content = b"not json"
+
+        # When the request is made
+        self.middleware(self.request)
+
+        # Then the recorded validation is logged
+        self.logger.exception.assert_not_called()
+        self.db_log_class.assert_called_once_with(
+            endpoint="/api/validate/domain",
+            url="https://www.example.com/carbon.txt",
+            domain="www.example.com",
+            success=True,
+            source=self.source,
+        )
+
+    def test_entries_are_added_to_the_log_buffer(self):
+        """
+        Log entries are handed to the log buffer to write, rather than saved
+        while the request waits.
+        """
+
+        # Given the middleware writes log entries in batches
+        self.setup(path="/api/validate/file", response={"success": True})
+        log_buffer = MagicMock(ValidationLogBuffer)
+        middleware = LogValidationMiddleware(
+            self.get_response, self.logger, self.db_log_class, self.source, log_buffer
+        )
+
+        # When the request is made
+        middleware(self.request)
+
+        # Then the entry is queued, not saved
+        log_buffer.add.assert_called_once_with(self.db_log_instance)
+        self.db_log_instance.save.assert_not_called()
+
+
+def log_entry(domain="example.com"):
+    return ValidationLogEntry(endpoint="/api/validate/domain/", domain=domain)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestValidationLogBuffer:
+    def test_entries_are_written_in_batches(self):
+        log_buffer = ValidationLogBuffer(batch_size=2, flush_interval=60)
+
+        log_buffer.add(log_entry())
+        time.sleep(0.1)
+        assert ValidationLogEntry.objects.count() == 0
+
+        # filling a batch wakes the background thread to write it
+        log_buffer.add(log_entry())
+        deadline = time.monotonic() + 5
+        while ValidationLogEntry.objects.count() < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert ValidationLogEntry.objects.count() == 2
+        log_buffer.close()
+
+    def test_entries_are_written_after_the_flush_interval(self):
+        log_buffer = ValidationLogBuffer(batch_size=100, flush_interval=0.1)
+
+        log_buffer.add(log_entry())
+        time.sleep(0.5)
+
+        assert ValidationLogEntry.objects.count() == 1
+        log_buffer.close()
+
+    def test_closing_writes_queued_entries(self):
+        log_buffer = ValidationLogBuffer(batch_size=100, flush_interval=60)
+        log_buffer.add(log_entry("a.example.com"))
+        log_buffer.add(log_entry("b.example.com"))
+
+        log_buffer.close()
+
+        assert set(ValidationLogEntry.objects.values_list("domain", flat=True)) == {
+            "a.example.com",
+            "b.example.com",
+        }
+
+    def test_entries_past_the_limit_are_dropped(self):
+        log_buffer = ValidationLogBuffer(batch_size=100, flush_interval=60, max_size=2)
+
+        for _ in range(3):
+            log_buffer.add(log_entry())
+
+        assert len(log_buffer) == 2
+        assert log_buffer.dropped == 1
+        log_buffer.close()
+
+    def test_entries_that_fail_to_be_written_are_counted_as_dropped(self, mocker):
+        log_buffer = ValidationLogBuffer(batch_size=100, flush_interval=60)
+        for _ in range(3):
+            log_buffer.add(log_entry())
+        mocker.patch.object(
+            ValidationLogEntry.objects,
+            "bulk_create",
+            side_effect=RuntimeError("database is locked"),
+        )
+
+        assert log_buffer.flush() == 0
+        assert log_buffer.dropped == 3
+        assert len(log_buffer) == 0
+        log_buffer.close()
+
+    def test_entries_are_saved_straight_away_when_unbuffered(self):
+        log_buffer = ValidationLogBuffer(flush_interval=0)
+
+        log_buffer.add(log_entry())
+
+        assert ValidationLogEntry.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_api_validations_are_logged(client, mocked_carbon_txt_domain):
+    client.post(
+        "/api/validate/domain/",
+        {"domain": mocked_carbon_txt_domain},
+        content_type="application/json",
+    )
+
+    entry = ValidationLogEntry.objects.get()
+    assert entry.endpoint == "/api/validate/domain/"
+    assert entry.domain == mocked_carbon_txt_domain
+    assert entry.url == f"https://{mocked_carbon_txt_domain}/carbon.txt"
+    assert entry.success is True
+    assert entry.version == "0.2"
+    assert entry.source == ValidationLogEntry.Source.VALIDATOR_API
@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 
 import pytest
@@ -119,3 +120,29 @@ class TestCarbonTxtValidator:
         # CLI and validator web UI
 
         assert "NotParseableTOMLButHTML" in res.exceptions[0]
+
+
+class TestAsyncCarbonTxtValidator:
+    def test_validate_domain(self, mocked_carbon_txt_domain):
+        validator = validators.CarbonTxtValidator()
+
+        res = asyncio.run(validator.avalidate_domain(mocked_carbon_txt_domain))
+
+        assert res.result
+        assert res.url == f"https://{mocked_carbon_txt_domain}/carbon.txt"
+        assert not res.exceptions
+
+    def test_validate_url_without_carbon_txt(self, mocked_404_carbon_txt_url):
+        validator = validators.CarbonTxtValidator()
+
+        res = asyncio.run(validator.avalidate_url(mocked_404_carbon_txt_url))
+
+        assert not res.result
+        assert res.exceptions[0].startswith("UnreachableCarbonTxtFile")
+
+    def test_validate_contents_matches_sync(self, shorter_carbon_txt_string):
+        validator = validators.CarbonTxtValidator()
+
+        res = asyncio.run(validator.avalidate_contents(shorter_carbon_txt_string))
+
+        assert res == validator.validate_contents(shorter_carbon_txt_string)